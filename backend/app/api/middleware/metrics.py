@@ -0,0 +1,33 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ...core.metrics import REQUEST_SECONDS, RESPONSES
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording the duration and status code of every HTTP request.
+
+    It should wrap every other middleware so that rejections (e.g. 413 or 429)
+    are counted too. Requests failing with an unhandled exception count as 500.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, tracked_send)
+        finally:
+            REQUEST_SECONDS.labels(method=scope["method"]).observe(time.perf_counter() - started)
+            RESPONSES.labels(status=str(status)).inc()
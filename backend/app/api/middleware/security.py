@@ -1,48 +1,97 @@
-from fastapi import Request, HTTPException
+from fastapi import Request
 from fastapi.security import APIKeyHeader
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from ...config import settings
-import time
-from collections import defaultdict
+from ...core.ratelimit import RateLimiter, create_rate_limit_backend
+import hashlib
+import secrets
+from typing import Iterable, Optional
 
 # Rate limiting
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
+def rate_limit_key(request: Request) -> str:
+    """Return the client a request is counted for, as selected by Settings.rate_limit_by.
+
+    With "api_key", requests carrying a valid API key are counted per key (hashed,
+    so keys are never stored). Requests without one, or with an invalid one, are
+    counted per client IP, so that clients cannot get a fresh limit by sending a
+    different made-up key with every request.
+    """
+    api_key = request.headers.get("X-API-Key")
+    if settings.rate_limit_by == "api_key" and settings.api_key and api_key_valid(api_key):
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()
+    return "ip:" + (request.client.host if request.client else "unknown")
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware rejecting clients over the rate limit with 429 Too Many Requests.
+
+    Rejected requests are answered before the application sees them, so their
+    body is never read. Allowed requests are passed through untouched, which
+    keeps streaming responses streaming.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: Optional[RateLimiter] = None):
+        self.app = app
         self.rate_limit = settings.rate_limit_per_minute
         self.window = 60  # 1 minute window
-        self.requests = defaultdict(list)
-    
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        now = time.time()
-        
-        # Clean old requests
-        self.requests[client_ip] = [req_time for req_time in self.requests[client_ip] 
-                                  if now - req_time < self.window]
-        
-        # Check rate limit
-        if len(self.requests[client_ip]) >= self.rate_limit:
-            raise HTTPException(
+        self.limiter = limiter or RateLimiter(create_rate_limit_backend(), self.rate_limit, self.window)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = await self.limiter.hit(rate_limit_key(Request(scope)))
+        if not allowed:
+            response = JSONResponse(
+                {"detail": f"Rate limit exceeded. Maximum {self.rate_limit} requests per minute."},
                 status_code=429,
-                detail=f"Rate limit exceeded. Maximum {self.rate_limit} requests per minute."
+                headers={"Retry-After": str(retry_after)},
             )
-        
-        # Add current request
-        self.requests[client_ip].append(now)
-        
-        return await call_next(request)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
 
 # API Key validation
-api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)  # Documents the header in OpenAPI
 
-async def verify_api_key(request: Request):
+def api_key_valid(api_key: Optional[str]) -> bool:
+    """Check an API key against Settings.api_key in constant time."""
     if not settings.api_key:
-        return  # Skip validation if no API key is set
-        
-    api_key = await api_key_header(request)
-    if not api_key or api_key != settings.api_key:
-        raise HTTPException(
-            status_code=401,
-            detail="Invalid or missing API key"
-        )
+        return True  # Skip validation if no API key is set
+    return api_key is not None and secrets.compare_digest(api_key.encode(), settings.api_key.encode())
+
+class APIKeyMiddleware:
+    """Pure ASGI middleware rejecting requests without a valid X-API-Key with 401 Unauthorized.
+
+    Only paths under one of the protected prefixes are checked, except for the
+    public paths. The check runs before the request body is parsed.
+    """
+
+    def __init__(self, app: ASGIApp, protected_prefixes: Iterable[str] = (), public_paths: Iterable[str] = ()):
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): The wrapped application
+            protected_prefixes (Iterable[str]): Path prefixes requiring an API key
+            public_paths (Iterable[str]): Paths under a protected prefix that do not
+        """
+        self.app = app
+        self.protected_prefixes = tuple(protected_prefixes)
+        self.public_paths = frozenset(public_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] == "http"
+            and path.startswith(self.protected_prefixes)
+            and path not in self.public_paths
+            and not api_key_valid(Headers(scope=scope).get("X-API-Key"))
+        ):
+            response = JSONResponse({"detail": "Invalid or missing API key"}, status_code=401)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,81 @@
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import Dict, Optional
+
+class RequestTooLarge(HTTPException):
+    """Raised while a request body is being received once it exceeds its limit."""
+
+    def __init__(self, limit: int):
+        super().__init__(
+            status_code=413,
+            detail=f"Request body exceeds maximum size of {limit / 1024 / 1024}MB"
+        )
+
+class RequestSizeMiddleware:
+    """Pure ASGI middleware rejecting request bodies over a size limit with 413 Payload Too Large.
+
+    Requests whose Content-Length exceeds the limit of their path are answered
+    right away, before any of the body is received. Bodies without a
+    Content-Length (chunked uploads) are counted as they are received, and
+    RequestTooLarge is raised as soon as the limit is crossed, which stops
+    multipart parsing and results in a 413 response.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int, route_limits: Optional[Dict[str, int]] = None):
+        """Initialize the middleware.
+
+        Args:
+            app (ASGIApp): The wrapped application
+            max_size (int): Body size limit in bytes of paths without a route limit
+            route_limits (Optional[Dict[str, int]]): Body size limits in bytes by path
+        """
+        self.app = app
+        self.max_size = max_size
+        self.route_limits = {path.rstrip("/"): limit for path, limit in (route_limits or {}).items()}
+
+    def limit(self, path: str) -> int:
+        """Return the body size limit of a path."""
+        return self.route_limits.get(path.rstrip("/"), self.max_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limit(scope["path"])
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(limit, scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise RequestTooLarge(limit)
+            return message
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except RequestTooLarge:
+            if response_started:
+                raise
+            await self._reject(limit, scope, receive, send)
+
+    async def _reject(self, limit: int, scope: Scope, receive: Receive, send: Send) -> None:
+        error = RequestTooLarge(limit)
+        response = JSONResponse({"detail": error.detail}, status_code=error.status_code)
+        await response(scope, receive, send)
@@ -1,24 +1,146 @@
+import asyncio
+import json
+import logging
 import tempfile
+import uuid
 from pathlib import Path
-from fastapi import APIRouter, UploadFile, HTTPException
-from ...core.converter import DocumentConverter
-from ...schemas.documents import ConversionResponse, ErrorResponse
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, List, Optional, Tuple, Union
+from fastapi import APIRouter, Depends, File, Query, Request, UploadFile, HTTPException
+from fastapi.responses import StreamingResponse
+from ...config import settings
+from ...core.pdf import parse_page_range
+from ...core.registry import get_converter
+from ...schemas.documents import BatchConversionResponse, ConversionResponse, ErrorResponse
+
+if TYPE_CHECKING:
+    # docling is imported when the first converter is built, not with the routes
+    from ...core.converter import DocumentConverter
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def _sse_event(event: str, data: str) -> str:
+    lines = "".join(f"data: {line}\n" for line in data.split("\n"))
+    return f"event: {event}\n{lines}\n"
+
+def _page_range(pages: Optional[str]) -> Optional[Tuple[int, int]]:
+    if pages is None:
+        return None
+    try:
+        return parse_page_range(pages)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _until_disconnected(request: Request, conversion: Awaitable[Any]) -> Any:
+    """Await a conversion, cancelling it if the client goes away first.
+
+    The client is checked every Settings.disconnect_poll_interval seconds.
+    Cancelling the conversion stops its jobs on the conversion pool (see
+    ConversionPool.run()) instead of converting for nobody.
+
+    Raises:
+        HTTPException: 499 Client Closed Request if the client disconnected
+    """
+    task = asyncio.ensure_future(conversion)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=settings.disconnect_poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info("Client disconnected, cancelling its conversion")
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
+
+async def _stream_document(
+    converter: "DocumentConverter",
+    file: UploadFile,
+    save_path: Path,
+    sse: bool,
+    page_range: Optional[Tuple[int, int]] = None,
+) -> StreamingResponse:
+    """Validate and save an upload, then stream its markdown as it is converted."""
+    try:
+        file_size, mime_type, digest = await converter.save_upload(file, save_path)
+        if page_range is not None:
+            await converter.validate_page_range(save_path, converter.SUPPORTED_FORMATS[mime_type], page_range)
+    except HTTPException:
+        save_path.unlink(missing_ok=True)
+        raise
+    except Exception as e:
+        save_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error during document conversion: {str(e)}"
+        )
+
+    metadata = {
+        "original_file": file.filename,
+        "mime_type": mime_type,
+        "file_size": file_size,
+    }
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            if sse:
+                yield _sse_event("metadata", json.dumps(metadata))
+            async for chunk in converter.stream_saved(save_path, mime_type, digest, page_range):
+                yield _sse_event("markdown", chunk) if sse else chunk + "\n\n"
+            if sse:
+                yield _sse_event("done", "")
+        except Exception as e:
+            # The status line has been sent already; report the error in-band for SSE
+            logger.warning(f"Streaming conversion of {file.filename} failed: {e}")
+            if not sse:
+                raise
+            detail = e.detail if isinstance(e, HTTPException) else f"Error during document conversion: {str(e)}"
+            yield _sse_event("error", detail)
+        finally:
+            save_path.unlink(missing_ok=True)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if sse else "text/markdown; charset=utf-8",
+        headers={
+            "X-Document-Mime-Type": mime_type,
+            "X-Document-Size": str(file_size),
+            "Cache-Control": "no-cache",
+        },
+    )
+
 @router.post(
     "/convert",
     response_model=ConversionResponse,
+    response_model_exclude_none=True,
     responses={
+        200: {
+            "description": "Converted document, or a markdown / Server-Sent Events stream when streaming",
+            "content": {"text/markdown": {}, "text/event-stream": {}},
+        },
+        400: {"model": ErrorResponse, "description": "Invalid page range"},
         413: {"model": ErrorResponse, "description": "File too large (max 10MB)"},
         415: {"model": ErrorResponse, "description": "Unsupported file type"},
         500: {"model": ErrorResponse, "description": "Internal server error during conversion"},
+        503: {"model": ErrorResponse, "description": "Conversion queue is full, retry after the Retry-After delay"},
+        504: {"model": ErrorResponse, "description": "Conversion exceeded the timeout configured for its format"},
     },
     description="Convert an uploaded document to markdown format",
     summary="Convert Document to Markdown",
     tags=["Conversion"],
 )
-async def convert_document(file: UploadFile) -> ConversionResponse:
+async def convert_document(
+    file: UploadFile,
+    request: Request,
+    stream: bool = Query(False, description="Stream the markdown as it is produced instead of returning JSON"),
+    pages: Optional[str] = Query(None, description="Pages of a PDF to convert, e.g. `5` or `3-10` (1-based, inclusive)"),
+    performance: bool = Query(False, description="Include stage timings, page counts and workers in the metadata"),
+    converter: "DocumentConverter" = Depends(get_converter),
+) -> Union[ConversionResponse, StreamingResponse]:
     """Convert an uploaded document to markdown format.
     
     This endpoint accepts various document formats and converts them to markdown,
@@ -45,16 +167,98 @@ async def convert_document(file: UploadFile) -> ConversionResponse:
     - Detected MIME type
     - File size
     
-    Note: Speaker notes in PowerPoint presentations are not currently supported.
+    Streaming:
+    With `stream=true` the markdown is returned as a chunked `text/markdown`
+    response, and with `Accept: text/event-stream` as Server-Sent Events
+    (`metadata`, one `markdown` event per piece, then `done` or `error`). PDFs
+    are streamed page by page as they are converted, so the first page arrives
+    long before a large document is finished. Upload validation errors are
+    still returned as regular error responses.
+    
+    Profiles:
+    The `profile` query parameter selects how PDFs are converted: `fast` uses
+    the text layer only (no OCR, no table structure), `balanced` adds fast
+    table structure recognition, and `full` runs OCR and accurate table
+    structure recognition. Use `fast` for born-digital PDFs.
+    
+    Pages:
+    The `pages` query parameter converts only part of a PDF, e.g. `pages=3-10`.
+    Long PDFs are split into page shards that are converted in parallel on
+    the conversion workers, and the markdown is joined in page order.
+    
+    Performance:
+    With `performance=true` the metadata includes a `performance` object with
+    the seconds spent uploading, detecting, converting and exporting the
+    document, the number of pages converted (and converted with OCR), and the
+    workers that converted it. Not available when streaming.
+    
+    Timeouts:
+    Each conversion job may take Settings.conversion_timeout seconds, or the
+    timeout configured for its format in conversion_timeout_by_format, before
+    it is stopped and 504 is returned. A conversion is also stopped when the
+    client disconnects before it finishes.
+    
+    Note: PowerPoint presentations are exported slide by slide, with a heading per
+    slide and speaker notes as `> Notes:` quotes.
     """
-    converter = DocumentConverter()
+    page_range = _page_range(pages)
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    if stream or sse:
+        with tempfile.NamedTemporaryFile(delete=False, dir=settings.temp_dir) as temp_file:
+            return await _stream_document(converter, file, Path(temp_file.name), sse, page_range)
+
+    # Path for the upload, only created if the upload is not converted from memory
+    temp_path = Path(settings.temp_dir or tempfile.gettempdir()) / f"upload-{uuid.uuid4().hex}"
+    try:
+        result = await _until_disconnected(request, converter.convert(file, temp_path, page_range, performance))
+        return ConversionResponse(**result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error during document conversion: {str(e)}"
+        )
+
+
+@router.post(
+    "/convert/batch",
+    response_model=BatchConversionResponse,
+    response_model_exclude_none=True,
+    responses={
+        413: {"model": ErrorResponse, "description": "Too many documents in the batch"},
+        500: {"model": ErrorResponse, "description": "Internal server error during conversion"},
+        503: {"model": ErrorResponse, "description": "Conversion queue is full, retry after the Retry-After delay"},
+        504: {"model": ErrorResponse, "description": "Conversion exceeded the timeout configured for its format"},
+    },
+    description="Convert many uploaded documents, or ZIP archives of documents, to markdown in one request",
+    summary="Convert Documents to Markdown in Batch",
+    tags=["Conversion"],
+)
+async def convert_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    converter: "DocumentConverter" = Depends(get_converter),
+) -> BatchConversionResponse:
+    """Convert several uploaded documents to markdown format in one request.
+    
+    Accepts any number of files in the `files` form field (up to the configured
+    batch size). ZIP archives are expanded and each member is converted as a
+    separate document. All documents are converted together through docling's
+    batch conversion on the shared converter.
     
-    # Create a temporary file to store the upload
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-        temp_path = Path(temp_file.name)
+    Each document is validated on its own: a document that is too large, has an
+    unsupported type or fails to convert is reported with its own status code
+    and error message, and does not fail the rest of the batch.
+    
+    Returns:
+    - One result per document, in upload order, with its markdown content and
+      metadata or its error
+    - The number of documents that succeeded and failed
+    """
+    with tempfile.TemporaryDirectory(dir=settings.temp_dir) as work_dir:
         try:
-            result = await converter.convert(file, temp_path)
-            return ConversionResponse(**result)
+            results = await _until_disconnected(request, converter.convert_batch(files, Path(work_dir)))
         except HTTPException:
             raise
         except Exception as e:
@@ -62,3 +266,10 @@ async def convert_document(file: UploadFile) -> ConversionResponse:
                 status_code=500,
                 detail=f"Error during document conversion: {str(e)}"
             )
+
+    succeeded = sum(1 for result in results if result["status_code"] == 200)
+    return BatchConversionResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+    )
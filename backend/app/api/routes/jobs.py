@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+from fastapi import APIRouter, Depends, UploadFile, HTTPException, Request, Response
+from ...core.jobs import job_manager
+from ...core.registry import get_converter
+from ...schemas.documents import ConversionResponse, ErrorResponse, JobStatus
+
+if TYPE_CHECKING:
+    from ...core.converter import DocumentConverter
+
+router = APIRouter()
+
+def _job_status(job: dict) -> JobStatus:
+    def timestamp(value):
+        return datetime.fromtimestamp(value, tz=timezone.utc) if value is not None else None
+
+    return JobStatus(
+        id=job["id"],
+        status=job["status"],
+        filename=job["filename"],
+        created_at=timestamp(job["created_at"]),
+        updated_at=timestamp(job["updated_at"]),
+        expires_at=timestamp(job["expires_at"]),
+        status_code=job["status_code"],
+        error=job["error"],
+    )
+
+def _get_job(job_id: str) -> dict:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+@router.post(
+    "/jobs",
+    response_model=JobStatus,
+    response_model_exclude_none=True,
+    status_code=202,
+    responses={
+        413: {"model": ErrorResponse, "description": "File too large (max 10MB)"},
+        415: {"model": ErrorResponse, "description": "Unsupported file type"},
+        503: {"model": ErrorResponse, "description": "Job queue is full, retry after the Retry-After delay"},
+    },
+    description="Submit a document for asynchronous conversion to markdown",
+    summary="Submit Conversion Job",
+    tags=["Jobs"],
+)
+async def submit_job(
+    file: UploadFile,
+    request: Request,
+    response: Response,
+    converter: "DocumentConverter" = Depends(get_converter),
+) -> JobStatus:
+    """Submit a document for conversion in the background.
+    
+    The upload is validated (size and type) and queued, and the job ID is
+    returned right away. Poll `GET /jobs/{id}` until the job has succeeded or
+    failed, then fetch the markdown from `GET /jobs/{id}/result`. Use this for
+    large documents (e.g. scanned PDFs with OCR) whose conversion would
+    outlast proxy timeouts.
+    
+    Finished jobs and their results are kept for a limited time (see the
+    `expires_at` field) and then deleted.
+    """
+    job = await job_manager.submit(file, converter)
+    response.headers["Location"] = str(request.url_for("get_job", job_id=job["id"]))
+    return _job_status(job)
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatus,
+    response_model_exclude_none=True,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown or expired job"},
+    },
+    description="Get the status of an asynchronous conversion job",
+    summary="Get Job Status",
+    tags=["Jobs"],
+)
+async def get_job(job_id: str) -> JobStatus:
+    """Get the current status of a conversion job."""
+    return _job_status(_get_job(job_id))
+
+@router.get(
+    "/jobs/{job_id}/result",
+    response_model=ConversionResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown or expired job"},
+        409: {"model": ErrorResponse, "description": "Job has not finished yet"},
+        415: {"model": ErrorResponse, "description": "Unsupported file type"},
+        500: {"model": ErrorResponse, "description": "Internal server error during conversion"},
+    },
+    description="Get the markdown produced by a finished conversion job",
+    summary="Get Job Result",
+    tags=["Jobs"],
+)
+async def get_job_result(job_id: str) -> ConversionResponse:
+    """Get the result of a finished conversion job.
+    
+    Returns the same response as `POST /convert` once the job has succeeded.
+    If the job failed, the error is returned with the status code the
+    conversion failed with. If the job has not finished yet, 409 Conflict is
+    returned.
+    """
+    job = _get_job(job_id)
+    if job["status"] in ("queued", "running"):
+        raise HTTPException(status_code=409, detail=f"Job is not finished yet: {job['status']}")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=job["status_code"], detail=job["error"])
+    return ConversionResponse(**job["result"])
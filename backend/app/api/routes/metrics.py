@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Response
+from ...core.metrics import render_metrics
+
+router = APIRouter()
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    responses={200: {"description": "Metrics in the Prometheus text format", "content": {"text/plain": {}}}},
+    description="Expose Prometheus metrics of the service",
+    summary="Prometheus Metrics",
+    tags=["Monitoring"],
+)
+async def metrics() -> Response:
+    """Expose the service metrics for Prometheus to scrape.
+    
+    Includes histograms of the upload, MIME detection, docling conversion (by
+    input format and profile), markdown export and total request time, counters
+    of responses by status code, cache lookups and pages processed, and the
+    depth of the conversion and job queues.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -1,3 +1,4 @@
+from typing import Dict, List, Literal, Optional
 from pydantic import validator
 from pydantic_settings import BaseSettings
 import os
@@ -11,6 +12,85 @@ class Settings(BaseSettings):
     # Security settings
     api_key: str  # Required, no default for security
     rate_limit_per_minute: int = 60  # Default rate limit is fine to keep
+    rate_limit_by: Literal["ip", "api_key"] = "ip"  # Count requests per client IP or per API key
+    rate_limit_backend: Literal["memory", "redis"] = "memory"  # Use redis to share limits across workers
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    rate_limit_max_keys: int = 100_000  # Clients tracked at once by the memory backend
+
+    # Monitoring settings
+    metrics_enabled: bool = True  # Serve Prometheus metrics on /metrics
+
+    # Server settings (gunicorn, see app.gunicorn_conf)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8001
+    server_workers: int = 1  # Server processes; above 1, models are preloaded and shared copy-on-write
+    server_preload: bool = True  # Load the models in the parent before forking the workers
+
+    # Upload settings
+    max_file_size: int = 10 * 1024 * 1024  # 10MB
+    max_file_size_by_format: Dict[str, int] = {}  # Per MIME type overrides of max_file_size
+    max_request_size_by_route: Dict[str, int] = {}  # Request body limits by path, overriding the derived ones
+    request_size_overhead: int = 64 * 1024  # Allowance for multipart boundaries and form fields
+    upload_chunk_size: int = 1024 * 1024  # Bytes read from the upload at a time
+    mime_sniff_bytes: int = 8 * 1024  # Leading bytes used for MIME type detection
+    in_memory_max_bytes: int = 2 * 1024 * 1024  # Uploads up to this size are converted from memory (0 disables)
+    temp_dir: Optional[str] = None  # Directory of temporary upload files (e.g. a tmpfs mount), defaults to the system's
+
+    # Converter settings
+    warm_up_on_startup: bool = True  # Initialize docling pipelines on startup
+    fast_start: bool = False  # Serve while warming up in the background (see /api/v1/ready)
+    default_profile: Literal["fast", "balanced", "full"] = "full"  # See app.core.profiles
+    warm_profiles: List[Literal["fast", "balanced", "full"]] = ["fast", "balanced", "full"]  # Profiles warmed on startup
+    artifacts_path: Optional[str] = None  # Directory of prefetched docling models (see app.warmup), downloaded on use if unset
+    ocr_auto_detect: bool = True  # Only OCR PDF pages without a text layer
+    ocr_min_text_chars: int = 32  # Text layer characters that make a page digital
+    ocr_min_image_coverage: float = 0.3  # Image area fraction that makes a textless page scanned
+    pptx_include_notes: bool = True  # Include the speaker notes of PowerPoint slides
+
+    # Image preprocessing settings (see app.core.images)
+    image_preprocess_enabled: bool = True  # Normalize images before OCR
+    image_max_dimension: int = 2500  # Longest side in pixels images are scaled down to (0 disables)
+    image_max_dpi: int = 300  # Resolution images declaring more are scaled down to (0 disables)
+    image_grayscale: bool = True  # Convert images to greyscale
+    image_frame: int = 0  # Frame of animated GIF and WebP images to convert
+
+    # Worker pool settings
+    conversion_worker_mode: Literal["thread", "process"] = "thread"
+    conversion_workers: int = 4  # Conversions running at once
+    conversion_queue_size: int = 16  # Conversions waiting for a free worker
+    conversion_timeout: float = 300.0  # Seconds per conversion job
+    conversion_timeout_by_format: Dict[str, float] = {}  # Per MIME type overrides of conversion_timeout
+    disconnect_poll_interval: float = 1.0  # Seconds between checks for a client gone during a conversion
+    conversion_retry_after: int = 5  # Retry-After seconds when the queue is full
+
+    # Admission control settings (see app.core.admission)
+    admission_enabled: bool = True  # Keep heavy documents from starving light ones
+    admission_light_workers: int = 1  # Conversion workers kept free of heavy documents
+    admission_heavy_cost: float = 30.0  # Estimated worker seconds from which a document is heavy
+    admission_max_heavy_backlog: float = 600.0  # Seconds of heavy work per heavy worker before shedding
+    admission_page_cost: float = 0.5  # Estimated seconds per PDF page without OCR
+    admission_ocr_page_cost: float = 3.0  # Estimated seconds per PDF page or image with OCR
+    admission_mb_cost: float = 2.0  # Estimated seconds per MB of other formats
+    shard_min_pages: int = 16  # Minimum PDF pages per parallel shard (0 disables sharding)
+
+    # Streaming settings
+    stream_pages_per_chunk: int = 1  # PDF pages converted per streamed piece
+
+    # Batch conversion settings
+    batch_max_files: int = 100  # Documents per batch request, including archive members
+
+    # Job API settings
+    job_store: Literal["sqlite", "memory"] = "sqlite"
+    job_db_path: Optional[str] = None  # Defaults to upload_dir/jobs.db
+    job_workers: int = 2  # Jobs converted at once
+    job_queue_size: int = 100  # Jobs waiting to be converted
+    job_ttl_seconds: int = 3600  # How long finished jobs and results are kept
+
+    # Result cache settings
+    cache_enabled: bool = True
+    cache_memory_max_bytes: int = 64 * 1024 * 1024  # 64MB of markdown in memory
+    cache_disk_enabled: bool = False  # Also keep results under upload_dir/cache
+    cache_disk_max_bytes: int = 1024 * 1024 * 1024  # 1GB on disk
     
     class Config:
         # Read from environment variables directly
@@ -0,0 +1,169 @@
+import asyncio
+import contextlib
+import logging
+import math
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Optional
+from fastapi import HTTPException
+from ..config import settings
+from .metrics import QUEUE_DEPTH
+from .workers import ConversionPool, conversion_pool
+
+logger = logging.getLogger(__name__)
+
+def estimate_cost(input_format: str, file_size: int, page_count: Optional[int] = None, ocr: bool = False) -> float:
+    """Estimate the worker seconds a conversion takes, from what is known before converting.
+
+    PDFs are costed per page (with OCR or not), images as one OCR page, and other
+    formats by size. The rates are Settings.admission_page_cost,
+    admission_ocr_page_cost and admission_mb_cost.
+
+    Args:
+        input_format (str): docling input format name (e.g. "pdf", "html")
+        file_size (int): Size of the document in bytes
+        page_count (Optional[int]): Pages to convert, for PDFs
+        ocr (bool): Whether the pages go through OCR
+
+    Returns:
+        float: Estimated cost in seconds of one conversion worker
+    """
+    if page_count:
+        return page_count * (settings.admission_ocr_page_cost if ocr else settings.admission_page_cost)
+    if input_format == "image":
+        return settings.admission_ocr_page_cost
+    return settings.admission_page_cost + file_size / (1024 * 1024) * settings.admission_mb_cost
+
+class AdmissionController:
+    """Keeps heavy conversions from starving light ones on a conversion pool.
+
+    Documents estimated to cost at least `heavy_cost` worker seconds are heavy.
+    Their conversion jobs may only occupy `pool.size - light_workers` workers at
+    once; further heavy jobs wait here instead of in the pool's queue, so light
+    documents always find a free worker (or a short queue) and keep a low
+    latency. Heavy documents are shed with 503 Service Unavailable and a
+    Retry-After header when the heavy work already admitted would take more
+    than `max_heavy_backlog` seconds to drain on the heavy workers.
+    """
+
+    def __init__(
+        self,
+        pool: ConversionPool,
+        light_workers: int = 1,
+        heavy_cost: float = 30.0,
+        max_heavy_backlog: float = 600.0,
+        retry_after: int = 5,
+    ):
+        """Initialize the controller.
+
+        Args:
+            pool (ConversionPool): Pool running the conversions
+            light_workers (int): Workers of the pool kept free of heavy jobs
+            heavy_cost (float): Estimated cost in seconds from which a document is heavy
+            max_heavy_backlog (float): Seconds of admitted heavy work per heavy worker
+                beyond which heavy documents are shed
+            retry_after (int): Minimum seconds sent in the Retry-After header when shedding
+        """
+        self.pool = pool
+        self.heavy_slots = max(1, pool.size - light_workers)
+        self.heavy_cost = heavy_cost
+        self.max_heavy_backlog = max_heavy_backlog
+        self.retry_after = retry_after
+        self._heavy_backlog = 0.0  # Estimated cost of the admitted heavy documents
+        self._running = 0  # Heavy jobs on the pool
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def heavy_backlog(self) -> float:
+        """Estimated seconds of heavy work admitted and not finished yet."""
+        return self._heavy_backlog
+
+    def is_heavy(self, cost: float) -> bool:
+        return cost >= self.heavy_cost
+
+    @contextlib.asynccontextmanager
+    async def admit(self, cost: float) -> AsyncIterator[bool]:
+        """Admit a document of the given estimated cost for the duration of the block.
+
+        Args:
+            cost (float): Estimated cost in seconds (see estimate_cost)
+
+        Yields:
+            bool: Whether the document is heavy, to pass to run()
+
+        Raises:
+            HTTPException: 503 Service Unavailable if the document is heavy and the
+                heavy backlog is full
+        """
+        if not self.is_heavy(cost):
+            yield False
+            return
+
+        projected = (self._heavy_backlog + cost) / self.heavy_slots
+        if self._heavy_backlog > 0 and projected > self.max_heavy_backlog:
+            retry_after = max(self.retry_after, math.ceil(projected - self.max_heavy_backlog))
+            logger.info(f"Shedding document of estimated cost {cost:.0f}s, heavy backlog {self._heavy_backlog:.0f}s")
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy with large documents, please retry later",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+        self._heavy_backlog += cost
+        QUEUE_DEPTH.labels(queue="heavy").inc()
+        try:
+            yield True
+        finally:
+            self._heavy_backlog -= cost
+            QUEUE_DEPTH.labels(queue="heavy").dec()
+
+    async def run(self, heavy: bool, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run fn(*args) on the pool, waiting for a heavy worker first if heavy.
+
+        The timeout is passed to ConversionPool.run() and only starts once a heavy
+        worker is free.
+
+        Raises:
+            HTTPException: As ConversionPool.run()
+        """
+        if not heavy:
+            return await self.pool.run(fn, *args, timeout=timeout)
+        await self._acquire()
+        try:
+            return await self.pool.run(fn, *args, timeout=timeout)
+        finally:
+            self._release()
+
+    async def _acquire(self) -> None:
+        if self._running < self.heavy_slots and not self._waiters:
+            self._running += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future  # The slot is handed over by _release()
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self._running -= 1
+
+def create_admission_controller(pool: ConversionPool) -> AdmissionController:
+    """Create an admission controller for a pool, configured by the admission settings."""
+    return AdmissionController(
+        pool,
+        light_workers=settings.admission_light_workers,
+        heavy_cost=settings.admission_heavy_cost,
+        max_heavy_backlog=settings.admission_max_heavy_backlog,
+        retry_after=settings.conversion_retry_after,
+    )
+
+admission_controller = create_admission_controller(conversion_pool)
@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """A content-addressed cache of converted markdown.
+
+    Entries are keyed by the SHA-256 digest of the uploaded bytes combined with a
+    fingerprint of the converter's pipeline options, so the same document converted
+    with different options gets separate entries. Entries live in memory with
+    size-based LRU eviction and, optionally, in an on-disk store that survives
+    restarts and is also evicted least-recently-used first.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        disk_dir: Optional[Path] = None,
+        disk_max_bytes: int = 0,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_bytes (int): Maximum total size of the in-memory entries
+            disk_dir (Optional[Path]): Directory of the on-disk store, or None for memory only
+            disk_max_bytes (int): Maximum total size of the on-disk store
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._disk_size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content_digest: str, options_fingerprint: str) -> str:
+        """Build a cache key from a document digest and a pipeline option fingerprint.
+
+        Args:
+            content_digest (str): Hex SHA-256 digest of the document bytes
+            options_fingerprint (str): Fingerprint of the converter options
+
+        Returns:
+            str: The cache key
+        """
+        return hashlib.sha256(f"{content_digest}:{options_fingerprint}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up converted markdown, checking memory first and then disk.
+
+        Args:
+            key (str): Cache key from make_key()
+
+        Returns:
+            Optional[str]: The cached markdown, or None on a miss
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                return data.decode("utf-8")
+
+        data = self._disk_get(key)
+        if data is None:
+            return None
+        with self._lock:
+            self._memory_put(key, data)
+        return data.decode("utf-8")
+
+    def put(self, key: str, content: str) -> None:
+        """Store converted markdown in memory and, if enabled, on disk.
+
+        Args:
+            key (str): Cache key from make_key()
+            content (str): The markdown content
+        """
+        data = content.encode("utf-8")
+        with self._lock:
+            self._memory_put(key, data)
+        self._disk_put(key, data)
+
+    def clear(self) -> None:
+        """Remove all in-memory entries. The on-disk store is left untouched."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _memory_put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.md"
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+        return data
+
+    def _disk_put(self, key: str, data: bytes) -> None:
+        if self.disk_dir is None or len(data) > self.disk_max_bytes:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = sum(p.stat().st_size for p in self.disk_dir.glob("*/*.md"))
+            else:
+                self._disk_size += len(data)
+            if self._disk_size > self.disk_max_bytes:
+                self._disk_evict()
+
+    def _disk_evict(self) -> None:
+        entries = []
+        for p in self.disk_dir.glob("*/*.md"):
+            try:
+                stat = p.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = self.disk_max_bytes * 0.9  # Leave headroom to avoid evicting on every write
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._disk_size = total
+
+result_cache = ResultCache(
+    max_bytes=settings.cache_memory_max_bytes,
+    disk_dir=Path(settings.upload_dir) / "cache" if settings.cache_disk_enabled else None,
+    disk_max_bytes=settings.cache_disk_max_bytes,
+)
@@ -1,18 +1,40 @@
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, BinaryIO, Callable, ContextManager, List, Optional, Tuple, Union
 from io import BytesIO
+from importlib.metadata import version
+import asyncio
+import contextlib
+import hashlib
+import math
 import mimetypes
-import magic
+import os
+import threading
+import time
+import zipfile
 from fastapi import HTTPException, UploadFile
 from docling.document_converter import DocumentConverter as DoclingConverter
-from docling.datamodel.base_models import InputFormat
-from docling_core.types.doc.labels import GroupLabel, DocItemLabel
+from docling.datamodel.base_models import ConversionStatus, DocumentStream, InputFormat
 from docling.document_converter import (
     PdfFormatOption, WordFormatOption, ImageFormatOption,
     HTMLFormatOption, PowerpointFormatOption
 )
 from docling.datamodel.pipeline_options import PipelineOptions, PdfPipelineOptions
 from docling.pipeline.simple_pipeline import SimplePipeline
+from ..config import settings
+from .admission import AdmissionController, admission_controller, create_admission_controller, estimate_cost
+from .cache import ResultCache, result_cache
+from .images import normalize_image
+from .metrics import CACHE_LOOKUPS, CONVERSION_SECONDS, EXPORT_SECONDS, PAGES_PROCESSED, STAGE_SECONDS
+from .mime import mime_detector
+from .presentation import export_presentation_markdown
+from .pdf import count_pages, page_chunks, page_runs, page_shards, scanned_pages
+from .profiles import pdf_pipeline_options as pdf_pipeline_options_for
+from .workers import ConversionPool, conversion_pool
+
+def _shared_converter(profile: str) -> "DocumentConverter":
+    """Return the shared converter of the current process (used when unpickling)."""
+    from .registry import converter_registry
+    return converter_registry.get(profile)
 
 class DocumentConverter:
     """A wrapper class for docling's DocumentConverter that handles file uploads and conversion.
@@ -40,26 +62,66 @@ class DocumentConverter:
         'application/vnd.openxmlformats-officedocument.presentationml.presentation': InputFormat.PPTX,
     }
 
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    MAX_FILE_SIZE = settings.max_file_size  # 10MB by default
+
+    ARCHIVE_FORMATS = {'application/zip'}  # Accepted by the batch endpoint only
 
-    def __init__(self):
+    def __init__(
+        self,
+        pool: Optional[ConversionPool] = None,
+        cache: Optional[ResultCache] = None,
+        profile: str = "full",
+        admission: Optional[AdmissionController] = None,
+    ):
         """Initialize the DocumentConverter with format-specific options.
         
+        Args:
+            pool (Optional[ConversionPool]): Worker pool running the blocking docling
+                conversion. Defaults to the process-wide conversion pool.
+            cache (Optional[ResultCache]): Cache of converted markdown. Defaults to the
+                process-wide result cache, or no cache if caching is disabled.
+            profile (str): Conversion profile selecting the PDF pipeline options
+                (see app.core.profiles). Defaults to "full".
+            admission (Optional[AdmissionController]): Admission control of heavy
+                documents on the pool. Defaults to the process-wide controller for
+                the process-wide pool, or a new one for another pool; none if
+                admission control is disabled.
+        
         This sets up the docling converter with appropriate pipeline options for each format:
-        - PDF: OCR and table structure recognition enabled
-        - Images: Basic OCR enabled
+        - PDF: Set by the profile; OCR and table structure recognition for "full".
+          With Settings.ocr_auto_detect, OCR only runs on scanned pages (see convert_file).
+        - Images: Basic OCR enabled, after downscaling and normalization (see
+          Settings.image_preprocess_enabled)
         - Word: Default options
         - HTML: Default options
         - PowerPoint: Default options with SimplePipeline
+        
+        With Settings.artifacts_path, models are loaded from that directory.
         """
+        self.profile = profile
+        self.pool = pool or conversion_pool
+        self.admission = admission
+        if self.admission is None and settings.admission_enabled:
+            if self.pool is conversion_pool:
+                self.admission = admission_controller
+            else:
+                self.admission = create_admission_controller(self.pool)
+        self.cache = cache or (result_cache if settings.cache_enabled else None)
+        self._fingerprint = None
+        self._text_converter = None
+
         # Configure PDF pipeline options
-        pdf_pipeline_options = PdfPipelineOptions()
-        pdf_pipeline_options.do_ocr = True  # Enable OCR for scanned documents
-        pdf_pipeline_options.do_table_structure = True  # Enable table structure recognition
+        pdf_pipeline_options = pdf_pipeline_options_for(profile)
 
         # Configure base pipeline options for other formats
         base_pipeline_options = PipelineOptions()
 
+        # Load the models from the directory prefetched by app.warmup instead of downloading them
+        if settings.artifacts_path:
+            for pipeline_options in (pdf_pipeline_options, base_pipeline_options):
+                if "artifacts_path" in type(pipeline_options).model_fields:
+                    pipeline_options.artifacts_path = settings.artifacts_path
+
         # Create converter with format-specific options
         self.converter = DoclingConverter(
             allowed_formats=[
@@ -78,8 +140,306 @@ class DocumentConverter:
             }
         )
 
+    def __reduce__(self):
+        # Converters are not shipped to worker processes; a converter pickled into a
+        # process pool job resolves to the shared converter of that worker process.
+        return (_shared_converter, (self.profile,))
+
+    @property
+    def options_fingerprint(self) -> str:
+        """A digest of the docling version and the pipeline options of every format.
+        
+        Used as part of the result cache key so that changing pipeline options or
+        upgrading docling never serves markdown produced by another configuration.
+        """
+        if self._fingerprint is None or self._fingerprint[0] is not self.converter:
+            hasher = hashlib.sha256(version("docling").encode())
+            for input_format, option in sorted(
+                self.converter.format_to_options.items(), key=lambda item: item[0].value
+            ):
+                hasher.update(input_format.value.encode())
+                hasher.update(option.pipeline_cls.__name__.encode())
+                if option.pipeline_options is not None:
+                    hasher.update(option.pipeline_options.model_dump_json().encode())
+            if self.text_converter is not None:
+                hasher.update(
+                    f"ocr-auto:{settings.ocr_min_text_chars}:{settings.ocr_min_image_coverage}".encode()
+                )
+            if not settings.pptx_include_notes:
+                hasher.update(b"pptx:no-notes")
+            if settings.image_preprocess_enabled:
+                hasher.update(
+                    f"image:{settings.image_max_dimension}:{settings.image_max_dpi}:"
+                    f"{settings.image_grayscale}:{settings.image_frame}".encode()
+                )
+            self._fingerprint = (self.converter, hasher.hexdigest())
+        return self._fingerprint[1]
+
+    @property
+    def text_converter(self) -> Optional[DoclingConverter]:
+        """A docling converter for PDF pages that have a text layer, or None.
+        
+        It uses the PDF pipeline options of the main converter with OCR turned
+        off. It is None when Settings.ocr_auto_detect is disabled or when the
+        main converter does not OCR PDFs in the first place, in which case every
+        PDF goes through the main converter.
+        """
+        pdf_option = self.converter.format_to_options.get(InputFormat.PDF)
+        if (
+            not settings.ocr_auto_detect
+            or pdf_option is None
+            or not getattr(pdf_option.pipeline_options, "do_ocr", False)
+        ):
+            return None
+        if self._text_converter is None or self._text_converter[0] is not self.converter:
+            pipeline_options = pdf_option.pipeline_options.model_copy(deep=True)
+            pipeline_options.do_ocr = False
+            text_converter = DoclingConverter(
+                allowed_formats=[InputFormat.PDF],
+                format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)},
+            )
+            self._text_converter = (self.converter, text_converter)
+        return self._text_converter[1]
+
+    def initialize_pipeline(self, input_format: InputFormat) -> None:
+        """Load the docling pipeline of a format, including the OCR-free PDF pipeline.
+        
+        Args:
+            input_format (InputFormat): Format whose pipeline should be initialized
+        """
+        self.converter.initialize_pipeline(input_format)
+        if input_format == InputFormat.PDF and self.text_converter is not None:
+            self.text_converter.initialize_pipeline(input_format)
+
+    def ocr_page_runs(
+        self, file_path: Path, page_range: Optional[Tuple[int, int]] = None
+    ) -> List[Tuple[Tuple[int, int], bool]]:
+        """Split a PDF into runs of consecutive pages that do or do not need OCR.
+        
+        Args:
+            file_path (Path): Path of the PDF
+            page_range (Optional[Tuple[int, int]]): First and last page (1-based, inclusive)
+                to inspect, or None for the whole document
+            
+        Returns:
+            List[Tuple[Tuple[int, int], bool]]: ((first page, last page), needs OCR) runs
+        """
+        flags = scanned_pages(
+            file_path, settings.ocr_min_text_chars, settings.ocr_min_image_coverage, page_range
+        )
+        return page_runs(flags, first_page=page_range[0] if page_range else 1)
+
+    def convert_file(
+        self,
+        file_path: Union[Path, DocumentStream],
+        input_format: InputFormat,
+        page_range: Optional[Tuple[int, int]] = None,
+    ) -> str:
+        """Convert a file on disk or in memory to markdown. This call blocks until docling is done.
+        
+        When OCR auto-detection applies (see text_converter), PDFs are inspected
+        first: pages with a text layer are converted without OCR, and only runs of
+        scanned pages go through the OCR pipeline. The markdown of the runs is
+        joined in page order.
+        
+        Args:
+            file_path (Union[Path, DocumentStream]): Path of the document to convert, or
+                the document itself as an in-memory stream (not inspected for OCR)
+            input_format (InputFormat): Detected docling input format
+            page_range (Optional[Tuple[int, int]]): First and last page (1-based, inclusive)
+                to convert, or None for the whole document
+            
+        Returns:
+            str: The markdown content
+        """
+        return self.convert_file_stats(file_path, input_format, page_range)[0]
+
+    def convert_file_stats(
+        self,
+        file_path: Union[Path, DocumentStream],
+        input_format: InputFormat,
+        page_range: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[str, dict]:
+        """Convert a file like convert_file(), also returning statistics of the conversion.
+        
+        Returns:
+            Tuple[str, dict]: The markdown content, and a dict with the seconds
+                spent in docling ("convert") and exporting markdown ("export"), the
+                number of pages converted ("pages", None for formats without pages)
+                and of pages converted with OCR ("ocr_pages"), and the worker that
+                converted the file ("worker", process id and thread name)
+        """
+        stats = {
+            "convert": 0.0,
+            "export": 0.0,
+            "pages": None,
+            "ocr_pages": 0,
+            "worker": f"{os.getpid()}/{threading.current_thread().name}",
+        }
+        if (
+            input_format != InputFormat.PDF
+            or self.text_converter is None
+            or isinstance(file_path, DocumentStream)
+        ):
+            markdown = self._convert(self.converter, file_path, input_format, page_range, stats)
+            return markdown, stats
+
+        runs = self.ocr_page_runs(file_path, page_range)
+        if len(runs) <= 1:
+            needs_ocr = bool(runs) and runs[0][1]
+            docling_converter = self.converter if needs_ocr else self.text_converter
+            markdown = self._convert(docling_converter, file_path, input_format, page_range, stats)
+            return markdown, stats
+
+        markdown = "\n\n".join(
+            self._convert(
+                self.converter if needs_ocr else self.text_converter, file_path, input_format, run_range, stats
+            )
+            for run_range, needs_ocr in runs
+        )
+        return markdown, stats
+
+    def _ocr_enabled(self, docling_converter: DoclingConverter, input_format: InputFormat) -> bool:
+        format_option = docling_converter.format_to_options.get(input_format)
+        return bool(getattr(getattr(format_option, "pipeline_options", None), "do_ocr", False))
+
+    def _convert(
+        self,
+        docling_converter: DoclingConverter,
+        file_path: Union[Path, DocumentStream],
+        input_format: InputFormat,
+        page_range: Optional[Tuple[int, int]],
+        stats: Optional[dict] = None,
+    ) -> str:
+        if input_format == InputFormat.IMAGE:
+            file_path = self._preprocess_image(file_path)
+        source = file_path if isinstance(file_path, DocumentStream) else str(file_path)
+        started = time.perf_counter()
+        if page_range is not None:
+            result = docling_converter.convert(source, page_range=page_range)
+        else:
+            result = docling_converter.convert(source)
+        converted = time.perf_counter()
+        self._record_conversion(input_format, result.document, converted - started)
+        markdown = self._export_markdown(result.document, input_format)
+        if stats is not None:
+            stats["convert"] += converted - started
+            stats["export"] += time.perf_counter() - converted
+            pages = len(getattr(result.document, "pages", None) or ())
+            if pages:
+                stats["pages"] = (stats["pages"] or 0) + pages
+                if self._ocr_enabled(docling_converter, input_format):
+                    stats["ocr_pages"] += pages
+        return markdown
+
+    def _preprocess_image(self, file_path: Union[Path, DocumentStream]) -> Union[Path, DocumentStream]:
+        """Downscale and normalize an image before OCR (see app.core.images).
+        
+        Returns:
+            Union[Path, DocumentStream]: The normalized image, named like the original
+                (the full path for files, so that batch results can be matched), or
+                file_path itself if preprocessing is disabled or changes nothing
+        """
+        if not settings.image_preprocess_enabled:
+            return file_path
+        in_memory = isinstance(file_path, DocumentStream)
+        with STAGE_SECONDS.labels(stage="preprocess").time():
+            if in_memory:
+                file_path.stream.seek(0)
+            normalized = normalize_image(
+                file_path.stream if in_memory else file_path,
+                settings.image_max_dimension,
+                settings.image_max_dpi,
+                settings.image_grayscale,
+                settings.image_frame,
+            )
+            if in_memory:
+                file_path.stream.seek(0)
+        if normalized is None:
+            return file_path
+        return DocumentStream(name=file_path.name if in_memory else str(file_path), stream=normalized)
+
+    def _record_conversion(self, input_format: InputFormat, document, seconds: float) -> None:
+        CONVERSION_SECONDS.labels(format=input_format.value, profile=self.profile).observe(seconds)
+        pages = getattr(document, "pages", None)
+        if pages:
+            PAGES_PROCESSED.labels(format=input_format.value, profile=self.profile).inc(len(pages))
+
+    def convert_files(self, files: List[Tuple[Path, InputFormat]]) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Convert several files on disk in one docling batch. This call blocks until docling is done.
+        
+        The documents go through docling's convert_all, which converts them one
+        after the other. A failing document does not stop the batch; its error is returned in place of its markdown. With OCR
+        auto-detection, PDFs without scanned pages are batched through the OCR-free
+        pipeline and PDFs mixing scanned and digital pages are converted one by one
+        as in convert_file(). Images are normalized before the batch as in convert_file().
+        
+        Args:
+            files (List[Tuple[Path, InputFormat]]): Paths and detected formats of the documents
+            
+        Returns:
+            List[Tuple[Optional[str], Optional[str]]]: (markdown, error) per input, in input order
+        """
+        outputs = {str(path): (None, "No conversion result") for path, _ in files}
+        formats = {str(path): input_format for path, input_format in files}
+
+        batches = {self.converter: []}
+        for path, input_format in files:
+            if input_format == InputFormat.IMAGE:
+                try:
+                    batches[self.converter].append(self._preprocess_image(path))
+                except Exception as e:
+                    outputs[str(path)] = (None, str(e))
+                continue
+            if input_format != InputFormat.PDF or self.text_converter is None:
+                batches[self.converter].append(path)
+                continue
+            try:
+                runs = self.ocr_page_runs(path)
+                if len(runs) > 1:
+                    outputs[str(path)] = (self.convert_file(path, input_format), None)
+                    continue
+            except Exception as e:
+                outputs[str(path)] = (None, str(e))
+                continue
+            docling_converter = self.converter if runs and runs[0][1] else self.text_converter
+            batches.setdefault(docling_converter, []).append(path)
+
+        for docling_converter, sources in batches.items():
+            if not sources:
+                continue
+            sources = [source if isinstance(source, DocumentStream) else str(source) for source in sources]
+            # convert_all converts each document when its result is requested, so the time
+            # spent in next() is that document's conversion, without the export of the previous one
+            results = docling_converter.convert_all(sources, raises_on_error=False)
+            while True:
+                started = time.perf_counter()
+                result = next(results, None)
+                if result is None:
+                    break
+                seconds = time.perf_counter() - started
+                key = str(result.input.file)
+                if key not in outputs:
+                    continue
+                if result.status in (ConversionStatus.SUCCESS, ConversionStatus.PARTIAL_SUCCESS):
+                    self._record_conversion(formats[key], result.document, seconds)
+                    outputs[key] = (self._export_markdown(result.document, formats[key]), None)
+                else:
+                    errors = "; ".join(error.error_message for error in result.errors)
+                    outputs[key] = (None, errors or f"Conversion finished with status {result.status.value}")
+
+        return [outputs[str(path)] for path, _ in files]
+
+    def _export_markdown(self, document, input_format: InputFormat) -> str:
+        with EXPORT_SECONDS.labels(format=input_format.value).time():
+            # Handle PowerPoint files specially
+            if input_format == InputFormat.PPTX:
+                return export_presentation_markdown(document, settings.pptx_include_notes)
+
+            return document.export_to_markdown()
+
     async def detect_file_type(self, file_path: Path) -> str:
-        """Detect the MIME type of a file using python-magic.
+        """Detect the MIME type of a file from its first bytes (see app.core.mime).
         
         Args:
             file_path (Path): Path to the file to analyze
@@ -87,22 +447,172 @@ class DocumentConverter:
         Returns:
             str: The detected MIME type (e.g., 'application/pdf', 'image/jpeg')
         """
-        mime = magic.Magic(mime=True)
-        return mime.from_file(str(file_path))
+        return mime_detector.from_file(file_path)
+
+    async def detect_buffer_type(self, head: bytes) -> str:
+        """Detect the MIME type of a document from its first bytes (see app.core.mime).
+        
+        Known signatures are matched directly; other documents are sniffed by a
+        libmagic handle shared across requests.
+        
+        Args:
+            head (bytes): The first bytes of the document (see Settings.mime_sniff_bytes)
+            
+        Returns:
+            str: The detected MIME type (e.g., 'application/pdf', 'image/jpeg')
+        """
+        with STAGE_SECONDS.labels(stage="detect").time():
+            return mime_detector.from_buffer(head)
+
+    @contextlib.contextmanager
+    def _stage(self, stage: str, timings: Optional[dict] = None):
+        """Time a request stage in STAGE_SECONDS and, if given, in the timings dict."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            STAGE_SECONDS.labels(stage=stage).observe(seconds)
+            if timings is not None:
+                timings[stage] = timings.get(stage, 0.0) + seconds
+
+    async def save_upload(
+        self, file: UploadFile, save_path: Path, allow_archive: bool = False, timings: Optional[dict] = None
+    ) -> tuple:
+        """Stream an upload to disk in chunks, validating it along the way.
+        
+        The upload is never held in memory as a whole: at most one chunk of
+        Settings.upload_chunk_size bytes is buffered at a time. The MIME type is
+        sniffed from the first Settings.mime_sniff_bytes bytes before anything is
+        written, and the size limit is enforced as soon as it is crossed.
+        
+        Args:
+            file (UploadFile): The uploaded file from FastAPI
+            save_path (Path): Path where the file should be saved
+            allow_archive (bool): Also accept the ARCHIVE_FORMATS (ZIP archives)
+            timings (Optional[dict]): If given, the seconds spent receiving the upload
+                ("upload") and detecting its MIME type ("detect") are added to it
+            
+        Returns:
+            tuple: (file_size, mime_type, sha256 hex digest of the content)
+            
+        Raises:
+            HTTPException:
+                - 413 Payload Too Large: If file size exceeds MAX_FILE_SIZE
+                - 415 Unsupported Media Type: If file type is not supported
+        """
+        with self._stage("upload", timings):
+            return await self._receive_upload(file, lambda: save_path.open("wb"), allow_archive, timings)
+
+    async def read_upload(self, file: UploadFile, timings: Optional[dict] = None) -> tuple:
+        """Read an upload into memory, validating it along the way.
+        
+        Meant for small uploads (see Settings.in_memory_max_bytes); validation is
+        the same as in save_upload().
+        
+        Args:
+            file (UploadFile): The uploaded file from FastAPI
+            timings (Optional[dict]): As in save_upload()
+            
+        Returns:
+            tuple: (content bytes, mime_type, sha256 hex digest of the content)
+            
+        Raises:
+            HTTPException:
+                - 413 Payload Too Large: If file size exceeds MAX_FILE_SIZE
+                - 415 Unsupported Media Type: If file type is not supported
+        """
+        buffer = BytesIO()
+        with self._stage("upload", timings):
+            _, mime_type, digest = await self._receive_upload(
+                file, lambda: contextlib.nullcontext(buffer), timings=timings
+            )
+        return buffer.getvalue(), mime_type, digest
+
+    async def _receive_upload(
+        self,
+        file: UploadFile,
+        open_output: Callable[[], ContextManager[BinaryIO]],
+        allow_archive: bool = False,
+        timings: Optional[dict] = None,
+    ) -> tuple:
+        # Reject early when the size is already known from the request. Until the
+        # format is known, uploads are held to the largest limit of any format.
+        if getattr(file, "size", None) is not None:
+            self.validate_file_size(file.size)
+
+        # Buffer just enough of the stream to sniff the MIME type
+        head = b""
+        while len(head) < settings.mime_sniff_bytes:
+            chunk = await file.read(settings.upload_chunk_size)
+            if not chunk:
+                break
+            head += chunk
+            self.validate_file_size(len(head))
+
+        started = time.perf_counter()
+        mime_type = await self.detect_buffer_type(head[:settings.mime_sniff_bytes])
+        if timings is not None:
+            timings["detect"] = timings.get("detect", 0.0) + time.perf_counter() - started
+        if not (allow_archive and mime_type in self.ARCHIVE_FORMATS):
+            self.validate_file_type(mime_type)
+        self.validate_file_size(len(head), mime_type)
+
+        file_size = len(head)
+        hasher = hashlib.sha256(head)
+        with open_output() as out:
+            out.write(head)
+            del head
+            while chunk := await file.read(settings.upload_chunk_size):
+                file_size += len(chunk)
+                self.validate_file_size(file_size, mime_type)
+                hasher.update(chunk)
+                out.write(chunk)
 
-    def validate_file_size(self, file_size: int) -> None:
+        return file_size, mime_type, hasher.hexdigest()
+
+    def max_file_size(self, mime_type: Optional[str] = None) -> int:
+        """Return the size limit of a document format.
+        
+        Args:
+            mime_type (Optional[str]): MIME type of the document, or None if it is not
+                known yet
+            
+        Returns:
+            int: The limit in Settings.max_file_size_by_format for the MIME type, or
+                MAX_FILE_SIZE. Without a MIME type, the largest limit of any format.
+        """
+        if mime_type is None:
+            return max([self.MAX_FILE_SIZE, *settings.max_file_size_by_format.values()])
+        return settings.max_file_size_by_format.get(mime_type, self.MAX_FILE_SIZE)
+
+    def conversion_timeout(self, mime_type: str) -> float:
+        """Return the seconds a conversion job of a document format may take.
+        
+        Args:
+            mime_type (str): MIME type of the document
+            
+        Returns:
+            float: The timeout in Settings.conversion_timeout_by_format for the MIME
+                type, or the timeout of the worker pool
+        """
+        return settings.conversion_timeout_by_format.get(mime_type, self.pool.timeout)
+
+    def validate_file_size(self, file_size: int, mime_type: Optional[str] = None) -> None:
         """Validate that the file size is within acceptable limits.
         
         Args:
             file_size (int): Size of the file in bytes
+            mime_type (Optional[str]): MIME type of the file, if already known (see max_file_size())
             
         Raises:
-            HTTPException: If the file size exceeds MAX_FILE_SIZE (413 Payload Too Large)
+            HTTPException: If the file size exceeds the limit (413 Payload Too Large)
         """
-        if file_size > self.MAX_FILE_SIZE:
+        limit = self.max_file_size(mime_type)
+        if file_size > limit:
             raise HTTPException(
                 status_code=413,
-                detail=f"File size exceeds maximum limit of {self.MAX_FILE_SIZE / 1024 / 1024}MB"
+                detail=f"File size exceeds maximum limit of {limit / 1024 / 1024}MB"
             )
 
     def validate_file_type(self, mime_type: str) -> None:
@@ -120,19 +630,280 @@ class DocumentConverter:
                 detail=f"Unsupported file type: {mime_type}"
             )
 
-    async def convert(self, file: UploadFile, save_path: Path) -> dict:
+    async def validate_page_range(
+        self, save_path: Union[Path, DocumentStream], input_format: InputFormat, page_range: Optional[Tuple[int, int]]
+    ) -> Optional[int]:
+        """Validate that a page range can be converted from a saved document.
+        
+        Args:
+            save_path (Union[Path, DocumentStream]): Path of the saved document; only read for PDFs
+            input_format (InputFormat): Detected docling input format
+            page_range (Optional[Tuple[int, int]]): First and last page (1-based, inclusive),
+                or None for the whole document
+            
+        Returns:
+            Optional[int]: Number of pages of a PDF, None for other formats
+            
+        Raises:
+            HTTPException: If a page range is given for a document that is not a PDF,
+                or goes beyond the last page of the PDF (400 Bad Request)
+        """
+        if input_format != InputFormat.PDF:
+            if page_range is not None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Page ranges are only supported for PDF documents"
+                )
+            return None
+
+        page_count = await asyncio.to_thread(count_pages, save_path)
+        if page_range is not None and page_range[1] > page_count:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Page range {page_range[0]}-{page_range[1]} exceeds the {page_count} pages of the document"
+            )
+        return page_count
+
+    async def _convert_pages(
+        self,
+        save_path: Union[Path, DocumentStream],
+        input_format: InputFormat,
+        page_range: Optional[Tuple[int, int]],
+        file_size: int = 0,
+        timeout: Optional[float] = None,
+    ) -> Tuple[str, dict]:
+        """Convert a saved document on the worker pool, sharding long PDFs across workers.
+        
+        PDFs with at least twice Settings.shard_min_pages pages (in the requested
+        range) are split into up to one shard per pool worker. The shards are
+        converted in parallel and their markdown is joined in page order.
+        
+        The cost of the document is estimated from its format, size and page
+        count first. Heavy documents go through admission control (see
+        app.core.admission): they may be rejected with 503 when too much heavy
+        work is pending, and are only sharded across the workers open to heavy
+        documents.
+        
+        `timeout` applies to each shard and defaults to the pool timeout.
+        
+        Returns:
+            Tuple[str, dict]: The markdown content, and the statistics of
+                convert_file_stats() summed over the shards, with the workers that
+                converted them listed under "workers"
+        """
+        page_count = await self.validate_page_range(save_path, input_format, page_range)
+        if page_count and page_range is not None:
+            page_count = page_range[1] - page_range[0] + 1
+        cost = estimate_cost(
+            input_format.value, file_size, page_count, self._ocr_enabled(self.converter, input_format)
+        )
+
+        async with self._admit(cost) as heavy:
+            shards = [page_range]
+            if page_count and settings.shard_min_pages > 0:
+                max_shards = self.admission.heavy_slots if heavy else self.pool.size
+                shards = page_shards(page_range or (1, page_count), settings.shard_min_pages, max_shards)
+
+            results = await asyncio.gather(*(
+                self._run(heavy, self.convert_file_stats, save_path, input_format, shard, timeout=timeout)
+                for shard in shards
+            ))
+        stats = {"convert": 0.0, "export": 0.0, "pages": None, "ocr_pages": 0, "workers": []}
+        for _, shard_stats in results:
+            stats["convert"] += shard_stats["convert"]
+            stats["export"] += shard_stats["export"]
+            if shard_stats["pages"] is not None:
+                stats["pages"] = (stats["pages"] or 0) + shard_stats["pages"]
+            stats["ocr_pages"] += shard_stats["ocr_pages"]
+            if shard_stats["worker"] not in stats["workers"]:
+                stats["workers"].append(shard_stats["worker"])
+        return "\n\n".join(markdown for markdown, _ in results), stats
+
+    def _admit(self, cost: float):
+        if self.admission is None:
+            return contextlib.nullcontext(False)
+        return self.admission.admit(cost)
+
+    async def _run(self, heavy: bool, fn: Callable, *args, timeout: Optional[float] = None):
+        if self.admission is None:
+            return await self.pool.run(fn, *args, timeout=timeout)
+        return await self.admission.run(heavy, fn, *args, timeout=timeout)
+
+    def _cache_key(self, digest: str, page_range: Optional[Tuple[int, int]] = None) -> str:
+        if page_range is not None:
+            digest = f"{digest}:pages={page_range[0]}-{page_range[1]}"
+        return ResultCache.make_key(digest, self.options_fingerprint)
+
+    async def convert_saved(
+        self,
+        save_path: Union[Path, DocumentStream],
+        filename: str,
+        file_size: int,
+        mime_type: str,
+        digest: str,
+        page_range: Optional[Tuple[int, int]] = None,
+        timings: Optional[dict] = None,
+    ) -> dict:
+        """Convert a validated document already saved to disk or read into memory, using the result cache.
+        
+        Args:
+            save_path (Union[Path, DocumentStream]): Path of the saved document, or the
+                document as an in-memory stream (formats other than PDF only)
+            filename (str): Original filename
+            file_size (int): Size in bytes
+            mime_type (str): Detected MIME type (must be in SUPPORTED_FORMATS)
+            digest (str): SHA-256 hex digest of the content
+            page_range (Optional[Tuple[int, int]]): First and last page (1-based, inclusive)
+                to convert, or None for the whole document. PDF only.
+            timings (Optional[dict]): Seconds already spent on the request by stage
+                (e.g. upload, detect). When given, the metadata includes the
+                performance details described in convert().
+        
+        Returns:
+            dict: Same as returned by convert()
+        
+        Raises:
+            HTTPException:
+                - 400 Bad Request: If the page range is invalid for the document
+                - 503 Service Unavailable: If the conversion queue is full, or too much
+                  heavy work is pending (see app.core.admission)
+                - 504 Gateway Timeout: If the conversion exceeds the timeout of its format
+        """
+        started = time.perf_counter()
+
+        # Serve repeated documents from the cache
+        cache_key = None
+        markdown_content = None
+        if self.cache is not None:
+            cache_key = self._cache_key(digest, page_range)
+            markdown_content = self.cache.get(cache_key)
+            CACHE_LOOKUPS.labels(result="hit" if markdown_content is not None else "miss").inc()
+        cache_hit = markdown_content is not None
+
+        stats = None
+        if not cache_hit:
+            # Convert document on the worker pool so the event loop stays responsive
+            markdown_content, stats = await self._convert_pages(
+                save_path, self.SUPPORTED_FORMATS[mime_type], page_range, file_size,
+                timeout=self.conversion_timeout(mime_type),
+            )
+            if cache_key is not None:
+                self.cache.put(cache_key, markdown_content)
+
+        metadata = {
+            "original_file": filename,
+            "mime_type": mime_type,
+            "file_size": file_size,
+            "cache_hit": cache_hit,
+        }
+        if timings is not None:
+            metadata["performance"] = self._performance(timings, stats, time.perf_counter() - started)
+        return {"content": markdown_content, "metadata": metadata}
+
+    def _performance(self, timings: dict, stats: Optional[dict], seconds: float) -> dict:
+        # The upload stage includes MIME detection; convert and export happen within seconds
+        timings = dict(timings, total=timings.get("upload", 0.0) + seconds)
+        if stats is not None:
+            timings["convert"] = stats["convert"]
+            timings["export"] = stats["export"]
+        return {
+            "timings": {stage: round(value, 6) for stage, value in timings.items()},
+            "page_count": stats["pages"] if stats else None,
+            "ocr_pages": stats["ocr_pages"] if stats else None,
+            "workers": stats["workers"] if stats else [],
+        }
+
+    async def stream_saved(
+        self,
+        save_path: Path,
+        mime_type: str,
+        digest: str,
+        page_range: Optional[Tuple[int, int]] = None,
+    ) -> AsyncIterator[str]:
+        """Convert a validated document already saved to disk, yielding markdown as it is produced.
+        
+        PDFs are converted Settings.stream_pages_per_chunk pages at a time, so the
+        first markdown is available after converting the first pages rather than
+        the whole document, and the complete markdown is never held in memory.
+        Other formats are yielded in one piece. Cached results are served from the
+        cache; streamed PDF conversions are not added to it, since that would mean
+        holding the whole markdown after all. The document goes through admission
+        control as a whole, like in convert_saved(), and each chunk is a job on a
+        heavy worker if the document is heavy.
+        
+        Args:
+            save_path (Path): Path of the saved document
+            mime_type (str): Detected MIME type (must be in SUPPORTED_FORMATS)
+            digest (str): SHA-256 hex digest of the content
+            page_range (Optional[Tuple[int, int]]): First and last page (1-based, inclusive)
+                to convert, or None for the whole document. PDF only.
+        
+        Yields:
+            str: Consecutive pieces of the markdown content
+        
+        Raises:
+            HTTPException:
+                - 400 Bad Request: If the page range is invalid for the document
+                - 503 Service Unavailable: If the conversion queue is full, or too much
+                  heavy work is pending (see app.core.admission)
+                - 504 Gateway Timeout: If converting a piece exceeds the timeout of its format
+        """
+        # Serve repeated documents from the cache
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self._cache_key(digest, page_range)
+            markdown_content = self.cache.get(cache_key)
+            CACHE_LOOKUPS.labels(result="hit" if markdown_content is not None else "miss").inc()
+            if markdown_content is not None:
+                yield markdown_content
+                return
+
+        input_format = self.SUPPORTED_FORMATS[mime_type]
+        page_count = await self.validate_page_range(save_path, input_format, page_range)
+        first, last = page_range or (1, page_count)
+        cost = estimate_cost(
+            input_format.value, save_path.stat().st_size, page_count and last - first + 1,
+            self._ocr_enabled(self.converter, input_format),
+        )
+        timeout = self.conversion_timeout(mime_type)
+
+        async with self._admit(cost) as heavy:
+            if input_format != InputFormat.PDF:
+                markdown_content = await self._run(heavy, self.convert_file, save_path, input_format, timeout=timeout)
+                if cache_key is not None:
+                    self.cache.put(cache_key, markdown_content)
+                yield markdown_content
+                return
+
+            for chunk_range in page_chunks(last, settings.stream_pages_per_chunk, first_page=first):
+                yield await self._run(heavy, self.convert_file, save_path, input_format, chunk_range, timeout=timeout)
+
+    async def convert(
+        self,
+        file: UploadFile,
+        save_path: Path,
+        page_range: Optional[Tuple[int, int]] = None,
+        performance: bool = False,
+    ) -> dict:
         """Convert an uploaded file to markdown format.
         
         This method handles the complete conversion process:
-        1. Reads and validates the uploaded file
-        2. Saves it temporarily to disk
-        3. Detects the file type
-        4. Converts the file to markdown using docling
-        5. Cleans up temporary files
+        1. Detects the file type from the first bytes of the upload
+        2. Streams the upload to disk, enforcing the size limit as it goes. Uploads
+           known to be at most Settings.in_memory_max_bytes are read into memory
+           instead and, unless they are PDFs, never written to disk.
+        3. Serves the markdown from the result cache, or converts the file using
+           docling on the worker pool and caches the result. Long PDFs are split
+           into page shards converted in parallel.
+        4. Cleans up temporary files
         
         Args:
             file (UploadFile): The uploaded file from FastAPI
-            save_path (Path): Path where the file should be temporarily saved
+            save_path (Path): Path where the file should be temporarily saved, if needed.
+                It does not have to exist beforehand.
+            page_range (Optional[Tuple[int, int]]): First and last page (1-based, inclusive)
+                to convert, or None for the whole document. PDF only.
+            performance (bool): Include performance details in the metadata
         
         Returns:
             dict: A dictionary containing:
@@ -141,48 +912,50 @@ class DocumentConverter:
                     - original_file (str): Original filename
                     - mime_type (str): Detected MIME type
                     - file_size (int): Size in bytes
+                    - cache_hit (bool): Whether the result came from the cache
+                    - performance (dict): Only with performance=True:
+                        - timings (dict): Seconds spent per stage: upload (including
+                          detect), detect, convert and export (summed over page
+                          shards and runs, absent on cache hits) and total
+                        - page_count (Optional[int]): Pages converted
+                        - ocr_pages (Optional[int]): Pages converted with OCR enabled
+                        - workers (List[str]): Workers that converted the document
         
         Raises:
             HTTPException:
+                - 400 Bad Request: If the page range is invalid for the document
                 - 413 Payload Too Large: If file size exceeds MAX_FILE_SIZE
                 - 415 Unsupported Media Type: If file type is not supported
                 - 500 Internal Server Error: If conversion fails
+                - 503 Service Unavailable: If the conversion queue is full, or too much
+                  heavy work is pending (see app.core.admission)
+                - 504 Gateway Timeout: If the conversion exceeds the timeout of its format
         """
+        timings = {} if performance else None
         try:
-            # Validate file size
-            file_size = 0
-            contents = await file.read()
-            file_size = len(contents)
-            self.validate_file_size(file_size)
-
-            # Save file temporarily to detect type
-            save_path.write_bytes(contents)
-            mime_type = await self.detect_file_type(save_path)
-            self.validate_file_type(mime_type)
-
-            # Convert document using the file path
-            result = self.converter.convert(str(save_path))
+            file_size = getattr(file, "size", None)
+            if file_size is not None and 0 < file_size <= settings.in_memory_max_bytes:
+                content, mime_type, digest = await self.read_upload(file, timings)
+                if self.SUPPORTED_FORMATS[mime_type] != InputFormat.PDF:
+                    # Let docling read the document from memory
+                    source = DocumentStream(
+                        name=f"document{mimetypes.guess_extension(mime_type) or ''}",
+                        stream=BytesIO(content),
+                    )
+                    return await self.convert_saved(
+                        source, file.filename, len(content), mime_type, digest, page_range, timings
+                    )
+                # PDFs are inspected and sharded by page, which needs a file
+                save_path.write_bytes(content)
+                return await self.convert_saved(
+                    save_path, file.filename, len(content), mime_type, digest, page_range, timings
+                )
 
-            # Handle PowerPoint files specially
-            if self.SUPPORTED_FORMATS[mime_type] == InputFormat.PPTX:
-                markdown_content = ""
-                for item, level in result.document.iterate_items(with_groups=True):
-                    if hasattr(item, 'children'):
-                        for child_ref in item.children:
-                            child = child_ref.resolve(result.document)
-                            if hasattr(child, 'text'):
-                                markdown_content += child.text + "\n\n"
-            else:
-                markdown_content = result.document.export_to_markdown()
-
-            return {
-                "content": markdown_content,
-                "metadata": {
-                    "original_file": file.filename,
-                    "mime_type": mime_type,
-                    "file_size": file_size,
-                }
-            }
+            # Stream the upload to disk, validating size and type on the way
+            file_size, mime_type, digest = await self.save_upload(file, save_path, timings=timings)
+            return await self.convert_saved(
+                save_path, file.filename, file_size, mime_type, digest, page_range, timings
+            )
 
         except HTTPException:
             raise
@@ -194,4 +967,215 @@ class DocumentConverter:
         finally:
             # Clean up temporary file
             if save_path.exists():
-                save_path.unlink()
\ No newline at end of file
+                save_path.unlink()
+
+    def extract_archive(self, archive_path: Path, work_dir: Path, max_files: Optional[int] = None) -> List[dict]:
+        """Extract the members of a ZIP archive for batch conversion.
+        
+        Members are copied to work_dir in chunks. Every member is held to
+        MAX_FILE_SIZE while it is being decompressed, whatever size its header
+        claims, so a crafted archive cannot fill the disk. The members are
+        counted from the central directory before anything is extracted.
+        
+        Args:
+            archive_path (Path): Path of the ZIP archive
+            work_dir (Path): Directory receiving the extracted members
+            max_files (Optional[int]): Maximum number of members (directories aside),
+                or None for no limit
+            
+        Returns:
+            List[dict]: One dictionary per member containing:
+                - name (str): Member name inside the archive
+                - path (Path): Path of the extracted member (absent on error)
+                - file_size (int): Size in bytes
+                - head (bytes): First bytes, for MIME type detection
+                - digest (str): SHA-256 hex digest of the content
+                - error (HTTPException): Present if the member was rejected
+        
+        Raises:
+            HTTPException: 413 Payload Too Large if the archive holds more than max_files members
+        """
+        members = []
+        with zipfile.ZipFile(archive_path) as archive:
+            infos = archive.infolist()
+            if max_files is not None and sum(not info.is_dir() for info in infos) > max_files:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Batch exceeds maximum of {settings.batch_max_files} documents"
+                )
+            for index, info in enumerate(infos):
+                if info.is_dir():
+                    continue
+                member = {"name": info.filename, "file_size": info.file_size}
+                members.append(member)
+                try:
+                    self.validate_file_size(info.file_size)
+                    path = work_dir / f"{archive_path.name}-{index}"
+                    hasher = hashlib.sha256()
+                    head = b""
+                    file_size = 0
+                    with archive.open(info) as source, path.open("wb") as out:
+                        while chunk := source.read(settings.upload_chunk_size):
+                            file_size += len(chunk)
+                            self.validate_file_size(file_size)
+                            if len(head) < settings.mime_sniff_bytes:
+                                head += chunk[:settings.mime_sniff_bytes - len(head)]
+                            hasher.update(chunk)
+                            out.write(chunk)
+                    member.update(path=path, file_size=file_size, head=head, digest=hasher.hexdigest())
+                except HTTPException as e:
+                    member["error"] = e
+        return members
+
+    async def convert_batch(self, files: List[UploadFile], work_dir: Path) -> List[dict]:
+        """Convert many uploaded files, or the members of uploaded ZIP archives, at once.
+        
+        Every document is validated and looked up in the result cache on its own.
+        The remaining documents are split into consecutive shares, one per pool
+        worker (per heavy worker if the batch is heavy), converted in parallel. Each
+        share is a single worker pool job using docling's batch conversion, which
+        amortises the dispatch overhead of converting documents one request at a
+        time. The batch goes through admission control with the summed cost of its
+        documents. A rejected or failing
+        document is reported in its own result and does not fail the batch.
+        
+        Args:
+            files (List[UploadFile]): The uploaded files from FastAPI
+            work_dir (Path): Directory where the files are temporarily saved
+        
+        Returns:
+            List[dict]: One dictionary per document, in upload order, containing:
+                - filename (str): Filename, or "archive.zip/member" for archive members
+                - status_code (int): 200 on success, otherwise the HTTP error status
+                - content (str): The markdown content (on success)
+                - metadata (dict): Same as returned by convert() (on success)
+                - error (str): Error message (on failure)
+        
+        Raises:
+            HTTPException:
+                - 413 Payload Too Large: If the batch holds more than Settings.batch_max_files documents
+                - 503 Service Unavailable: If the conversion queue is full, or too much
+                  heavy work is pending (see app.core.admission)
+                - 504 Gateway Timeout: If the batch exceeds its timeout
+        """
+        documents = []
+        for index, file in enumerate(files):
+            save_path = work_dir / f"upload-{index}"
+            try:
+                file_size, mime_type, digest = await self.save_upload(file, save_path, allow_archive=True)
+            except HTTPException as e:
+                documents.append({"filename": file.filename, "error": e})
+                continue
+
+            if mime_type not in self.ARCHIVE_FORMATS:
+                documents.append({
+                    "filename": file.filename, "path": save_path, "mime_type": mime_type,
+                    "file_size": file_size, "digest": digest,
+                })
+                continue
+
+            try:
+                members = await asyncio.to_thread(
+                    self.extract_archive, save_path, work_dir, settings.batch_max_files - len(documents)
+                )
+            except zipfile.BadZipFile as e:
+                documents.append({"filename": file.filename, "error": HTTPException(
+                    status_code=415, detail=f"Invalid ZIP archive: {str(e)}"
+                )})
+                continue
+            finally:
+                save_path.unlink()
+
+            for member in members:
+                document = {"filename": f"{file.filename}/{member['name']}", **member}
+                if "error" not in document:
+                    document["mime_type"] = await self.detect_buffer_type(member["head"])
+                    try:
+                        self.validate_file_type(document["mime_type"])
+                        self.validate_file_size(document["file_size"], document["mime_type"])
+                    except HTTPException as e:
+                        document["error"] = e
+                documents.append(document)
+
+            if len(documents) > settings.batch_max_files:
+                break
+
+        if len(documents) > settings.batch_max_files:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch exceeds maximum of {settings.batch_max_files} documents"
+            )
+
+        # Serve repeated documents from the cache
+        pending = []
+        for document in documents:
+            if "error" in document:
+                continue
+            document["cache_hit"] = False
+            if self.cache is not None:
+                document["cache_key"] = ResultCache.make_key(document["digest"], self.options_fingerprint)
+                document["content"] = self.cache.get(document["cache_key"])
+                document["cache_hit"] = document["content"] is not None
+                CACHE_LOOKUPS.labels(result="hit" if document["cache_hit"] else "miss").inc()
+            if not document["cache_hit"]:
+                pending.append(document)
+
+        if pending:
+            cost = 0.0
+            for document in pending:
+                input_format = self.SUPPORTED_FORMATS[document["mime_type"]]
+                page_count = None
+                if input_format == InputFormat.PDF:
+                    # Unreadable PDFs are costed by size and reported by the conversion
+                    with contextlib.suppress(Exception):
+                        page_count = await asyncio.to_thread(count_pages, document["path"])
+                cost += estimate_cost(
+                    input_format.value, document["file_size"], page_count,
+                    self._ocr_enabled(self.converter, input_format),
+                )
+            async with self._admit(cost) as heavy:
+                workers = self.admission.heavy_slots if heavy else self.pool.size
+                share = math.ceil(len(pending) / workers)
+                shares = [pending[start:start + share] for start in range(0, len(pending), share)]
+                share_outputs = await asyncio.gather(*(
+                    self._run(
+                        heavy,
+                        self.convert_files,
+                        [(document["path"], self.SUPPORTED_FORMATS[document["mime_type"]]) for document in batch],
+                        timeout=sum(self.conversion_timeout(document["mime_type"]) for document in batch),
+                    )
+                    for batch in shares
+                ))
+            outputs = [output for share_output in share_outputs for output in share_output]
+            for document, (markdown_content, error) in zip(pending, outputs):
+                if error is not None:
+                    document["error"] = HTTPException(
+                        status_code=500,
+                        detail=f"Error during document conversion: {error}"
+                    )
+                    continue
+                document["content"] = markdown_content
+                if self.cache is not None:
+                    self.cache.put(document["cache_key"], markdown_content)
+
+        results = []
+        for document in documents:
+            if "error" in document:
+                results.append({
+                    "filename": document["filename"],
+                    "status_code": document["error"].status_code,
+                    "error": document["error"].detail,
+                })
+                continue
+            results.append({
+                "filename": document["filename"],
+                "status_code": 200,
+                "content": document["content"],
+                "metadata": {
+                    "original_file": document["filename"],
+                    "mime_type": document["mime_type"],
+                    "file_size": document["file_size"],
+                    "cache_hit": document["cache_hit"],
+                }
+            })
+        return results
@@ -0,0 +1,83 @@
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+from PIL import Image, ImageOps
+
+def image_dpi(img: Image.Image) -> Optional[float]:
+    """Return the resolution an image declares (the higher of both axes), or None."""
+    dpi = img.info.get("dpi")
+    if not dpi:
+        return None
+    try:
+        return float(max(dpi)) or None
+    except (TypeError, ValueError):
+        return None
+
+def normalize_image(
+    source: Union[Path, BinaryIO],
+    max_dimension: int = 0,
+    max_dpi: int = 0,
+    grayscale: bool = False,
+    frame: int = 0,
+) -> Optional[BytesIO]:
+    """Prepare an image for OCR, whose cost grows with the number of pixels.
+
+    The image is scaled down so that its longest side is at most max_dimension
+    pixels and its declared resolution at most max_dpi. It is rotated upright
+    according to its EXIF orientation, and the EXIF data are dropped. Animated
+    images are reduced to one frame. Transparent areas are filled with white,
+    and the image is converted to greyscale if requested. JPEGs are decoded at
+    a reduced scale directly when they are scaled down.
+
+    Args:
+        source (Union[Path, BinaryIO]): Path of the image, or the image as a stream
+        max_dimension (int): Maximum width and height in pixels (0 for no limit)
+        max_dpi (int): Maximum resolution in dots per inch (0 for no limit)
+        grayscale (bool): Whether to convert the image to greyscale
+        frame (int): Frame of an animated image to keep (the last one if out of range)
+
+    Returns:
+        Optional[BytesIO]: The normalized image as PNG, or None if the image
+            needs no change
+    """
+    with Image.open(source) as img:
+        frames = getattr(img, "n_frames", 1)
+        if frames > 1:
+            img.seek(min(max(frame, 0), frames - 1))
+
+        dpi = image_dpi(img)
+        scale = 1.0
+        if max_dimension and max(img.size) > max_dimension:
+            scale = max_dimension / max(img.size)
+        if max_dpi and dpi and dpi > max_dpi:
+            scale = min(scale, max_dpi / dpi)
+        exif = img.getexif()
+        convert_mode = img.mode not in (("L", "1") if grayscale else ("L", "RGB"))
+        if scale >= 1 and not exif and frames == 1 and not convert_mode:
+            return None
+
+        long_side = max(1, round(max(img.size) * scale))
+        if scale < 1 and img.format == "JPEG":
+            # Let the decoder scale by a power of two, at least to the target size
+            img.draft("L" if grayscale else "RGB", (round(img.width * scale), round(img.height * scale)))
+
+        result = ImageOps.exif_transpose(img) if exif else img.copy()
+        if result.mode in ("RGBA", "LA", "PA") or (result.mode == "P" and "transparency" in result.info):
+            background = Image.new("RGBA", result.size, "white")
+            background.alpha_composite(result.convert("RGBA"))
+            result = background
+        mode = "L" if grayscale or result.mode == "L" else "RGB"
+        if result.mode != mode:
+            result = result.convert(mode)
+        if max(result.size) > long_side:
+            factor = long_side / max(result.size)
+            size = (max(1, round(result.width * factor)), max(1, round(result.height * factor)))
+            result = result.resize(size, Image.Resampling.LANCZOS)
+
+    output = BytesIO()
+    if dpi:
+        result.save(output, format="PNG", dpi=(dpi * scale, dpi * scale))
+    else:
+        result.save(output, format="PNG")
+    output.seek(0)
+    return output
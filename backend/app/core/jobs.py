@@ -0,0 +1,513 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+from fastapi import HTTPException, UploadFile
+from ..config import settings
+from .metrics import QUEUE_DEPTH
+
+if TYPE_CHECKING:
+    from .converter import DocumentConverter
+
+logger = logging.getLogger(__name__)
+
+class JobStore:
+    """Persistence interface for asynchronous conversion jobs.
+
+    A job is a dictionary with the keys listed in FIELDS. Timestamps are seconds
+    since the epoch; `result` holds the dictionary returned by
+    DocumentConverter.convert() once the job has succeeded. `owner` is the process
+    ID of the server process that queued the job and converts it, and
+    `heartbeat_at` the last time that process reported it was alive.
+    """
+
+    FIELDS = (
+        "id", "status", "filename", "mime_type", "file_size", "digest", "input_path",
+        "created_at", "updated_at", "expires_at", "status_code", "error", "result", "profile",
+        "owner", "heartbeat_at",
+    )
+
+    def add(self, job: dict) -> None:
+        """Store a new job."""
+        raise NotImplementedError
+
+    def update(self, job_id: str, **fields) -> None:
+        """Update fields of an existing job."""
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return a job, or None if it does not exist."""
+        raise NotImplementedError
+
+    def list_unfinished(self) -> List[dict]:
+        """Return the jobs that are still queued or running."""
+        raise NotImplementedError
+
+    def claim(self, job_id: str, owner: int, now: float) -> bool:
+        """Mark a queued job of an owner as running, atomically.
+
+        Returns:
+            bool: Whether the job was claimed; False if it is not queued or
+                belongs to another owner
+        """
+        raise NotImplementedError
+
+    def take_over(self, job_id: str, owner: Optional[int], new_owner: int, now: float) -> bool:
+        """Queue an unfinished job of an owner again for a new owner, atomically.
+
+        Returns:
+            bool: Whether the job was taken over; False if it has finished or
+                another process took it over first
+        """
+        raise NotImplementedError
+
+    def heartbeat(self, owner: int, now: float) -> None:
+        """Record that an owner is alive on all its unfinished jobs."""
+        raise NotImplementedError
+
+    def delete_expired(self, now: float) -> int:
+        """Delete finished jobs whose expiry time has passed and return how many were deleted."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+class MemoryJobStore(JobStore):
+    """Job store keeping jobs in memory. Jobs are lost when the process exits."""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def add(self, job: dict) -> None:
+        with self._lock:
+            self._jobs[job["id"]] = {field: job.get(field) for field in self.FIELDS}
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def list_unfinished(self) -> List[dict]:
+        with self._lock:
+            return [dict(job) for job in self._jobs.values() if job["status"] in ("queued", "running")]
+
+    def claim(self, job_id: str, owner: int, now: float) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != "queued" or job["owner"] != owner:
+                return False
+            job.update(status="running", updated_at=now, heartbeat_at=now)
+            return True
+
+    def take_over(self, job_id: str, owner: Optional[int], new_owner: int, now: float) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] not in ("queued", "running") or job["owner"] != owner:
+                return False
+            job.update(status="queued", owner=new_owner, updated_at=now, heartbeat_at=now)
+            return True
+
+    def heartbeat(self, owner: int, now: float) -> None:
+        with self._lock:
+            for job in self._jobs.values():
+                if job["owner"] == owner and job["status"] in ("queued", "running"):
+                    job["heartbeat_at"] = now
+
+    def delete_expired(self, now: float) -> int:
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["expires_at"] is not None and job["expires_at"] <= now
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+class SQLiteJobStore(JobStore):
+    """Job store persisting jobs in a SQLite database, so they survive restarts."""
+
+    def __init__(self, path: Path):
+        """Initialize the store. The database is created on first use.
+
+        Args:
+            path (Path): Path of the SQLite database file
+        """
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    filename TEXT,
+                    mime_type TEXT,
+                    file_size INTEGER,
+                    digest TEXT,
+                    input_path TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    expires_at REAL,
+                    status_code INTEGER,
+                    error TEXT,
+                    result TEXT,
+                    profile TEXT,
+                    owner INTEGER,
+                    heartbeat_at REAL
+                )"""
+            )
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in (("profile", "TEXT"), ("owner", "INTEGER"), ("heartbeat_at", "REAL")):
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)")
+            self._connection = connection
+        return self._connection
+
+    def _to_row(self, fields: dict) -> dict:
+        if fields.get("result") is not None:
+            fields = {**fields, "result": json.dumps(fields["result"])}
+        return fields
+
+    def _from_row(self, row: sqlite3.Row) -> dict:
+        job = dict(row)
+        if job["result"] is not None:
+            job["result"] = json.loads(job["result"])
+        return job
+
+    def add(self, job: dict) -> None:
+        row = self._to_row({field: job.get(field) for field in self.FIELDS})
+        placeholders = ", ".join("?" for _ in self.FIELDS)
+        with self._lock:
+            self._connect().execute(
+                f"INSERT INTO jobs ({', '.join(self.FIELDS)}) VALUES ({placeholders})",
+                [row[field] for field in self.FIELDS],
+            )
+
+    def update(self, job_id: str, **fields) -> None:
+        unknown = set(fields) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        row = self._to_row(fields)
+        assignments = ", ".join(f"{field} = ?" for field in row)
+        with self._lock:
+            self._connect().execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                [*row.values(), job_id],
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._from_row(row) if row is not None else None
+
+    def list_unfinished(self) -> List[dict]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT * FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def claim(self, job_id: str, owner: int, now: float) -> bool:
+        with self._lock:
+            cursor = self._connect().execute(
+                "UPDATE jobs SET status = 'running', updated_at = ?, heartbeat_at = ? "
+                "WHERE id = ? AND status = 'queued' AND owner = ?",
+                (now, now, job_id, owner),
+            )
+        return cursor.rowcount == 1
+
+    def take_over(self, job_id: str, owner: Optional[int], new_owner: int, now: float) -> bool:
+        with self._lock:
+            cursor = self._connect().execute(
+                "UPDATE jobs SET status = 'queued', owner = ?, updated_at = ?, heartbeat_at = ? "
+                "WHERE id = ? AND status IN ('queued', 'running') AND owner IS ?",
+                (new_owner, now, now, job_id, owner),
+            )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, owner: int, now: float) -> None:
+        with self._lock:
+            self._connect().execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status IN ('queued', 'running')",
+                (now, owner),
+            )
+
+    def delete_expired(self, now: float) -> int:
+        with self._lock:
+            cursor = self._connect().execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+def create_job_store() -> JobStore:
+    """Create the job store selected by Settings.job_store."""
+    if settings.job_store == "memory":
+        return MemoryJobStore()
+    path = Path(settings.job_db_path) if settings.job_db_path else Path(settings.upload_dir) / "jobs.db"
+    return SQLiteJobStore(path)
+
+class JobManager:
+    """Runs conversions in the background for the submit/poll/fetch job API.
+
+    Submitted uploads are validated and saved under jobs_dir right away, then
+    queued on an in-process queue drained by a fixed number of worker tasks.
+    Clients get the job ID immediately instead of holding a connection open for
+    the whole conversion. Finished jobs keep their result for `ttl` seconds.
+
+    Several server processes (gunicorn workers) may share a SQLite store. Each
+    job belongs to the process that queued it, which records its heartbeat on
+    the job and claims it atomically before converting it. On startup, jobs
+    left unfinished by a process that has exited or stopped sending heartbeats
+    are taken over and queued again when the input file is still available.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        jobs_dir: Path,
+        workers: int,
+        queue_size: int,
+        ttl: float,
+        retry_after: int = 5,
+        heartbeat_interval: float = 30,
+    ):
+        """Initialize the manager. Workers are started by start().
+
+        Args:
+            store (JobStore): Persistence for job state and results
+            jobs_dir (Path): Directory holding the uploaded files of pending jobs
+            workers (int): Number of jobs converted at once
+            queue_size (int): Maximum number of jobs waiting to be converted
+            ttl (float): Seconds a finished job and its result are kept
+            retry_after (int): Seconds sent in the Retry-After header when full
+            heartbeat_interval (float): Seconds between heartbeats; the jobs of a
+                process without a heartbeat for three intervals are taken over
+        """
+        self.store = store
+        self.jobs_dir = jobs_dir
+        self.workers = workers
+        self.queue_size = queue_size
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.heartbeat_interval = heartbeat_interval
+        self.owner: Optional[int] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._reserved = 0  # Queue slots held by submissions still saving their upload
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker tasks have been started."""
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Start the worker, heartbeat and cleanup tasks and queue jobs of exited processes."""
+        if self.running:
+            return
+        from .registry import converter_registry
+
+        # Taken after gunicorn forked this worker
+        self.owner = os.getpid()
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        for job in self.store.list_unfinished():
+            if self._owner_alive(job) or not self.store.take_over(job["id"], job["owner"], self.owner, time.time()):
+                continue
+            if Path(job["input_path"]).exists() and not self._queue.full():
+                self._queue.put_nowait((job["id"], converter_registry.get(job["profile"])))
+                QUEUE_DEPTH.labels(queue="jobs").inc()
+            else:
+                self._finish(job["id"], status_code=500, error="Job was interrupted by a restart")
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+        self._tasks.append(asyncio.create_task(self._cleanup()))
+
+    async def stop(self) -> None:
+        """Stop the worker tasks. Unfinished jobs stay in the store."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.store.close()
+
+    async def submit(self, file: UploadFile, converter: "DocumentConverter") -> dict:
+        """Validate and save an upload, then queue it for conversion.
+
+        Args:
+            file (UploadFile): The uploaded file from FastAPI
+            converter (DocumentConverter): Converter used to run the job
+
+        Returns:
+            dict: The queued job
+
+        Raises:
+            HTTPException:
+                - 413 Payload Too Large: If file size exceeds MAX_FILE_SIZE
+                - 415 Unsupported Media Type: If file type is not supported
+                - 503 Service Unavailable: If the job queue is full or not running
+        """
+        if not self.running:
+            raise HTTPException(status_code=503, detail="Job queue is not running")
+        # Reserve the queue slot before saving, so that concurrent submissions cannot overfill the queue
+        if self._queue.qsize() + self._reserved >= self.queue_size > 0:
+            raise HTTPException(
+                status_code=503,
+                detail="Job queue is full, please retry later",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        job_id = uuid.uuid4().hex
+        input_path = self.jobs_dir / job_id
+        self._reserved += 1
+        try:
+            file_size, mime_type, digest = await converter.save_upload(file, input_path)
+        except BaseException:
+            input_path.unlink(missing_ok=True)
+            raise
+        finally:
+            self._reserved -= 1
+
+        now = time.time()
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "filename": file.filename,
+            "mime_type": mime_type,
+            "file_size": file_size,
+            "digest": digest,
+            "input_path": str(input_path),
+            "created_at": now,
+            "updated_at": now,
+            "expires_at": None,
+            "status_code": None,
+            "error": None,
+            "result": None,
+            "profile": converter.profile,
+            "owner": self.owner,
+            "heartbeat_at": now,
+        }
+        self.store.add(job)
+        self._queue.put_nowait((job_id, converter))
+        QUEUE_DEPTH.labels(queue="jobs").inc()
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return a job, or None if it does not exist or has expired."""
+        job = self.store.get(job_id)
+        if job is None or (job["expires_at"] is not None and job["expires_at"] <= time.time()):
+            return None
+        return job
+
+    def _owner_alive(self, job: dict) -> bool:
+        owner = job["owner"]
+        # A job of this process ID was left by an earlier process that had the same ID
+        if owner is None or owner == self.owner:
+            return False
+        if job["heartbeat_at"] is None or job["heartbeat_at"] < time.time() - 3 * self.heartbeat_interval:
+            return False
+        try:
+            os.kill(owner, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass  # The process exists but belongs to another user
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, converter = await self._queue.get()
+            try:
+                await self._run(job_id, converter)
+            except Exception as e:
+                logger.exception(f"Job {job_id} crashed: {e}")
+            finally:
+                self._queue.task_done()
+                QUEUE_DEPTH.labels(queue="jobs").dec()
+
+    async def _run(self, job_id: str, converter: "DocumentConverter") -> None:
+        job = self.store.get(job_id)
+        if job is None:
+            return
+        if not self.store.claim(job_id, self.owner, time.time()):
+            logger.info(f"Job {job_id} was taken over by another process")
+            return
+        input_path = Path(job["input_path"])
+        try:
+            while True:
+                try:
+                    result = await converter.convert_saved(
+                        input_path, job["filename"], job["file_size"], job["mime_type"], job["digest"]
+                    )
+                    break
+                except HTTPException as e:
+                    # Wait for the conversion pool instead of failing the job
+                    if e.status_code != 503:
+                        raise
+                    await asyncio.sleep(self.retry_after)
+        except HTTPException as e:
+            self._finish(job_id, status_code=e.status_code, error=e.detail)
+        except Exception as e:
+            self._finish(job_id, status_code=500, error=f"Error during document conversion: {str(e)}")
+        else:
+            self._finish(job_id, status_code=200, result=result)
+        finally:
+            input_path.unlink(missing_ok=True)
+
+    def _finish(self, job_id: str, status_code: int, error: Optional[str] = None, result: Optional[dict] = None) -> None:
+        now = time.time()
+        self.store.update(
+            job_id,
+            status="succeeded" if status_code == 200 else "failed",
+            status_code=status_code,
+            error=error,
+            result=result,
+            updated_at=now,
+            expires_at=now + self.ttl,
+        )
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            self.store.heartbeat(self.owner, time.time())
+
+    async def _cleanup(self) -> None:
+        while True:
+            await asyncio.sleep(min(self.ttl, 60))
+            deleted = self.store.delete_expired(time.time())
+            if deleted:
+                logger.info(f"Deleted {deleted} expired jobs")
+
+job_manager = JobManager(
+    store=create_job_store(),
+    jobs_dir=Path(settings.upload_dir) / "jobs",
+    workers=settings.job_workers,
+    queue_size=settings.job_queue_size,
+    ttl=settings.job_ttl_seconds,
+    retry_after=settings.conversion_retry_after,
+)
@@ -0,0 +1,92 @@
+import os
+import tempfile
+from ..config import settings
+
+if settings.conversion_worker_mode == "process" and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    # The conversion worker processes record their metrics in files of this directory, which
+    # they inherit. prometheus_client reads the variable when it is imported.
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="doc-to-markdown-metrics-")
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+# Conversions of large scanned documents take minutes
+CONVERSION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+CACHE_LOOKUPS = Counter(
+    "doc_to_markdown_cache_lookups_total",
+    "Conversion result cache lookups",
+    ["result"],
+)
+
+STAGE_SECONDS = Histogram(
+    "doc_to_markdown_stage_seconds",
+    "Time spent in request stages outside docling: upload (reading and saving the upload, "
+    "including MIME detection), detect (MIME detection) and preprocess (normalizing images "
+    "before OCR)",
+    ["stage"],
+)
+
+CONVERSION_SECONDS = Histogram(
+    "doc_to_markdown_conversion_seconds",
+    "Time spent in docling converting one document or page range",
+    ["format", "profile"],
+    buckets=CONVERSION_BUCKETS,
+)
+
+EXPORT_SECONDS = Histogram(
+    "doc_to_markdown_export_seconds",
+    "Time spent exporting a converted document to markdown",
+    ["format"],
+)
+
+PAGES_PROCESSED = Counter(
+    "doc_to_markdown_pages_processed_total",
+    "Pages converted by docling",
+    ["format", "profile"],
+)
+
+REQUEST_SECONDS = Histogram(
+    "doc_to_markdown_request_seconds",
+    "Total time of HTTP requests, until the response is complete",
+    ["method"],
+    buckets=CONVERSION_BUCKETS,
+)
+
+RESPONSES = Counter(
+    "doc_to_markdown_responses_total",
+    "HTTP responses by status code (e.g. 413, 415, 429, 500)",
+    ["status"],
+)
+
+CONVERSIONS_CANCELLED = Counter(
+    "doc_to_markdown_conversions_cancelled_total",
+    "Conversion jobs whose caller stopped waiting, by reason (timeout, cancelled e.g. on client "
+    "disconnect) and outcome (withdrawn before starting, killed with its worker process, or "
+    "abandoned to run to completion on a thread)",
+    ["reason", "outcome"],
+)
+
+QUEUE_DEPTH = Gauge(
+    "doc_to_markdown_queue_depth",
+    "Conversions running or waiting, per queue",
+    ["queue"],
+    multiprocess_mode="livesum",
+)
+
+def render_metrics() -> tuple:
+    """Render the metrics in the Prometheus text format.
+
+    With the PROMETHEUS_MULTIPROC_DIR environment variable set (several server
+    workers, or the process worker mode, which sets it to a new temporary
+    directory when it is missing), the metrics of every process are collected
+    from that directory.
+
+    Returns:
+        tuple: (body bytes, content type)
+    """
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
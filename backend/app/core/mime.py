@@ -0,0 +1,72 @@
+import threading
+from pathlib import Path
+from typing import Optional
+from ..config import settings
+
+# Leading bytes that identify a format unambiguously
+SIGNATURES = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+# Part names that identify an Office Open XML package among ZIP archives
+OOXML_PARTS = (
+    (b"word/", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    (b"ppt/", "application/vnd.openxmlformats-officedocument.presentationml.presentation"),
+)
+
+class MimeDetector:
+    """Detects MIME types from the first bytes of a document.
+
+    Formats with a fixed signature (PDF, PNG, JPEG, GIF, WebP) and Office Open XML
+    packages whose content types and part names appear in the prefix are
+    recognized directly. Everything else is handed to libmagic. The libmagic
+    module is imported and its handle opened once, on first use, and shared; calls into it are serialized
+    since a handle must not be used by several threads at once.
+    """
+
+    def __init__(self):
+        self._magic: Optional["magic.Magic"] = None
+        self._lock = threading.Lock()
+
+    def from_buffer(self, head: bytes) -> str:
+        """Detect the MIME type of a document from its first bytes.
+
+        Args:
+            head (bytes): The first bytes of the document (see Settings.mime_sniff_bytes)
+
+        Returns:
+            str: The detected MIME type (e.g., 'application/pdf', 'image/jpeg')
+        """
+        for signature, mime_type in SIGNATURES:
+            if head.startswith(signature):
+                return mime_type
+        if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+            return "image/webp"
+        if head.startswith(b"PK\x03\x04") and b"[Content_Types].xml" in head:
+            for part, mime_type in OOXML_PARTS:
+                if part in head:
+                    return mime_type
+
+        with self._lock:
+            if self._magic is None:
+                import magic
+                self._magic = magic.Magic(mime=True)
+            return self._magic.from_buffer(head)
+
+    def from_file(self, file_path: Path) -> str:
+        """Detect the MIME type of a file from its first Settings.mime_sniff_bytes bytes.
+
+        Args:
+            file_path (Path): Path to the file to analyze
+
+        Returns:
+            str: The detected MIME type (e.g., 'application/pdf', 'image/jpeg')
+        """
+        with file_path.open("rb") as f:
+            return self.from_buffer(f.read(settings.mime_sniff_bytes))
+
+mime_detector = MimeDetector()
@@ -0,0 +1,165 @@
+from pathlib import Path
+from typing import List, Optional, Tuple
+import pypdfium2
+import pypdfium2.raw as pdfium_c
+
+def count_pages(file_path: Path) -> int:
+    """Count the pages of a PDF without parsing its content.
+    
+    Args:
+        file_path (Path): Path of the PDF
+        
+    Returns:
+        int: Number of pages
+    """
+    # pdfium is not thread-safe, and docling converts other documents on other threads
+    from docling.utils.locks import pypdfium2_lock
+
+    with pypdfium2_lock:
+        pdf = pypdfium2.PdfDocument(str(file_path))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+def page_chunks(page_count: int, chunk_size: int, first_page: int = 1) -> List[Tuple[int, int]]:
+    """Split pages first_page..page_count into consecutive inclusive ranges of chunk_size pages.
+    
+    Args:
+        page_count (int): Number of pages, i.e. the last page to include
+        chunk_size (int): Pages per range
+        first_page (int): First page to include
+        
+    Returns:
+        List[Tuple[int, int]]: (first page, last page) ranges, 1-based and inclusive
+    """
+    return [
+        (start, min(start + chunk_size - 1, page_count))
+        for start in range(first_page, page_count + 1, chunk_size)
+    ]
+
+def page_shards(page_range: Tuple[int, int], min_pages: int, max_shards: int) -> List[Tuple[int, int]]:
+    """Split a page range into at most max_shards ranges of at least min_pages pages each.
+    
+    The pages are spread as evenly as possible over the shards, so that shards
+    converted in parallel finish at about the same time.
+    
+    Args:
+        page_range (Tuple[int, int]): First and last page (1-based, inclusive) to split
+        min_pages (int): Minimum number of pages per shard
+        max_shards (int): Maximum number of shards
+        
+    Returns:
+        List[Tuple[int, int]]: (first page, last page) shards, 1-based and inclusive
+    """
+    first, last = page_range
+    page_count = last - first + 1
+    shards = max(1, min(max_shards, page_count // max(min_pages, 1)))
+    size, extra = divmod(page_count, shards)
+    ranges = []
+    start = first
+    for index in range(shards):
+        end = start + size - 1 + (1 if index < extra else 0)
+        ranges.append((start, end))
+        start = end + 1
+    return ranges
+
+def parse_page_range(pages: str) -> Tuple[int, int]:
+    """Parse a page selection such as "5" or "3-10" into an inclusive page range.
+    
+    Args:
+        pages (str): A single page number or a "first-last" range, 1-based
+        
+    Returns:
+        Tuple[int, int]: First and last page, 1-based and inclusive
+        
+    Raises:
+        ValueError: If the selection is malformed, not positive or reversed
+    """
+    first, _, last = pages.strip().partition("-")
+    try:
+        page_range = (int(first), int(last) if last else int(first))
+    except ValueError:
+        raise ValueError(f"Invalid page range: {pages}")
+    if page_range[0] < 1 or page_range[1] < page_range[0]:
+        raise ValueError(f"Invalid page range: {pages}")
+    return page_range
+
+def _image_coverage(page: pypdfium2.PdfPage) -> float:
+    """Fraction of the page area covered by image objects (overlaps counted twice, capped at 1).
+
+    Must be called with docling's pypdfium2_lock held, see scanned_pages().
+    """
+    width, height = page.get_size()
+    if width <= 0 or height <= 0:
+        return 0.0
+    covered = 0.0
+    for image in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_IMAGE]):
+        left, bottom, right, top = image.get_bounds()
+        covered += max(0.0, min(right, width) - max(left, 0.0)) * max(0.0, min(top, height) - max(bottom, 0.0))
+    return min(covered / (width * height), 1.0)
+
+def scanned_pages(
+    file_path: Path,
+    min_text_chars: int,
+    min_image_coverage: float,
+    page_range: Optional[Tuple[int, int]] = None,
+) -> List[bool]:
+    """Tell, for every page of a PDF, whether it is scanned and needs OCR.
+    
+    Only the embedded text layer and the image objects are inspected, which is
+    much cheaper than running layout analysis. A page is considered scanned if its
+    text layer holds fewer than min_text_chars characters while images cover at
+    least min_image_coverage of its area. Pages with a text layer (born-digital
+    pages, or scans that already went through OCR) and blank pages are not.
+    
+    Args:
+        file_path (Path): Path of the PDF
+        min_text_chars (int): Characters a page needs in its text layer to be considered digital
+        min_image_coverage (float): Fraction of the page area images must cover to be considered scanned
+        page_range (Optional[Tuple[int, int]]): First and last page (1-based, inclusive)
+            to inspect, or None for the whole document
+        
+    Returns:
+        List[bool]: Whether each inspected page needs OCR, in page order
+    """
+    # pdfium is not thread-safe, and docling converts other documents on other threads
+    from docling.utils.locks import pypdfium2_lock
+
+    with pypdfium2_lock:
+        pdf = pypdfium2.PdfDocument(str(file_path))
+        try:
+            first, last = page_range or (1, len(pdf))
+            flags = []
+            for index in range(first - 1, min(last, len(pdf))):
+                page = pdf[index]
+                try:
+                    textpage = page.get_textpage()
+                    try:
+                        text_chars = textpage.count_chars()
+                    finally:
+                        textpage.close()
+                    flags.append(text_chars < min_text_chars and _image_coverage(page) >= min_image_coverage)
+                finally:
+                    page.close()
+            return flags
+        finally:
+            pdf.close()
+
+def page_runs(flags: List[bool], first_page: int = 1) -> List[Tuple[Tuple[int, int], bool]]:
+    """Group consecutive pages sharing the same flag into inclusive page ranges.
+    
+    Args:
+        flags (List[bool]): One flag per page, e.g. from scanned_pages()
+        first_page (int): Page number of flags[0]
+        
+    Returns:
+        List[Tuple[Tuple[int, int], bool]]: ((first page, last page), flag) runs, 1-based and inclusive
+    """
+    runs = []
+    for page, flag in enumerate(flags, start=first_page):
+        if runs and runs[-1][1] == flag:
+            runs[-1] = ((runs[-1][0][0], page), flag)
+        else:
+            runs.append(((page, page), flag))
+    return runs
@@ -0,0 +1,84 @@
+from typing import List
+from docling_core.types.doc import ContentLayer, DoclingDocument, GroupItem, ListItem, TableItem, TextItem
+from docling_core.types.doc.labels import DocItemLabel, GroupLabel
+
+LIST_LABELS = (GroupLabel.LIST, GroupLabel.ORDERED_LIST)
+
+def export_presentation_markdown(document: DoclingDocument, include_notes: bool = True) -> str:
+    """Export a converted PowerPoint presentation to markdown.
+
+    docling represents each slide as a group (labelled chapter) holding the
+    slide's title, texts, lists, tables and pictures, and its speaker notes as
+    text in the furniture content layer. The document is walked once, in
+    order: every slide starts with a "## <title>" heading ("## Slide <n>" if it
+    has no title), list items become bullets indented by nesting, tables are
+    rendered as markdown tables, and speaker notes as "> Notes:" quotes unless
+    include_notes is False. Pictures are skipped. The blocks are joined once at the end, so the time
+    taken grows linearly with the size of the deck.
+
+    Args:
+        document (DoclingDocument): The converted presentation
+        include_notes (bool): Whether to include the speaker notes
+
+    Returns:
+        str: The markdown content
+    """
+    blocks: List[str] = []
+    slide_number = 0
+    slide_level = None
+    heading_index = None  # Index in blocks of the current slide's heading
+    titled = False
+    list_levels: List[int] = []  # Levels of the list groups enclosing the current item
+    in_list = False
+
+    for item, level in document.iterate_items(
+        with_groups=True, included_content_layers={ContentLayer.BODY, ContentLayer.FURNITURE}
+    ):
+        while list_levels and list_levels[-1] >= level:
+            list_levels.pop()
+
+        if isinstance(item, GroupItem):
+            if item.label == GroupLabel.CHAPTER:
+                slide_number += 1
+                slide_level = level
+                heading_index = len(blocks)
+                titled = False
+                in_list = False
+                blocks.append(f"## Slide {slide_number}")
+            elif item.label in LIST_LABELS:
+                list_levels.append(level)
+            continue
+
+        if isinstance(item, TableItem):
+            blocks.append(item.export_to_markdown(doc=document))
+            in_list = False
+            continue
+
+        if not isinstance(item, TextItem) or not item.text:
+            continue
+        text = item.text.strip()
+
+        if isinstance(item, ListItem):
+            marker = item.marker if item.enumerated and item.marker else "-"
+            line = "  " * max(len(list_levels) - 1, 0) + f"{marker} {text}"
+            if in_list:
+                blocks[-1] += "\n" + line
+            else:
+                blocks.append(line)
+                in_list = True
+            continue
+        in_list = False
+
+        if item.content_layer == ContentLayer.FURNITURE:
+            # Speaker notes, as far as docling extracts them
+            if slide_level is not None and include_notes:
+                blocks.append("> Notes: " + text.replace("\n", "\n> "))
+        elif item.label == DocItemLabel.TITLE and heading_index is not None and not titled:
+            blocks[heading_index] = f"## {text}"
+            titled = True
+        elif item.label in (DocItemLabel.TITLE, DocItemLabel.SECTION_HEADER):
+            blocks.append(f"### {text}")
+        else:
+            blocks.append(text)
+
+    return "\n\n".join(blocks)
@@ -0,0 +1,46 @@
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
+
+ConversionProfile = Literal["fast", "balanced", "full"]
+
+PROFILES = ("fast", "balanced", "full")
+
+def pdf_pipeline_options(profile: str) -> "PdfPipelineOptions":
+    """Build the PDF pipeline options of a conversion profile.
+    
+    Profiles trade conversion quality for speed:
+    - fast: Text layer only, no OCR and no table structure recognition. Suited
+      to born-digital PDFs.
+    - balanced: Text layer with table structure recognition in TableFormer's
+      fast mode, no OCR.
+    - full: OCR for scanned documents and accurate table structure recognition.
+    
+    Args:
+        profile (str): Name of the profile, one of PROFILES
+        
+    Returns:
+        PdfPipelineOptions: The pipeline options for PDFs
+        
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown conversion profile: {profile}")
+
+    # Imported here so that importing the profiles does not load docling
+    from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+
+    pipeline_options = PdfPipelineOptions()
+    if profile == "fast":
+        pipeline_options.do_ocr = False
+        pipeline_options.do_table_structure = False
+    elif profile == "balanced":
+        pipeline_options.do_ocr = False
+        pipeline_options.do_table_structure = True
+        pipeline_options.table_structure_options.mode = TableFormerMode.FAST
+    else:
+        pipeline_options.do_ocr = True  # Enable OCR for scanned documents
+        pipeline_options.do_table_structure = True  # Enable table structure recognition
+    return pipeline_options
@@ -0,0 +1,161 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from ..config import settings
+
+class RateLimitBackend:
+    """Storage interface for sliding-window request counters.
+
+    Requests are counted in fixed windows. The rate over the sliding window
+    ending now is estimated from the count of the current window plus the count
+    of the previous window weighted by how much of it still overlaps. That needs
+    two counters per key and constant time per request, whatever the limit.
+    """
+
+    async def hit(self, key: str, limit: int, window: float, now: float) -> Tuple[bool, float]:
+        """Count a request of a key if it is within the limit.
+
+        Args:
+            key (str): Client the request is counted for
+            limit (int): Requests allowed per sliding window
+            window (float): Length of the window in seconds
+            now (float): Current time in seconds since the epoch
+
+        Returns:
+            Tuple[bool, float]: Whether the request is allowed, and the seconds
+                until the current window ends (for Retry-After)
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release resources held by the backend."""
+
+def _estimate(previous: int, current: int, elapsed: float, window: float) -> float:
+    return previous * (1 - elapsed / window) + current
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Rate limit counters kept in the memory of one process.
+
+    Keys idle for a whole window no longer affect the rate and are evicted
+    (least recently used first) as other keys are counted, so memory stays
+    proportional to the number of recently active clients, and never exceeds
+    max_keys entries.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        """Initialize the backend.
+
+        Args:
+            max_keys (int): Maximum number of keys tracked at once
+        """
+        self.max_keys = max_keys
+        self._counters: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    async def hit(self, key: str, limit: int, window: float, now: float) -> Tuple[bool, float]:
+        index, elapsed = divmod(now, window)
+        with self._lock:
+            # Drop keys that were not seen during the previous or current window,
+            # and the least recently seen ones when a new key needs room
+            counter = self._counters.get(key)
+            while self._counters:
+                oldest_key, oldest = next(iter(self._counters.items()))
+                if oldest[0] >= index - 1 and (counter is not None or len(self._counters) < self.max_keys):
+                    break
+                del self._counters[oldest_key]
+                if oldest_key == key:
+                    counter = None
+
+            # [window index, count of the current window, count of the previous window]
+            if counter is None:
+                counter = self._counters[key] = [index, 0, 0]
+            else:
+                self._counters.move_to_end(key)
+            if counter[0] != index:
+                counter[2] = counter[1] if counter[0] == index - 1 else 0
+                counter[0], counter[1] = index, 0
+
+            if _estimate(counter[2], counter[1], elapsed, window) >= limit:
+                return False, window - elapsed
+            counter[1] += 1
+            return True, window - elapsed
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Rate limit counters kept in Redis, shared by every worker process.
+
+    Works with any client exposing the asyncio redis-py methods get, incr, decr
+    and expire. The count of a window is incremented atomically first and
+    decremented again if the request turns out to be over the limit, so
+    concurrent workers never let more requests through than allowed.
+    """
+
+    def __init__(self, client, prefix: str = "doc-to-markdown:ratelimit:"):
+        """Initialize the backend.
+
+        Args:
+            client: An asyncio Redis client, e.g. redis.asyncio.Redis
+            prefix (str): Prefix of the Redis keys
+        """
+        self.client = client
+        self.prefix = prefix
+
+    async def hit(self, key: str, limit: int, window: float, now: float) -> Tuple[bool, float]:
+        index, elapsed = divmod(now, window)
+        current_key = f"{self.prefix}{key}:{int(index)}"
+        previous_key = f"{self.prefix}{key}:{int(index) - 1}"
+
+        current = await self.client.incr(current_key)
+        if current == 1:
+            await self.client.expire(current_key, math.ceil(window * 2))
+        previous = int(await self.client.get(previous_key) or 0)
+
+        if _estimate(previous, current - 1, elapsed, window) >= limit:
+            await self.client.decr(current_key)
+            return False, window - elapsed
+        return True, window - elapsed
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+def create_rate_limit_backend() -> RateLimitBackend:
+    """Create the rate limit backend selected by Settings.rate_limit_backend."""
+    if settings.rate_limit_backend == "redis":
+        import redis.asyncio
+        return RedisRateLimitBackend(redis.asyncio.from_url(settings.rate_limit_redis_url))
+    return MemoryRateLimitBackend(max_keys=settings.rate_limit_max_keys)
+
+class RateLimiter:
+    """Limits the request rate of each client with a sliding window counter."""
+
+    def __init__(self, backend: RateLimitBackend, limit: int, window: float = 60):
+        """Initialize the limiter.
+
+        Args:
+            backend (RateLimitBackend): Storage of the counters
+            limit (int): Requests allowed per window and client
+            window (float): Length of the window in seconds
+        """
+        self.backend = backend
+        self.limit = limit
+        self.window = window
+
+    async def hit(self, key: str, now: Optional[float] = None) -> Tuple[bool, int]:
+        """Count a request of a client if it is within the limit.
+
+        Args:
+            key (str): Client the request is counted for (see Settings.rate_limit_by)
+            now (Optional[float]): Current time, defaults to time.time()
+
+        Returns:
+            Tuple[bool, int]: Whether the request is allowed, and the seconds to
+                wait before retrying if it is not
+        """
+        allowed, remaining = await self.backend.hit(
+            key, self.limit, self.window, time.time() if now is None else now
+        )
+        return allowed, max(1, math.ceil(remaining))
@@ -0,0 +1,153 @@
+import logging
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional
+from fastapi import Query
+from ..config import settings
+from .profiles import PROFILES, ConversionProfile
+
+if TYPE_CHECKING:
+    from .converter import DocumentConverter
+
+logger = logging.getLogger(__name__)
+
+class ConverterRegistry:
+    """Process-wide holder for the shared DocumentConverter of each conversion profile.
+
+    Building a DocumentConverter sets up docling's format options, and the first
+    conversion per format loads the layout, OCR and table models. The registry
+    builds one converter per profile, warms every format pipeline during
+    application startup and hands the same instances to every request.
+
+    Converters are built lazily on first use as well, so code paths that never
+    run the application lifespan (e.g. a TestClient used without a context manager)
+    still share one instance per profile. docling itself is only imported when the
+    first converter is built, which keeps importing the application fast.
+    """
+
+    def __init__(self, factory: Optional[Callable[..., "DocumentConverter"]] = None):
+        """Initialize an empty registry.
+
+        Args:
+            factory (Optional[Callable[..., DocumentConverter]]): Callable building a
+                converter, called with the profile as the `profile` keyword argument.
+                Defaults to DocumentConverter.
+        """
+        self._factory = factory
+        self._converters: Dict[str, "DocumentConverter"] = {}
+        self._warm_formats: Dict[str, set] = {}
+        self._failed_formats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, profile: Optional[str] = None) -> "DocumentConverter":
+        """Return the shared converter of a profile, building it on first use.
+
+        Args:
+            profile (Optional[str]): Conversion profile, defaults to Settings.default_profile
+
+        Returns:
+            DocumentConverter: The process-wide converter instance of the profile
+        """
+        profile = profile or settings.default_profile
+        converter = self._converters.get(profile)
+        if converter is None:
+            with self._lock:
+                converter = self._converters.get(profile)
+                if converter is None:
+                    logger.info(f"Building shared document converter for profile {profile}")
+                    factory = self._factory
+                    if factory is None:
+                        from .converter import DocumentConverter as factory
+                    converter = factory(profile=profile)
+                    self._converters[profile] = converter
+        return converter
+
+    def warm_up(self, profiles: Optional[Iterable[str]] = None) -> None:
+        """Initialize the docling pipeline of every allowed format of the given profiles.
+
+        Formats whose pipeline fails to initialize (e.g. models cannot be loaded)
+        are recorded and left cold; they will be initialized on first conversion.
+
+        Args:
+            profiles (Optional[Iterable[str]]): Profiles to warm, defaults to Settings.warm_profiles
+        """
+        for profile in profiles if profiles is not None else settings.warm_profiles:
+            converter = self.get(profile)
+            with self._lock:
+                warm = self._warm_formats.setdefault(profile, set())
+                failed = self._failed_formats.setdefault(profile, {})
+                for input_format in converter.converter.allowed_formats:
+                    if input_format in warm:
+                        continue
+                    try:
+                        converter.initialize_pipeline(input_format)
+                    except Exception as e:
+                        logger.warning(f"Could not warm {input_format.value} pipeline of profile {profile}: {e}")
+                        failed[input_format] = str(e)
+                    else:
+                        warm.add(input_format)
+                        failed.pop(input_format, None)
+
+    def status(self) -> dict:
+        """Report whether the shared converters and their pipelines are warm.
+
+        Returns:
+            dict: A dictionary containing:
+                - state (str): "warm" if every pipeline of every built profile is
+                  initialized, otherwise "cold"
+                - profiles (dict): Per built profile, its state and per-format state
+                  ("warm", "cold" or "failed")
+        """
+        profiles = {}
+        for profile, converter in list(self._converters.items()):
+            warm = self._warm_formats.get(profile, set())
+            failed = self._failed_formats.get(profile, {})
+            formats = {}
+            for input_format in converter.converter.allowed_formats:
+                if input_format in warm:
+                    formats[input_format.value] = "warm"
+                elif input_format in failed:
+                    formats[input_format.value] = "failed"
+                else:
+                    formats[input_format.value] = "cold"
+            state = "warm" if all(s == "warm" for s in formats.values()) else "cold"
+            profiles[profile] = {"state": state, "formats": formats}
+
+        state = "warm" if profiles and all(p["state"] == "warm" for p in profiles.values()) else "cold"
+        return {"state": state, "profiles": profiles}
+
+    def is_warm(self, profiles: Iterable[str]) -> bool:
+        """Whether every pipeline of the given profiles is initialized.
+
+        Args:
+            profiles (Iterable[str]): Profiles to check (e.g. Settings.warm_profiles)
+
+        Returns:
+            bool: False if one of the profiles is not built yet, or has a format
+                whose pipeline is cold or failed to initialize
+        """
+        for profile in profiles:
+            converter = self._converters.get(profile)
+            if converter is None:
+                return False
+            warm = self._warm_formats.get(profile, set())
+            if any(input_format not in warm for input_format in converter.converter.allowed_formats):
+                return False
+        return True
+
+    def reset(self) -> None:
+        """Drop the shared converters so that the next call to get() rebuilds them."""
+        with self._lock:
+            self._converters.clear()
+            self._warm_formats.clear()
+            self._failed_formats.clear()
+
+converter_registry = ConverterRegistry()
+
+def get_converter(
+    profile: Optional[ConversionProfile] = Query(
+        None,
+        description=f"Conversion profile: {', '.join(PROFILES)}. Defaults to the server's default profile.",
+    ),
+) -> "DocumentConverter":
+    """FastAPI dependency returning the shared DocumentConverter of the requested profile."""
+    return converter_registry.get(profile)
@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, List, Optional, Set
+from fastapi import HTTPException
+from ..config import settings
+from .metrics import CONVERSIONS_CANCELLED, QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+def _init_process_worker() -> None:
+    """Warm the shared converter of a freshly started worker process."""
+    from .registry import converter_registry
+    if settings.warm_up_on_startup:
+        converter_registry.warm_up()
+
+class ConversionPool:
+    """A bounded pool that runs blocking docling conversions off the event loop.
+
+    Jobs run on a thread pool by default, or on a process pool when mode is
+    "process". At most `size` jobs run at once and at most `max_queue` more wait
+    for a free worker; further submissions are rejected with 503 Service
+    Unavailable and a Retry-After header so the event loop keeps serving other
+    requests (including health checks) while conversions run. Jobs wait for a
+    free worker in the pool rather than in the executor, and a worker counts as
+    busy until its job is done, even if the caller stopped waiting for it.
+
+    In process mode, jobs must be picklable. Each worker slot has its own worker
+    process (a single-process executor), which holds its own shared converter,
+    built and warmed by the process initializer before the slot takes jobs.
+
+    A job whose caller stops waiting, because it timed out or was cancelled
+    (e.g. the client disconnected), is withdrawn if it has not started yet. If it
+    is already running, process mode kills the worker process running it and
+    starts a new one for that slot; jobs on other workers are not affected.
+    A thread cannot be stopped, so in thread mode the job runs to completion and
+    its result is discarded. Outcomes are counted in CONVERSIONS_CANCELLED.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_queue: int,
+        timeout: float,
+        mode: str = "thread",
+        retry_after: int = 5,
+    ):
+        """Initialize the pool. Workers are started by start() or on first use.
+
+        Args:
+            size (int): Maximum number of conversions running at once
+            max_queue (int): Maximum number of conversions waiting for a worker
+            timeout (float): Seconds a single job may run before it is abandoned
+            mode (str): "thread" or "process"
+            retry_after (int): Seconds sent in the Retry-After header when full
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown worker mode: {mode}")
+        self.size = size
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.mode = mode
+        self.retry_after = retry_after
+        self._executor: Optional[Executor] = None  # Thread mode
+        self._processes: List[Optional[Executor]] = [None] * size  # Process mode, one per slot
+        self._warm: Set[int] = set()  # Slots whose worker process is initialized
+        self._starting: Set[int] = set()  # Slots whose worker process is initializing
+        self._started = False
+        self._pending = 0
+        # Worker slots free for a job; process slots become free once their worker is initialized
+        self._idle: List[int] = list(range(size)) if mode == "thread" else []
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs running (including abandoned ones) or waiting for a worker."""
+        return self._pending
+
+    @property
+    def ready(self) -> bool:
+        """Whether every worker can take a job right away (worker processes are initialized)."""
+        return self.mode == "thread" or len(self._warm) == self.size
+
+    async def wait_started(self) -> None:
+        """Wait until every worker process has finished initializing, successfully or not."""
+        while self._starting:
+            await asyncio.sleep(0.1)
+
+    def start(self) -> None:
+        """Start the worker processes in process mode, each initializing its converters.
+
+        Must be called from the event loop. A slot only takes jobs once its
+        worker is initialized, so the initialization never counts against the
+        timeout of a job. Does nothing in thread mode or if already started.
+        """
+        if self.mode != "process" or self._started:
+            return
+        self._started = True
+        for slot in range(self.size):
+            self._start_process(slot)
+
+    def _start_process(self, slot: int) -> None:
+        """Start the worker process of a slot, freeing the slot once it is initialized."""
+        executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process_worker,
+        )
+        self._processes[slot] = executor
+        self._starting.add(slot)
+        self._call_back(executor.submit(os.getpid), self._process_started, slot, executor)
+
+    def _process_started(self, slot: int, executor: Executor, future: Future) -> None:
+        if self._processes[slot] is not executor:
+            return  # Killed or shut down meanwhile
+        self._starting.discard(slot)
+        if future.exception() is not None:
+            # Jobs on it fail with BrokenProcessPool, after which the worker is started again
+            logger.warning(f"Conversion worker process failed to start: {future.exception()}")
+        else:
+            self._warm.add(slot)
+        self._release(slot)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.size,
+                thread_name_prefix="conversion",
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run fn(*args) on a worker and wait for its result.
+
+        The job waits here until one of the `size` workers is free, and is only
+        handed to the executor then, so the timeout counts the time the job runs,
+        not the time it waits. A worker is freed when its job finishes, not when
+        the caller stops waiting: an abandoned job keeps counting against the
+        size and queue limits until it is done.
+
+        Args:
+            fn (Callable): The blocking function to run
+            *args: Positional arguments passed to fn
+            timeout (Optional[float]): Seconds the job may run, defaults to the pool timeout
+
+        Returns:
+            Any: The return value of fn
+
+        Raises:
+            HTTPException:
+                - 503 Service Unavailable: If the queue is full (with Retry-After)
+                - 504 Gateway Timeout: If the job runs longer than the timeout
+        """
+        if self._pending >= self.size + self.max_queue:
+            raise HTTPException(
+                status_code=503,
+                detail="Conversion queue is full, please retry later",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        self.start()
+        timeout = timeout or self.timeout
+        self._pending += 1
+        QUEUE_DEPTH.labels(queue="conversion").inc()
+        try:
+            slot = await self._acquire()
+        except asyncio.CancelledError:
+            self._job_finished()
+            CONVERSIONS_CANCELLED.labels(reason="cancelled", outcome="withdrawn").inc()
+            raise
+        try:
+            executor = self._processes[slot] if self.mode == "process" else self._get_executor()
+            job = executor.submit(fn, *args)
+        except BaseException:
+            self._release(slot)
+            self._job_finished()
+            raise
+        self._call_back(job, self._job_done, slot, executor)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(job), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Conversion job exceeded {timeout}s timeout")
+            self._stop(job, slot, "timeout")
+            raise HTTPException(
+                status_code=504,
+                detail=f"Document conversion timed out after {timeout:g} seconds"
+            )
+        except asyncio.CancelledError:
+            self._stop(job, slot, "cancelled")
+            raise
+
+    def _call_back(self, future: Future, callback: Callable[..., None], *args: Any) -> None:
+        """Call callback(*args, future) on the event loop once an executor future is done."""
+        loop = asyncio.get_running_loop()
+
+        def done(future: Future) -> None:
+            if loop.is_closed():
+                callback(*args, future)
+            else:
+                loop.call_soon_threadsafe(callback, *args, future)
+
+        future.add_done_callback(done)
+
+    def _job_done(self, slot: int, executor: Executor, job: Future) -> None:
+        """Free the worker slot and the pending count of a job once it is done."""
+        self._job_finished()
+        if self.mode == "process":
+            if self._processes[slot] is not executor:
+                return  # The worker was killed and the slot is being restarted
+            if not job.cancelled() and isinstance(job.exception(), BrokenProcessPool):
+                logger.warning("Conversion worker process died, starting a new one")
+                self._warm.discard(slot)
+                executor.shutdown(wait=False)
+                self._start_process(slot)
+                return
+        self._release(slot)
+
+    def _job_finished(self) -> None:
+        self._pending -= 1
+        QUEUE_DEPTH.labels(queue="conversion").dec()
+
+    async def _acquire(self) -> int:
+        if self._idle and not self._waiters:
+            return self._idle.pop()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            return await future  # The slot is handed over by _release()
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(future.result())
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            raise
+
+    def _release(self, slot: int) -> None:
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(slot)
+                return
+        self._idle.append(slot)
+
+    def _stop(self, job: Future, slot: int, reason: str) -> None:
+        """Stop a job whose caller is no longer waiting for it."""
+        if job.cancel():
+            outcome = "withdrawn"
+        elif job.done():
+            return
+        elif self.mode == "process":
+            outcome = "killed"
+            self._kill(slot)
+        else:
+            outcome = "abandoned"
+        CONVERSIONS_CANCELLED.labels(reason=reason, outcome=outcome).inc()
+
+    def _kill(self, slot: int) -> None:
+        """Kill the worker process of a slot and start a new one in its place."""
+        executor = self._processes[slot]
+        self._warm.discard(slot)
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            logger.warning(f"Killing conversion worker process {process.pid} to stop an abandoned job")
+            process.kill()
+        executor.shutdown(wait=False)
+        # Other slots are not affected; this one takes jobs again once its new worker is initialized
+        self._start_process(slot)
+
+    def shutdown(self) -> None:
+        """Stop the workers, cancelling jobs that have not started yet."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        for slot, executor in enumerate(self._processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._processes[slot] = None
+        if self.mode == "process":
+            self._warm.clear()
+            self._starting.clear()
+            self._idle.clear()
+            self._started = False
+
+conversion_pool = ConversionPool(
+    size=settings.conversion_workers,
+    max_queue=settings.conversion_queue_size,
+    timeout=settings.conversion_timeout,
+    mode=settings.conversion_worker_mode,
+    retry_after=settings.conversion_retry_after,
+)
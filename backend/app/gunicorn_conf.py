@@ -0,0 +1,55 @@
+"""gunicorn configuration running the API in several uvicorn worker processes.
+
+Usage (from the backend directory):
+    SERVER_WORKERS=8 gunicorn -c python:app.gunicorn_conf app.main:app
+
+With Settings.server_preload, the application is imported and the docling
+pipelines of Settings.warm_profiles are initialized once in the gunicorn
+master, before any worker is forked. The workers inherit the loaded models and
+share their memory copy-on-write: model weights are never written to, so their
+pages stay shared, and each worker only pays for the memory it allocates while
+converting. The warm-up in each worker's lifespan then finds the pipelines
+initialized and returns immediately.
+
+Things to keep in mind with several workers:
+- Use the thread worker mode (Settings.conversion_worker_mode); process mode
+  spawns fresh processes that load their own models.
+- Each worker runs Settings.conversion_workers conversions at once, and docling
+  uses OMP_NUM_THREADS threads per conversion. Unless set, OMP_NUM_THREADS is
+  set to the number of CPUs divided by the number of workers.
+- Rate limits are counted per worker unless Settings.rate_limit_backend is redis.
+- Metrics are aggregated across workers when PROMETHEUS_MULTIPROC_DIR is set to
+  an empty directory.
+"""
+import gc
+import os
+from app.config import settings
+
+bind = f"{settings.server_host}:{settings.server_port}"
+workers = settings.server_workers
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = settings.server_preload
+# Conversions run off the event loop, so workers keep answering heartbeats;
+# give in-flight conversions time to finish on shutdown
+graceful_timeout = int(settings.conversion_timeout)
+
+# Must be set before torch is imported, i.e. before the models are loaded
+os.environ.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // max(1, workers))))
+
+def on_starting(server):
+    """Load the models in the master, before the workers are forked."""
+    if not (preload_app and settings.warm_up_on_startup):
+        return
+    from app.core.registry import converter_registry
+
+    server.log.info(f"Preloading conversion models of profiles {', '.join(settings.warm_profiles)}")
+    converter_registry.warm_up()
+    # Move everything allocated so far out of the garbage collector's generations.
+    # Collections in the workers then never write to (and copy) the shared pages.
+    gc.freeze()
+
+def child_exit(server, worker):
+    """Drop the live gauges of a worker that exited from the aggregated metrics."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
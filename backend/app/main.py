@@ -1,9 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
+from fastapi.responses import JSONResponse
 from .config import settings
-from .api.routes import convert
-from .api.middleware.security import RateLimitMiddleware, verify_api_key
+from .api.routes import convert, jobs, metrics
+from .api.middleware.metrics import MetricsMiddleware
+from .api.middleware.security import APIKeyMiddleware, RateLimitMiddleware, api_key_header
+from .api.middleware.size import RequestSizeMiddleware
+from .core.jobs import job_manager
+from .core.registry import converter_registry
+from .core.workers import conversion_pool
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build and warm the shared document converter, before serving requests or, in fast-start mode, alongside.
+    
+    In process worker mode, conversions run in the worker processes, which warm
+    their own converters; the server process starts them and loads no models.
+    """
+    warm_up = None
+    if settings.conversion_worker_mode == "process":
+        conversion_pool.start()
+        if settings.warm_up_on_startup and not settings.fast_start:
+            await conversion_pool.wait_started()
+    elif settings.warm_up_on_startup and settings.fast_start:
+        warm_up = asyncio.create_task(asyncio.to_thread(converter_registry.warm_up))
+    elif settings.warm_up_on_startup:
+        await asyncio.to_thread(converter_registry.warm_up)
+    await job_manager.start()
+    yield
+    if warm_up is not None and not warm_up.done():
+        await asyncio.wait([warm_up])  # The warm-up thread cannot be interrupted
+    await job_manager.stop()
+    conversion_pool.shutdown()
 
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.app_name,
     version=settings.version,
     description="""
@@ -22,9 +54,12 @@ app = FastAPI(
     * Automatic file type detection
     * OCR for scanned documents and images
     * Table structure recognition
+    * Conversion profiles (fast, balanced, full) to skip OCR and tables when not needed
     * List and heading preservation
     * Image extraction and embedding
     * File size validation (max 10MB)
+    * Batch conversion of many files or ZIP archives
+    * Asynchronous jobs for long-running conversions
     
     The API is designed to be simple to use with a single endpoint for conversion
     and a health check endpoint for monitoring.
@@ -39,16 +74,44 @@ app = FastAPI(
     },
 )
 
-# Add security middleware
+# Reject oversized bodies before they are parsed. A request carries one document,
+# except for batches which carry up to Settings.batch_max_files of them.
+max_document_size = max([settings.max_file_size, *settings.max_file_size_by_format.values()])
+app.add_middleware(
+    RequestSizeMiddleware,
+    max_size=max_document_size + settings.request_size_overhead,
+    route_limits={
+        "/api/v1/convert/batch": max_document_size * settings.batch_max_files + settings.request_size_overhead,
+        **settings.max_request_size_by_route,
+    },
+)
+
+# Add security middleware (the last one added runs first)
+app.add_middleware(
+    APIKeyMiddleware,
+    protected_prefixes=["/api/v1/"],
+    public_paths=["/api/v1/health", "/api/v1/ready"],
+)
 app.add_middleware(RateLimitMiddleware)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
 
-# Add routers with API key dependency
+# Add routers; the API key is checked by APIKeyMiddleware, the dependency documents it
 app.include_router(
     convert.router,
     prefix="/api/v1",
     tags=["conversion"],
-    dependencies=[Depends(verify_api_key)]
+    dependencies=[Depends(api_key_header)]
 )
+app.include_router(
+    jobs.router,
+    prefix="/api/v1",
+    tags=["jobs"],
+    dependencies=[Depends(api_key_header)]
+)
+
+if settings.metrics_enabled:
+    app.include_router(metrics.router, tags=["monitoring"])
 
 @app.get(
     "/api/v1/health",
@@ -61,7 +124,18 @@ app.include_router(
             "description": "Service is healthy",
             "content": {
                 "application/json": {
-                    "example": {"status": "healthy"}
+                    "example": {
+                        "status": "healthy",
+                        "converter": {
+                            "state": "warm",
+                            "profiles": {
+                                "full": {
+                                    "state": "warm",
+                                    "formats": {"pdf": "warm", "image": "warm", "docx": "warm", "html": "warm", "pptx": "warm"}
+                                }
+                            }
+                        }
+                    }
                 }
             }
         }
@@ -70,12 +144,55 @@ app.include_router(
 async def health_check():
     """Check the health status of the service.
     
-    This endpoint can be used by monitoring tools to verify that:
+    This endpoint answers as soon as the server runs, without loading docling, and
+    is meant for liveness checks; see /api/v1/ready for readiness.
+    It can be used by monitoring tools to verify that:
     - The service is running and responding to requests
     - The web server is properly configured
     - The API routes are accessible
+    - The document converter pipelines are warm (models loaded) or still cold
+    
+    Returns:
+        dict: A status message and the warm/cold state of the shared converter
+    """
+    return {"status": "healthy", "converter": converter_registry.status()}
+
+@app.get(
+    "/api/v1/ready",
+    tags=["health"],
+    summary="Readiness Check",
+    description="Check if the conversion models are loaded and the service is ready for conversions",
+    responses={
+        200: {
+            "description": "The pipelines of every warmed profile are initialized",
+            "content": {"application/json": {"example": {"status": "ready", "converter": {"state": "warm", "profiles": {}}}}},
+        },
+        503: {
+            "description": "The models are still loading, or failed to load",
+            "content": {"application/json": {"example": {"status": "starting", "converter": {"state": "cold", "profiles": {}}}}},
+        },
+    },
+)
+async def readiness_check():
+    """Check whether the service is ready to convert documents.
+    
+    The service is ready once every pipeline of Settings.warm_profiles is
+    initialized. With fast start, the server answers health checks right away
+    and warms up in the background; use this endpoint as the readiness probe so
+    that no traffic is routed to it before the models are loaded. Without
+    warm-up on startup, models are loaded on first use and the service is
+    always ready. In process worker mode, the service is ready once every
+    conversion worker process is initialized.
     
     Returns:
-        dict: A simple status message indicating the service is healthy
+        JSONResponse: 200 with status "ready", or 503 with status "starting", and
+            the warm/cold state of the shared converters
     """
-    return {"status": "healthy"}
+    if settings.conversion_worker_mode == "process":
+        ready = conversion_pool.ready
+    else:
+        ready = not settings.warm_up_on_startup or converter_registry.is_warm(settings.warm_profiles)
+    return JSONResponse(
+        {"status": "ready" if ready else "starting", "converter": converter_registry.status()},
+        status_code=200 if ready else 503,
+    )
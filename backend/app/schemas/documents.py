@@ -1,11 +1,29 @@
-from typing import Dict
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 
+class ConversionPerformance(BaseModel):
+    """Where the time of a conversion went, returned on request."""
+    timings: Dict[str, float] = Field(
+        ...,
+        description="Seconds spent per stage: upload (receiving the document, including detect), "
+                    "detect (MIME type detection), convert (docling) and export (markdown), "
+                    "and total. Convert and export are summed over page shards and are "
+                    "absent when the result came from the cache."
+    )
+    page_count: Optional[int] = Field(None, description="Number of pages converted, for documents with pages")
+    ocr_pages: Optional[int] = Field(None, description="Number of pages converted with OCR enabled")
+    workers: List[str] = Field(default_factory=list, description="Conversion workers (process id/thread) that converted the document")
+
 class ConversionMetadata(BaseModel):
     """Metadata about the converted document."""
     original_file: str = Field(..., description="Original filename of the uploaded document")
     mime_type: str = Field(..., description="Detected MIME type of the document")
     file_size: int = Field(..., description="Size of the document in bytes")
+    cache_hit: bool = Field(False, description="Whether the markdown was served from the result cache")
+    performance: Optional[ConversionPerformance] = Field(
+        None, description="Stage timings and page counts (only with `performance=true`)"
+    )
 
 class ConversionResponse(BaseModel):
     """Response model for successful document conversion."""
@@ -26,11 +44,74 @@ class ConversionResponse(BaseModel):
                 "metadata": {
                     "original_file": "document.pdf",
                     "mime_type": "application/pdf",
-                    "file_size": 12345
+                    "file_size": 12345,
+                    "cache_hit": False
                 }
             }
         }
 
+class BatchItemResult(BaseModel):
+    """Result of converting one document of a batch."""
+    filename: str = Field(..., description="Filename, or archive.zip/member for documents inside a ZIP archive")
+    status_code: int = Field(..., description="200 on success, otherwise the HTTP status the document would have failed with")
+    content: Optional[str] = Field(None, description="The converted markdown content (on success)")
+    metadata: Optional[ConversionMetadata] = Field(None, description="Information about the converted document (on success)")
+    error: Optional[str] = Field(None, description="Error message describing what went wrong (on failure)")
+
+class BatchConversionResponse(BaseModel):
+    """Response model for batch document conversion."""
+    results: List[BatchItemResult] = Field(..., description="Per-document results, in upload order")
+    succeeded: int = Field(..., description="Number of documents converted successfully")
+    failed: int = Field(..., description="Number of documents that were rejected or failed to convert")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "results": [
+                    {
+                        "filename": "document.pdf",
+                        "status_code": 200,
+                        "content": "# Sample Document\n\nThis is a paragraph.",
+                        "metadata": {
+                            "original_file": "document.pdf",
+                            "mime_type": "application/pdf",
+                            "file_size": 12345,
+                            "cache_hit": False
+                        }
+                    },
+                    {
+                        "filename": "archive.zip/notes.txt",
+                        "status_code": 415,
+                        "error": "Unsupported file type: text/plain"
+                    }
+                ],
+                "succeeded": 1,
+                "failed": 1
+            }
+        }
+
+class JobStatus(BaseModel):
+    """Status of an asynchronous conversion job."""
+    id: str = Field(..., description="Job identifier")
+    status: Literal["queued", "running", "succeeded", "failed"] = Field(..., description="Current state of the job")
+    filename: str = Field(..., description="Original filename of the uploaded document")
+    created_at: datetime = Field(..., description="When the job was submitted")
+    updated_at: datetime = Field(..., description="When the job last changed state")
+    expires_at: Optional[datetime] = Field(None, description="When the finished job and its result will be deleted")
+    status_code: Optional[int] = Field(None, description="HTTP status of the finished conversion")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": "3f2b9c4e1d5a4b7c8e9f0a1b2c3d4e5f",
+                "status": "queued",
+                "filename": "document.pdf",
+                "created_at": "2024-01-01T12:00:00Z",
+                "updated_at": "2024-01-01T12:00:00Z"
+            }
+        }
+
 class ErrorResponse(BaseModel):
     """Response model for conversion errors."""
     detail: str = Field(
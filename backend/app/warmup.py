@@ -0,0 +1,312 @@
+"""Prefetch the docling models into a local directory and check that they work offline.
+
+Usage (from the backend directory, e.g. in docker/backend/Dockerfile):
+    ARTIFACTS_PATH=/opt/docling-models python -m app.warmup [--profiles fast full] [--verify-only]
+
+The models needed by the format options of the converters of
+Settings.warm_profiles (and Settings.default_profile) are worked out from their
+pipeline options: the layout model for PDFs and images, TableFormer when table
+structure recognition is on, the OCR engine's models when OCR is on, and the
+enrichment models that are enabled. They are downloaded with docling's model
+downloader into Settings.artifacts_path, and a manifest of the SHA-256 of every
+file is written next to them.
+
+The command then verifies the files against the manifest and converts a tiny
+generated document of every format, plus a scanned PDF that goes through OCR,
+with every profile, loading the models from Settings.artifacts_path only. A server started with the same ARTIFACTS_PATH (and
+HF_HUB_OFFLINE=1) then never downloads anything. With --verify-only, nothing is
+downloaded: the manifest is checked and the documents are converted, which
+fails if a model is missing.
+"""
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.core.converter import DocumentConverter
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+SAMPLE_TEXT = "Warm-up document"
+
+# OCR engines whose models come with a system package instead of docling's downloader
+SYSTEM_MODELS = frozenset({"tesseract", "tesserocr", "ocrmac"})
+
+# docling input format of the samples not named after one
+SAMPLE_FORMATS = {"scanned": "pdf"}
+
+def required_models(docling_converters: Iterable) -> Dict[str, bool]:
+    """Work out the model groups needed by the format options of docling converters.
+
+    Args:
+        docling_converters (Iterable): docling DocumentConverters, e.g. the
+            `converter` and `text_converter` of each DocumentConverter
+
+    Returns:
+        Dict[str, bool]: The `with_*` keyword arguments of docling's download_models
+            for the needed groups (layout, tableformer, code_formula,
+            picture_classifier and the OCR engine, e.g. easyocr), set to True
+    """
+    needed = set()
+    for docling_converter in docling_converters:
+        for option in docling_converter.format_to_options.values():
+            if option.pipeline_cls.__name__ != "StandardPdfPipeline":
+                continue  # Simple pipelines (Word, HTML, PowerPoint) run no models
+            needed.add("layout")
+            options = option.pipeline_options
+            if getattr(options, "do_table_structure", False):
+                needed.add("tableformer")
+            if getattr(options, "do_ocr", False):
+                needed.add(getattr(getattr(options, "ocr_options", None), "kind", "easyocr"))
+            if getattr(options, "do_code_enrichment", False) or getattr(options, "do_formula_enrichment", False):
+                needed.add("code_formula")
+            if getattr(options, "do_picture_classification", False):
+                needed.add("picture_classifier")
+    return {f"with_{name}": True for name in sorted(needed)}
+
+def download(artifacts_path: Path, models: Dict[str, bool]) -> Dict[str, bool]:
+    """Download the given model groups into a directory with docling's model downloader.
+
+    Groups the installed docling does not know are skipped: those of
+    SYSTEM_MODELS need no download, the others are reported as missing by
+    missing_models(). Groups not requested are turned off.
+
+    Args:
+        artifacts_path (Path): Directory to download the models to
+        models (Dict[str, bool]): `with_*` keyword arguments, see required_models()
+
+    Returns:
+        Dict[str, bool]: The `with_*` keyword arguments of the groups downloaded
+    """
+    from docling.utils.model_downloader import download_models
+
+    parameters = inspect.signature(download_models).parameters
+    flags = {name: models.get(name, False) for name in parameters if name.startswith("with_")}
+    skipped = sorted(name for name in models if name not in parameters)
+    if skipped:
+        logger.info(f"No download needed or available for: {', '.join(skipped)}")
+    downloaded = {name: True for name, wanted in flags.items() if wanted}
+    logger.info(f"Downloading {', '.join(downloaded)} to {artifacts_path}")
+    download_models(output_dir=artifacts_path, progress=False, **flags)
+    return downloaded
+
+def _digest(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1024 * 1024):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _model_files(artifacts_path: Path) -> List[Path]:
+    return sorted(
+        path for path in artifacts_path.rglob("*")
+        if path.is_file() and path.name != MANIFEST_NAME and ".cache" not in path.relative_to(artifacts_path).parts
+    )
+
+def write_manifest(artifacts_path: Path, models: Dict[str, bool]) -> dict:
+    """Record the size and SHA-256 of every file of an artifacts directory.
+
+    Args:
+        artifacts_path (Path): Directory of the models
+        models (Dict[str, bool]): `with_*` keyword arguments of the groups
+            downloaded, as returned by download()
+
+    Returns:
+        dict: The manifest, also written to MANIFEST_NAME in the directory
+    """
+    files = {
+        path.relative_to(artifacts_path).as_posix(): {"size": path.stat().st_size, "sha256": _digest(path)}
+        for path in _model_files(artifacts_path)
+    }
+    manifest = {"models": sorted(name[len("with_"):] for name in models), "files": files}
+    (artifacts_path / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+def verify_manifest(artifacts_path: Path) -> dict:
+    """Check the files of an artifacts directory against its manifest.
+
+    Returns:
+        dict: The manifest
+
+    Raises:
+        RuntimeError: If the manifest is missing, or lists no files, or a file is
+            missing or differs from the manifest
+    """
+    manifest_path = artifacts_path / MANIFEST_NAME
+    if not manifest_path.is_file():
+        raise RuntimeError(f"No {MANIFEST_NAME} in {artifacts_path}, run python -m app.warmup first")
+    manifest = json.loads(manifest_path.read_text())
+    if not manifest["files"]:
+        raise RuntimeError(f"No model files in {artifacts_path}")
+
+    problems = []
+    for name, expected in manifest["files"].items():
+        path = artifacts_path / name
+        if not path.is_file():
+            problems.append(f"{name} is missing")
+        elif path.stat().st_size != expected["size"] or _digest(path) != expected["sha256"]:
+            problems.append(f"{name} differs from the manifest")
+    if problems:
+        raise RuntimeError(f"Invalid artifacts in {artifacts_path}: " + "; ".join(problems))
+    return manifest
+
+def missing_models(models: Dict[str, bool], manifest: dict) -> List[str]:
+    """Return the needed model groups that a manifest does not list, except SYSTEM_MODELS."""
+    return sorted(
+        name for name in (key[len("with_"):] for key in models)
+        if name not in SYSTEM_MODELS and name not in manifest["models"]
+    )
+
+def _sample_pdf(path: Path) -> None:
+    # A one-page PDF with a text layer, written by hand so that no PDF library is needed
+    content = f"BT /F1 24 Tf 72 700 Td ({SAMPLE_TEXT}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(pdf)
+
+def _render_sample():
+    from PIL import Image, ImageDraw, ImageFont
+    img = Image.new("RGB", (800, 200), color="white")
+    ImageDraw.Draw(img).text((40, 60), SAMPLE_TEXT, fill="black", font=ImageFont.load_default(size=48))
+    return img
+
+def _sample_image(path: Path) -> None:
+    _render_sample().save(path, format="PNG")
+
+def _sample_scan(path: Path) -> None:
+    # A PDF page holding only a picture of the text, so that it needs OCR
+    _render_sample().save(path, format="PDF", resolution=100)
+
+def _sample_docx(path: Path) -> None:
+    from docx import Document
+    doc = Document()
+    doc.add_heading(SAMPLE_TEXT, 0)
+    doc.add_paragraph("Generated to load the conversion pipeline.")
+    doc.save(str(path))
+
+def _sample_pptx(path: Path) -> None:
+    from pptx import Presentation
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = SAMPLE_TEXT
+    slide.placeholders[1].text = "Generated to load the conversion pipeline."
+    prs.save(str(path))
+
+def write_samples(directory: Path) -> Dict[str, Path]:
+    """Write a tiny document of every supported format into a directory.
+
+    A scanned PDF without a text layer is included, so that the PDF pipeline
+    with OCR is loaded even when pages with a text layer skip OCR.
+
+    Returns:
+        Dict[str, Path]: Path of each document by docling input format name, and
+            by "scanned" for the scanned PDF (see SAMPLE_FORMATS)
+    """
+    samples = {
+        "pdf": directory / "warmup.pdf",
+        "scanned": directory / "warmup-scanned.pdf",
+        "image": directory / "warmup.png",
+        "docx": directory / "warmup.docx",
+        "pptx": directory / "warmup.pptx",
+        "html": directory / "warmup.html",
+    }
+    _sample_pdf(samples["pdf"])
+    _sample_scan(samples["scanned"])
+    _sample_image(samples["image"])
+    _sample_docx(samples["docx"])
+    _sample_pptx(samples["pptx"])
+    samples["html"].write_text(f"<html><body><h1>{SAMPLE_TEXT}</h1><p>Generated.</p></body></html>")
+    return samples
+
+def smoke_test(converters: Dict[str, "DocumentConverter"], samples: Dict[str, Path]) -> None:
+    """Convert every sample document with every converter.
+
+    Raises:
+        RuntimeError: If a conversion fails, or a document with a text layer
+            converts to markdown without its text (the OCR of the scanned
+            samples is not checked, since it may not recognize the text exactly)
+    """
+    from docling.datamodel.base_models import InputFormat
+
+    for profile, converter in converters.items():
+        for name, path in samples.items():
+            started = time.perf_counter()
+            try:
+                markdown = converter.convert_file(path, InputFormat(SAMPLE_FORMATS.get(name, name)))
+            except Exception as e:
+                raise RuntimeError(f"Converting the {name} sample with profile {profile} failed: {e}") from e
+            if name not in ("image", "scanned") and SAMPLE_TEXT not in markdown:
+                raise RuntimeError(f"The {name} sample converted with profile {profile} lost its text")
+            logger.info(f"Converted the {name} sample with profile {profile} in {time.perf_counter() - started:.2f}s")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--artifacts-path", type=Path, help="Directory of the models, defaults to ARTIFACTS_PATH")
+    parser.add_argument("--profiles", nargs="+", help="Profiles to prefetch, defaults to WARM_PROFILES and DEFAULT_PROFILE")
+    parser.add_argument("--verify-only", action="store_true", help="Check the models without downloading them")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    artifacts_path = args.artifacts_path or (Path(settings.artifacts_path) if settings.artifacts_path else None)
+    if artifacts_path is None:
+        parser.error("set ARTIFACTS_PATH or pass --artifacts-path")
+    # Read by the converters built below
+    settings.artifacts_path = str(artifacts_path.resolve())
+    profiles = args.profiles or list(dict.fromkeys([*settings.warm_profiles, settings.default_profile]))
+
+    from app.core.converter import DocumentConverter
+    converters = {profile: DocumentConverter(profile=profile) for profile in profiles}
+    models = required_models(
+        docling_converter
+        for converter in converters.values()
+        for docling_converter in (converter.converter, converter.text_converter)
+        if docling_converter is not None
+    )
+
+    try:
+        if not args.verify_only:
+            artifacts_path.mkdir(parents=True, exist_ok=True)
+            manifest = write_manifest(artifacts_path, download(artifacts_path, models))
+        else:
+            manifest = verify_manifest(artifacts_path)
+        missing = missing_models(models, manifest)
+        if missing:
+            raise RuntimeError(f"Models of {', '.join(missing)} were not prefetched into {artifacts_path}")
+        verify_manifest(artifacts_path)
+
+        with tempfile.TemporaryDirectory(prefix="doc-to-markdown-warmup-") as directory:
+            smoke_test(converters, write_samples(Path(directory)))
+    except RuntimeError as e:
+        logger.error(str(e))
+        return 1
+
+    logger.info(f"{len(manifest['files'])} model files in {artifacts_path} verified for profiles {', '.join(profiles)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""Measure conversion throughput and latency per document format.
+
+Generates a corpus (see benchmarks.corpus) and converts it either with
+DocumentConverter directly ("converter" mode, upload handling excluded) or
+through POST /api/v1/convert ("http" mode, in-process unless --url is given).
+Documents of each format are converted with the given concurrency after one
+unmeasured warm-up document, which loads the models. The result cache is
+bypassed: every generated document is unique and converter mode disables it.
+
+Reports docs/sec, pages/sec, p50/p95/p99 latency and peak RSS as JSON, along
+with the commit and settings, so runs on different commits can be compared:
+
+    python -m benchmarks.convert --output before.json
+    git checkout other-branch
+    python -m benchmarks.convert --compare before.json
+
+With --compare, the exit status is 1 if docs/sec dropped or p95 latency rose
+by more than --max-regression (10% by default) for any format.
+
+Usage (from the backend directory):
+    python -m benchmarks.convert [--mode converter|http] [--formats pdf,docx] [--documents 10]
+        [--concurrency 4] [--pdf-pages 5] [--profile full] [--url http://host:8000]
+        [--output results.json] [--compare baseline.json] [--max-regression 0.1]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from benchmarks.corpus import FORMATS, MIME_TYPES, build_corpus
+
+Corpus = List[Tuple[Path, int]]
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Return the q-th percentile (0-100) of the values, interpolating linearly."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+def summarize(latencies: List[float], pages: int, errors: int, seconds: float) -> dict:
+    """Summarize the conversions of one run."""
+    return {
+        "documents": len(latencies),
+        "errors": errors,
+        "pages": pages,
+        "seconds": round(seconds, 4),
+        "docs_per_sec": round(len(latencies) / seconds, 4) if seconds else None,
+        "pages_per_sec": round(pages / seconds, 4) if seconds and pages else None,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_p99": percentile(latencies, 99),
+    }
+
+def peak_rss() -> dict:
+    """Peak resident set size in bytes of this process and of its (process pool) children."""
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+async def run_concurrently(convert, corpus: Corpus, concurrency: int) -> dict:
+    """Convert the documents with at most `concurrency` conversions in flight.
+
+    Args:
+        convert: Coroutine function converting one document path
+        corpus (Corpus): Documents and their page counts
+        concurrency (int): Conversions in flight at once
+    """
+    latencies, pages, errors = [], 0, 0
+    remaining = iter(corpus)
+
+    async def worker():
+        nonlocal pages, errors
+        for path, page_count in remaining:
+            started = time.perf_counter()
+            try:
+                await convert(path)
+            except Exception as e:
+                print(f"{path.name}: {e}", file=sys.stderr)
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            pages += page_count
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, pages, errors, time.perf_counter() - started)
+
+def converter_runner(profile: Optional[str]):
+    """Return a coroutine function converting a document with a DocumentConverter."""
+    from app.config import settings
+    from app.core.converter import DocumentConverter
+
+    converter = DocumentConverter(profile=profile or settings.default_profile)
+    converter.cache = None
+
+    async def convert(path: Path) -> None:
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        mime_type = await converter.detect_file_type(path)
+        await converter.convert_saved(path, path.name, path.stat().st_size, mime_type, digest)
+
+    return convert
+
+def http_runner(client, profile: Optional[str]):
+    """Return a coroutine function uploading a document to POST /api/v1/convert."""
+    params = {"profile": profile} if profile else {}
+
+    async def convert(path: Path) -> None:
+        name = path.name
+        with path.open("rb") as f:
+            response = await client.post(
+                "/api/v1/convert",
+                params=params,
+                files={"file": (name, f, MIME_TYPES[name.split("-")[0]])},
+            )
+        response.raise_for_status()
+
+    return convert
+
+def http_client(url: Optional[str], api_key: Optional[str]):
+    """Create an HTTP client for a server at url, or for the application in-process."""
+    import httpx
+    from app.config import settings
+
+    headers = {"X-API-Key": api_key or settings.api_key or ""}
+    if url:
+        return httpx.AsyncClient(base_url=url, headers=headers, timeout=None)
+
+    from app.main import app
+    settings.rate_limit_per_minute = 10 ** 9  # Read when the middleware stack is built
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=None)
+
+async def run(args: argparse.Namespace, corpora: Dict[str, Corpus], warm_up: Dict[str, Corpus]) -> dict:
+    """Run the benchmark of every format and return the per-format and overall results."""
+    client = None
+    if args.mode == "http":
+        client = http_client(args.url, args.api_key)
+        convert = http_runner(client, args.profile)
+    else:
+        convert = converter_runner(args.profile)
+
+    results = {}
+    try:
+        for name, corpus in corpora.items():
+            await run_concurrently(convert, warm_up[name], 1)
+            results[name] = await run_concurrently(convert, corpus, args.concurrency)
+    finally:
+        if client is not None:
+            await client.aclose()
+
+    seconds = sum(result["seconds"] for result in results.values())
+    results["all"] = {
+        "documents": sum(result["documents"] for result in results.values()),
+        "errors": sum(result["errors"] for result in results.values()),
+        "pages": sum(result["pages"] for result in results.values()),
+        "seconds": round(seconds, 4),
+    }
+    results["all"]["docs_per_sec"] = round(results["all"]["documents"] / seconds, 4) if seconds else None
+    results["all"]["pages_per_sec"] = round(results["all"]["pages"] / seconds, 4) if seconds else None
+    return results
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(baseline: dict, current: dict, max_regression: float) -> List[str]:
+    """Compare two benchmark reports and print the per-format changes.
+
+    Returns:
+        List[str]: Descriptions of the regressions beyond max_regression (a fraction)
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for metric, higher_is_better in (("docs_per_sec", True), ("latency_p95", False)):
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            print(f"{name:8} {metric:14} {old:12.4f} -> {new:12.4f} ({change:+.1%})")
+            if (-change if higher_is_better else change) > max_regression:
+                regressions.append(f"{name} {metric} {change:+.1%}")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=["converter", "http"], default="converter")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Comma-separated formats to benchmark")
+    parser.add_argument("--documents", type=int, default=10, help="Documents per format")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--pdf-pages", type=int, default=5)
+    parser.add_argument("--profile", help="Conversion profile, defaults to the server's default profile")
+    parser.add_argument("--url", help="Base URL of a running server (http mode), in-process if omitted")
+    parser.add_argument("--api-key", help="API key for --url, defaults to Settings.api_key")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", type=Path, help="JSON report of a previous run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    formats = [name.strip() for name in args.formats.split(",") if name.strip()]
+    with tempfile.TemporaryDirectory(prefix="doc-to-markdown-bench-") as directory:
+        directory = Path(directory)
+        corpora = build_corpus(directory / "corpus", formats, args.documents, args.pdf_pages)
+        warm_up = build_corpus(directory / "warm-up", formats, 1, args.pdf_pages, first_index=args.documents)
+        results = asyncio.run(run(args, corpora, warm_up))
+
+    from app.config import settings
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "mode": args.mode,
+            "url": args.url,
+            "formats": formats,
+            "documents": args.documents,
+            "concurrency": args.concurrency,
+            "pdf_pages": args.pdf_pages,
+            "profile": args.profile or settings.default_profile,
+            "conversion_worker_mode": settings.conversion_worker_mode,
+            "conversion_workers": settings.conversion_workers,
+        },
+        "results": results,
+        # Only meaningful for the benchmarking process, not for a server at --url
+        "peak_rss_bytes": peak_rss(),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        regressions = compare(json.loads(args.compare.read_text()), report, args.max_regression)
+        if regressions:
+            print("Regressions: " + ", ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
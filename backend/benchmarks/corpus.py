@@ -0,0 +1,116 @@
+"""Generate benchmark documents the same way the test fixtures do (see tests/conftest.py).
+
+Every document embeds its index, so no two documents share a digest and the
+result cache never serves a benchmark document.
+"""
+from pathlib import Path
+from typing import Dict, List, Tuple
+from PIL import Image, ImageDraw
+from reportlab.pdfgen import canvas
+
+FORMATS = ("pdf", "image", "docx", "pptx", "html")
+
+# MIME types of the generated documents, as detected by the converter
+MIME_TYPES = {
+    "pdf": "application/pdf",
+    "image": "image/png",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "html": "text/html",
+}
+
+PARAGRAPH = (
+    "This paragraph was generated for benchmarking the conversion service. "
+    "It is long enough to wrap over several lines of a page."
+)
+
+def make_pdf(path: Path, index: int, pages: int) -> int:
+    c = canvas.Canvas(str(path))
+    for page in range(1, pages + 1):
+        c.setFont("Helvetica-Bold", 16)
+        c.drawString(72, 770, f"Benchmark document {index}, page {page}")
+        c.setFont("Helvetica", 11)
+        for line in range(40):
+            c.drawString(72, 740 - line * 16, f"{line + 1}. {PARAGRAPH[:80]}")
+        c.showPage()
+    c.save()
+    return pages
+
+def make_image(path: Path, index: int) -> int:
+    img = Image.new('RGB', (1200, 800), color='white')
+    d = ImageDraw.Draw(img)
+    d.text((50, 50), f"Benchmark document {index}", fill='black')
+    for line in range(20):
+        d.text((50, 100 + line * 30), f"{line + 1}. {PARAGRAPH[:80]}", fill='black')
+    img.save(path, format='PNG')
+    return 1
+
+def make_docx(path: Path, index: int, paragraphs: int = 50) -> int:
+    from docx import Document
+    doc = Document()
+    doc.add_heading(f"Benchmark document {index}", 0)
+    for paragraph in range(paragraphs):
+        doc.add_paragraph(f"{paragraph + 1}. {PARAGRAPH}")
+    doc.save(str(path))
+    return 0
+
+def make_pptx(path: Path, index: int, slides: int = 10) -> int:
+    from pptx import Presentation
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = f"Benchmark document {index}"
+    slide.placeholders[1].text = "Generated for benchmarking"
+    for number in range(1, slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {number + 1}"
+        slide.shapes.placeholders[1].text = PARAGRAPH
+    prs.save(str(path))
+    return slides
+
+def make_html(path: Path, index: int, paragraphs: int = 50) -> int:
+    items = "".join(f"<li>Item {item}</li>" for item in range(1, 11))
+    body = "".join(f"<p>{paragraph + 1}. {PARAGRAPH}</p>" for paragraph in range(paragraphs))
+    path.write_text(
+        f"<!DOCTYPE html><html><head><title>Benchmark document {index}</title></head><body>"
+        f"<h1>Benchmark document {index}</h1>{body}<ul>{items}</ul></body></html>"
+    )
+    return 0
+
+def build_corpus(
+    directory: Path, formats: List[str], documents: int, pdf_pages: int = 5, first_index: int = 0
+) -> Dict[str, List[Tuple[Path, int]]]:
+    """Generate documents of each format into a directory.
+
+    Args:
+        directory (Path): Directory to write the documents to (created if missing)
+        formats (List[str]): Formats to generate, out of FORMATS
+        documents (int): Number of documents per format
+        pdf_pages (int): Number of pages per PDF
+        first_index (int): Index of the first document, to generate documents
+            distinct from those of another corpus
+
+    Returns:
+        Dict[str, List[Tuple[Path, int]]]: Per format, the path of each document and
+            its number of pages (0 for formats without pages)
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    corpus = {}
+    for name in formats:
+        corpus[name] = []
+        for index in range(first_index, first_index + documents):
+            suffix = "png" if name == "image" else name
+            path = directory / f"{name}-{index}.{suffix}"
+            if name == "pdf":
+                pages = make_pdf(path, index, pdf_pages)
+            elif name == "image":
+                pages = make_image(path, index)
+            elif name == "docx":
+                pages = make_docx(path, index)
+            elif name == "pptx":
+                pages = make_pptx(path, index)
+            elif name == "html":
+                pages = make_html(path, index)
+            else:
+                raise ValueError(f"Unknown benchmark format: {name}")
+            corpus[name].append((path, pages))
+    return corpus
@@ -0,0 +1,134 @@
+"""Measure the memory of each gunicorn worker, with and without preloaded models.
+
+Starts the API under gunicorn (see app.gunicorn_conf) with the given number of
+workers, waits until it is ready, optionally converts a few generated
+documents, then reads /proc/<pid>/smaps_rollup of the master and every worker
+(Linux only). For each process it reports:
+
+- rss: resident memory, counting shared pages in full
+- pss: proportional share, shared pages divided among the processes sharing them
+- uss: private memory, what the process would free on exit
+- shared: resident pages shared with other processes (rss - uss)
+
+The sum of pss over the master and workers is the memory the server actually
+uses. With preloading, model weights are shared copy-on-write, so uss per worker
+stays far below the model size, and pss per worker shrinks as workers are added.
+
+Usage (from the backend directory):
+    API_KEY=secret python -m benchmarks.memory --workers 1 2 4 8 [--no-preload] [--documents 4]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+import httpx
+from benchmarks.corpus import MIME_TYPES, build_corpus
+
+def smaps_rollup(pid: int) -> Dict[str, int]:
+    """Return the rss, pss, uss and shared memory of a process in bytes."""
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        values[name] = int(value.split()[0]) * 1024
+    uss = values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+    return {"rss": values["Rss"], "pss": values["Pss"], "uss": uss, "shared": values["Rss"] - uss}
+
+def child_pids(pid: int) -> List[int]:
+    """Return the pids of the direct children of a process."""
+    children = []
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(stat.parent.name))
+    return sorted(children)
+
+def wait_ready(client: httpx.Client, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if client.get("/api/v1/ready").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(1)
+    raise TimeoutError(f"Server not ready after {timeout:g} seconds")
+
+def measure(workers: int, preload: bool, documents: int, port: int, timeout: float) -> dict:
+    """Start a server, convert some documents and measure the memory of its processes."""
+    env = dict(
+        os.environ,
+        SERVER_WORKERS=str(workers),
+        SERVER_PRELOAD=str(preload).lower(),
+        SERVER_PORT=str(port),
+        SERVER_HOST="127.0.0.1",
+        RATE_LIMIT_PER_MINUTE=str(10 ** 9),
+        CACHE_ENABLED="false",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "python:app.gunicorn_conf", "app.main:app"],
+        env=env,
+    )
+    headers = {"X-API-Key": os.environ.get("API_KEY", "")}
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", headers=headers, timeout=None) as client:
+            started = time.monotonic()
+            wait_ready(client, timeout)
+            ready_seconds = time.monotonic() - started
+
+            if documents:
+                with tempfile.TemporaryDirectory() as directory:
+                    corpus = build_corpus(Path(directory), ["pdf", "html"], documents)
+                    for name, items in corpus.items():
+                        for path, _ in items:
+                            with path.open("rb") as f:
+                                client.post(
+                                    "/api/v1/convert", files={"file": (path.name, f, MIME_TYPES[name])}
+                                ).raise_for_status()
+
+            master = smaps_rollup(server.pid)
+            worker_memory = [smaps_rollup(pid) for pid in child_pids(server.pid)]
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    total_pss = master["pss"] + sum(memory["pss"] for memory in worker_memory)
+    return {
+        "workers": workers,
+        "preload": preload,
+        "ready_seconds": round(ready_seconds, 2),
+        "master": master,
+        "worker_processes": worker_memory,
+        "total_pss": total_pss,
+        "pss_per_worker": total_pss // max(1, len(worker_memory)),
+        "mean_worker_uss": sum(memory["uss"] for memory in worker_memory) // max(1, len(worker_memory)),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--no-preload", dest="preload", action="store_false")
+    parser.add_argument("--documents", type=int, default=4, help="PDF and HTML documents converted before measuring")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds to wait for the server to be ready")
+    args = parser.parse_args()
+
+    results = [measure(workers, args.preload, args.documents, args.port, args.timeout) for workers in args.workers]
+    print(json.dumps(results, indent=2))
+    for result in results:
+        print(
+            f"{result['workers']:3} workers: total PSS {result['total_pss'] / 2**20:8.0f} MiB, "
+            f"per worker {result['pss_per_worker'] / 2**20:8.0f} MiB PSS, "
+            f"{result['mean_worker_uss'] / 2**20:8.0f} MiB private",
+            file=sys.stderr,
+        )
+
+if __name__ == "__main__":
+    main()
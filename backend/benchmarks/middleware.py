@@ -0,0 +1,85 @@
+"""Compare the request throughput of the security middleware before and after moving it to pure ASGI.
+
+"Before" reproduces the previous setup: rate limiting in a BaseHTTPMiddleware
+subclass and the API key checked by a route dependency. "After" uses the pure
+ASGI RateLimitMiddleware and APIKeyMiddleware. Both serve the same small
+endpoint in-process, so the numbers measure middleware overhead only.
+
+Usage (from the backend directory):
+    API_KEY=secret python -m benchmarks.middleware [--requests 5000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import time
+import httpx
+from fastapi import Depends, FastAPI, HTTPException, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.api.middleware.security import APIKeyMiddleware, RateLimitMiddleware, api_key_valid
+from app.config import settings
+from app.core.ratelimit import MemoryRateLimitBackend, RateLimiter
+
+UNLIMITED = 10 ** 9
+
+def build_before() -> FastAPI:
+    limiter = RateLimiter(MemoryRateLimitBackend(), UNLIMITED)
+
+    class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next):
+            allowed, _ = await limiter.hit(request.client.host)
+            if not allowed:
+                raise HTTPException(status_code=429, detail="Rate limit exceeded")
+            return await call_next(request)
+
+    async def verify_api_key(request: Request):
+        if not api_key_valid(request.headers.get("X-API-Key")):
+            raise HTTPException(status_code=401, detail="Invalid or missing API key")
+
+    app = FastAPI()
+
+    @app.get("/api/v1/ping", dependencies=[Depends(verify_api_key)])
+    async def ping():
+        return {"status": "ok"}
+
+    app.add_middleware(LegacyRateLimitMiddleware)
+    return app
+
+def build_after() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    app.add_middleware(APIKeyMiddleware, protected_prefixes=["/api/v1/"])
+    app.add_middleware(RateLimitMiddleware, limiter=RateLimiter(MemoryRateLimitBackend(), UNLIMITED))
+    return app
+
+async def measure(app: FastAPI, requests: int, concurrency: int) -> float:
+    """Send the requests with the given concurrency and return requests per second."""
+    transport = httpx.ASGITransport(app=app)
+    headers = {"X-API-Key": settings.api_key}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        remaining = iter(range(requests))
+
+        async def worker():
+            for _ in remaining:
+                response = await client.get("/api/v1/ping")
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - started)
+
+async def main(requests: int, concurrency: int) -> None:
+    for name, build in (("before (BaseHTTPMiddleware)", build_before), ("after (pure ASGI)", build_after)):
+        app = build()
+        await measure(app, min(requests, 200), concurrency)  # Warm up
+        rate = await measure(app, requests, concurrency)
+        print(f"{name:30} {rate:10.0f} requests/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,35 @@
+"""pytest-benchmark benchmarks of DocumentConverter, one per format.
+
+Not part of the test suite (see testpaths in pytest.ini). Run them with
+pytest-benchmark installed, from the backend directory:
+
+    pytest benchmarks --benchmark-autosave
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+
+Each round converts a fresh document (the result cache is disabled), after
+one warm-up round that loads the models.
+"""
+import asyncio
+import pytest
+from benchmarks.convert import converter_runner
+from benchmarks.corpus import FORMATS, build_corpus
+
+pytest.importorskip("pytest_benchmark")
+
+ROUNDS = 5
+
+@pytest.fixture(scope="module")
+def convert():
+    return converter_runner(None)
+
+@pytest.mark.parametrize("name", FORMATS)
+def test_convert(benchmark, convert, name, tmp_path):
+    corpus = build_corpus(tmp_path, [name], ROUNDS + 1)[name]
+    documents = iter(path for path, _ in corpus)
+
+    def setup():
+        return (next(documents),), {}
+
+    benchmark.pedantic(
+        lambda path: asyncio.run(convert(path)), setup=setup, rounds=ROUNDS, warmup_rounds=1
+    )
@@ -0,0 +1,43 @@
+import pytest
+from app.config import settings
+from app.core.registry import get_converter
+
+@pytest.fixture
+def client(test_client, converter):
+    """A test client authenticated with the API key and backed by the fake converter."""
+    test_client.app.dependency_overrides[get_converter] = lambda: converter
+    test_client.headers["X-API-Key"] = settings.api_key
+    yield test_client
+    test_client.app.dependency_overrides.pop(get_converter, None)
+
+def test_convert_batch(client, sample_pdf, sample_html):
+    """Test batch conversion endpoint with several files."""
+    with open(sample_pdf, "rb") as pdf, open(sample_html, "rb") as html:
+        files = [
+            ("files", ("test.pdf", pdf, "application/pdf")),
+            ("files", ("test.html", html, "text/html")),
+            ("files", ("test.xyz", b"test content", "application/x-xyz")),
+        ]
+        response = client.post("/api/v1/convert/batch", files=files)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["succeeded"] == 2
+    assert data["failed"] == 1
+    assert [r["filename"] for r in data["results"]] == ["test.pdf", "test.html", "test.xyz"]
+    assert data["results"][0]["metadata"]["mime_type"] == "application/pdf"
+    assert data["results"][2]["status_code"] == 415
+    assert "content" not in data["results"][2]
+
+def test_convert_batch_no_files(client):
+    """Test batch conversion endpoint without files."""
+    response = client.post("/api/v1/convert/batch")
+    assert response.status_code == 422
+
+def test_batch_unknown_profile(test_client, sample_html):
+    """Test batch conversion with an unknown profile."""
+    test_client.headers["X-API-Key"] = settings.api_key
+    with open(sample_html, "rb") as f:
+        files = {"file": ("test.html", f, "text/html")}
+        response = test_client.post("/api/v1/convert/batch?profile=turbo", files=[("files", files["file"])])
+    assert response.status_code == 422
@@ -18,7 +18,9 @@ def test_health_check(test_client):
     """Test the health check endpoint."""
     response = test_client.get("/api/health")
     assert response.status_code == 200
-    assert response.json() == {"status": "healthy"}
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["converter"]["state"] in ("warm", "cold")
 
 def test_convert_pdf(test_client, sample_pdf):
     """Test PDF conversion endpoint."""
@@ -50,18 +52,22 @@ def test_convert_image(test_client, sample_image, monkeypatch):
         },
     )
     
-    # Patch the converter in the app
+    # Patch the shared converter in the app
     from app.core.converter import DocumentConverter
+    from app.core.registry import get_converter
     def get_patched_converter():
         conv = DocumentConverter()
         conv.converter = converter
         return conv
-    monkeypatch.setattr("app.api.routes.convert.DocumentConverter", get_patched_converter)
+    test_client.app.dependency_overrides[get_converter] = get_patched_converter
     
     # Test the endpoint
-    with open(sample_image, "rb") as f:
-        files = {"file": ("test.png", f, "image/png")}
-        response = test_client.post("/api/v1/convert", files=files)
+    try:
+        with open(sample_image, "rb") as f:
+            files = {"file": ("test.png", f, "image/png")}
+            response = test_client.post("/api/v1/convert", files=files)
+    finally:
+        test_client.app.dependency_overrides.pop(get_converter, None)
     
     assert response.status_code == 200
     data = response.json()
@@ -140,3 +146,12 @@ def test_convert_unsupported_type(test_client):
     files = {"file": ("test.xyz", b"test content", "application/x-xyz")}
     response = test_client.post("/api/v1/convert", files=files)
     assert response.status_code == 415  # Unsupported Media Type
+
+def test_convert_unknown_profile(test_client, sample_html):
+    """Test conversion with an unknown profile."""
+    from app.config import settings
+    test_client.headers["X-API-Key"] = settings.api_key
+    with open(sample_html, "rb") as f:
+        files = {"file": ("test.html", f, "text/html")}
+        response = test_client.post("/api/v1/convert?profile=turbo", files=files)
+    assert response.status_code == 422
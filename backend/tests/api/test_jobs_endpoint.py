@@ -0,0 +1,68 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.core.jobs import JobManager, MemoryJobStore
+from app.core.registry import get_converter
+from app.main import app
+
+@pytest.fixture
+def client(monkeypatch, tmp_path, converter):
+    """A started test client with an in-memory job manager and the fake converter."""
+    monkeypatch.setattr(settings, "warm_up_on_startup", False)
+    manager = JobManager(MemoryJobStore(), tmp_path / "jobs", workers=1, queue_size=10, ttl=60)
+    monkeypatch.setattr("app.main.job_manager", manager)
+    monkeypatch.setattr("app.api.routes.jobs.job_manager", manager)
+
+    app.dependency_overrides[get_converter] = lambda: converter
+    with TestClient(app, headers={"X-API-Key": settings.api_key}) as client:
+        yield client
+    app.dependency_overrides.pop(get_converter, None)
+
+def wait_for_job(client, job_id):
+    for _ in range(200):
+        data = client.get(f"/api/v1/jobs/{job_id}").json()
+        if data["status"] in ("succeeded", "failed"):
+            return data
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+def test_job_submit_poll_fetch(client, sample_html):
+    """Test the submit, poll and fetch flow of the job API."""
+    with open(sample_html, "rb") as f:
+        response = client.post("/api/v1/jobs", files={"file": ("test.html", f, "text/html")})
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] in ("queued", "running", "succeeded")
+    assert response.headers["Location"].endswith(f"/api/v1/jobs/{job['id']}")
+
+    job = wait_for_job(client, job["id"])
+    assert job["status"] == "succeeded"
+    assert "expires_at" in job
+
+    response = client.get(f"/api/v1/jobs/{job['id']}/result")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["metadata"]["original_file"] == "test.html"
+    assert data["metadata"]["mime_type"] == "text/html"
+
+def test_job_unsupported_type(client):
+    """Test job submission with an unsupported file type."""
+    files = {"file": ("test.xyz", b"test content", "application/x-xyz")}
+    response = client.post("/api/v1/jobs", files=files)
+    assert response.status_code == 415
+
+def test_job_failed_result(client, sample_html):
+    """Test fetching the result of a failed job."""
+    files = {"file": ("test.html", sample_html.read_bytes() + b"BROKEN", "text/html")}
+    job = client.post("/api/v1/jobs", files=files).json()
+    assert wait_for_job(client, job["id"])["status"] == "failed"
+
+    response = client.get(f"/api/v1/jobs/{job['id']}/result")
+    assert response.status_code == 500
+
+def test_unknown_job(client):
+    """Test polling a job that does not exist."""
+    assert client.get("/api/v1/jobs/unknown").status_code == 404
+    assert client.get("/api/v1/jobs/unknown/result").status_code == 404
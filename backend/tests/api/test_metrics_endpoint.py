@@ -0,0 +1,26 @@
+from prometheus_client import REGISTRY
+from app.config import settings
+
+def test_metrics_endpoint(test_client):
+    """Metrics are served in the Prometheus text format without an API key."""
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for name in (
+        "doc_to_markdown_stage_seconds",
+        "doc_to_markdown_conversion_seconds",
+        "doc_to_markdown_export_seconds",
+        "doc_to_markdown_request_seconds",
+        "doc_to_markdown_queue_depth",
+    ):
+        assert name in response.text
+
+def test_rejections_counted_by_status(test_client):
+    def count(status):
+        return REGISTRY.get_sample_value("doc_to_markdown_responses_total", {"status": status}) or 0
+
+    before = count("415")
+    files = {"file": ("test.xyz", b"test content", "application/x-xyz")}
+    response = test_client.post("/api/v1/convert", files=files, headers={"X-API-Key": settings.api_key})
+    assert response.status_code == 415
+    assert count("415") == before + 1
@@ -0,0 +1,55 @@
+import pytest
+from fastapi import FastAPI, Request, UploadFile
+from fastapi.testclient import TestClient
+from app.api.middleware.size import RequestSizeMiddleware
+
+@pytest.fixture
+def client():
+    """A small app accepting 1KB bodies, or 4KB on /batch."""
+    app = FastAPI()
+    received = []
+
+    @app.post("/upload")
+    async def upload(file: UploadFile):
+        received.append(await file.read())
+        return {"size": len(received[-1])}
+
+    @app.post("/raw")
+    async def raw(request: Request):
+        received.append(await request.body())
+        return {"size": len(received[-1])}
+
+    @app.post("/batch")
+    async def batch(file: UploadFile):
+        return {"size": len(await file.read())}
+
+    app.add_middleware(RequestSizeMiddleware, max_size=1024, route_limits={"/batch": 4096})
+    client = TestClient(app)
+    client.received = received
+    return client
+
+def test_small_upload_accepted(client):
+    response = client.post("/upload", files={"file": ("a.txt", b"a" * 100)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+def test_content_length_over_limit_rejected(client):
+    """Uploads with a Content-Length over the limit never reach the route."""
+    response = client.post("/upload", files={"file": ("a.txt", b"a" * 2048)})
+    assert response.status_code == 413
+    assert "Request body exceeds maximum size" in response.json()["detail"]
+    assert client.received == []
+
+def test_chunked_body_over_limit_rejected(client):
+    """Bodies without a Content-Length are counted while they are received."""
+    def chunks():
+        for _ in range(4):
+            yield b"a" * 512
+
+    response = client.post("/raw", content=chunks())
+    assert response.status_code == 413
+    assert client.received == []
+
+def test_route_limit(client):
+    response = client.post("/batch", files={"file": ("a.txt", b"a" * 2048)})
+    assert response.status_code == 200
@@ -0,0 +1,73 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.api.middleware.security import APIKeyMiddleware, RateLimitMiddleware
+from app.config import settings
+from app.core.ratelimit import MemoryRateLimitBackend, RateLimiter
+
+@pytest.fixture
+def client():
+    """A small app behind the security middleware, allowing 3 requests per minute."""
+    app = FastAPI()
+    received = []
+
+    @app.post("/api/v1/echo")
+    async def echo(payload: dict):
+        received.append(payload)
+        return payload
+
+    @app.get("/api/v1/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/api/v1/stream")
+    async def stream():
+        return StreamingResponse(iter(["a", "b", "c"]), media_type="text/plain")
+
+    app.add_middleware(APIKeyMiddleware, protected_prefixes=["/api/v1/"], public_paths=["/api/v1/health"])
+    app.add_middleware(RateLimitMiddleware, limiter=RateLimiter(MemoryRateLimitBackend(), limit=3))
+    client = TestClient(app)
+    client.received = received
+    return client
+
+def test_missing_api_key_rejected_before_body_is_read(client):
+    response = client.post("/api/v1/echo", json={"a": 1})
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Invalid or missing API key"}
+    assert client.received == []
+
+def test_valid_api_key(client):
+    response = client.post("/api/v1/echo", json={"a": 1}, headers={"X-API-Key": settings.api_key})
+    assert response.status_code == 200
+    assert response.json() == {"a": 1}
+
+def test_public_path(client):
+    assert client.get("/api/v1/health").status_code == 200
+
+def test_rate_limit_returns_429(client):
+    """Requests over the limit get a 429 response with Retry-After instead of an error."""
+    statuses = [client.get("/api/v1/health").status_code for _ in range(4)]
+    assert statuses == [200, 200, 200, 429]
+
+    response = client.get("/api/v1/health")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+def test_streaming_response_passes_through(client):
+    response = client.get("/api/v1/stream", headers={"X-API-Key": settings.api_key})
+    assert response.status_code == 200
+    assert response.text == "abc"
+
+def test_rate_limit_key_ignores_invalid_api_keys(monkeypatch):
+    """Only a valid API key is used as the rate limit key, other requests count per IP."""
+    from fastapi import Request
+    from app.api.middleware.security import rate_limit_key
+    monkeypatch.setattr(settings, "rate_limit_by", "api_key")
+
+    def key(api_key=None):
+        headers = [(b"x-api-key", api_key.encode())] if api_key else []
+        return rate_limit_key(Request({"type": "http", "headers": headers, "client": ("10.0.0.1", 1234)}))
+
+    assert key(settings.api_key).startswith("key:")
+    assert key("made-up") == key() == "ip:10.0.0.1"
@@ -0,0 +1,65 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import app.main
+from app.config import settings
+from app.core.registry import ConverterRegistry
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Seconds importing the application may take; docling alone takes several
+IMPORT_BUDGET_SECONDS = 3.0
+
+def test_import_is_fast_and_skips_heavy_modules():
+    """Importing the application loads neither docling nor libmagic."""
+    script = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        "import app.main\n"
+        "print(time.perf_counter() - started)\n"
+        "print(' '.join(sorted({name.split('.')[0] for name in sys.modules} & {'docling', 'docling_core', 'magic'})))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+
+    assert output[1:] in ([], [""])
+    assert float(output[0]) < IMPORT_BUDGET_SECONDS
+
+@pytest.fixture
+def registry(monkeypatch, fake_converter):
+    registry = ConverterRegistry(factory=fake_converter)
+    monkeypatch.setattr(app.main, "converter_registry", registry)
+    monkeypatch.setattr(settings, "warm_up_on_startup", True)
+    monkeypatch.setattr(settings, "warm_profiles", ["fast"])
+    return registry
+
+def test_ready_after_warm_up(test_client, registry):
+    """Liveness answers right away; readiness waits for the models."""
+    assert test_client.get("/api/v1/health").status_code == 200
+
+    response = test_client.get("/api/v1/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    registry.warm_up()
+    response = test_client.get("/api/v1/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+def test_ready_without_warm_up(test_client, registry, monkeypatch):
+    monkeypatch.setattr(settings, "warm_up_on_startup", False)
+    assert test_client.get("/api/v1/ready").status_code == 200
+
+def test_ready_in_process_mode_follows_worker_processes(test_client, registry, monkeypatch):
+    """In process mode, readiness reflects the worker processes, not the server process."""
+    from types import SimpleNamespace
+    pool = SimpleNamespace(ready=False)
+    monkeypatch.setattr(app.main, "conversion_pool", pool)
+    monkeypatch.setattr(settings, "conversion_worker_mode", "process")
+
+    assert test_client.get("/api/v1/ready").status_code == 503
+    pool.ready = True
+    assert test_client.get("/api/v1/ready").status_code == 200
+    assert registry.status()["profiles"] == {}  # The server process loaded no models
@@ -0,0 +1,59 @@
+import pytest
+from app.config import settings
+from app.core.registry import get_converter
+
+pytestmark = pytest.mark.converter(cache=None)
+
+@pytest.fixture
+def client(test_client, converter):
+    """A test client authenticated with the API key and backed by the fake converter."""
+    test_client.app.dependency_overrides[get_converter] = lambda: converter
+    test_client.headers["X-API-Key"] = settings.api_key
+    yield test_client
+    test_client.app.dependency_overrides.pop(get_converter, None)
+
+def test_convert_stream_markdown(client, multipage_pdf):
+    """Test streaming conversion as chunked markdown."""
+    with open(multipage_pdf, "rb") as f:
+        files = {"file": ("test.pdf", f, "application/pdf")}
+        response = client.post("/api/v1/convert?stream=true", files=files)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/markdown")
+    assert response.headers["x-document-mime-type"] == "application/pdf"
+    assert "pages 1-1" in response.text
+    assert "pages 3-3" in response.text
+
+def test_convert_stream_sse(client, multipage_pdf):
+    """Test streaming conversion as Server-Sent Events."""
+    with open(multipage_pdf, "rb") as f:
+        files = {"file": ("test.pdf", f, "application/pdf")}
+        response = client.post("/api/v1/convert", files=files, headers={"Accept": "text/event-stream"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [line for line in response.text.split("\n") if line.startswith("event: ")]
+    assert events == ["event: metadata"] + ["event: markdown"] * 3 + ["event: done"]
+    assert '"mime_type": "application/pdf"' in response.text
+
+def test_convert_stream_unsupported_type(client):
+    """Upload validation errors are regular error responses when streaming."""
+    files = {"file": ("test.xyz", b"test content", "application/x-xyz")}
+    response = client.post("/api/v1/convert?stream=true", files=files)
+    assert response.status_code == 415
+
+def test_convert_stream_page_range(client, multipage_pdf):
+    """Only the requested pages are streamed."""
+    with open(multipage_pdf, "rb") as f:
+        files = {"file": ("test.pdf", f, "application/pdf")}
+        response = client.post("/api/v1/convert?stream=true&pages=2-3", files=files)
+
+    assert response.status_code == 200
+    assert "pages 1-1" not in response.text
+    assert "pages 2-2" in response.text
+
+def test_convert_invalid_page_range(client, multipage_pdf):
+    with open(multipage_pdf, "rb") as f:
+        files = {"file": ("test.pdf", f, "application/pdf")}
+        response = client.post("/api/v1/convert?pages=3-1", files=files)
+    assert response.status_code == 400
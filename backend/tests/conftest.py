@@ -6,7 +6,12 @@ from fastapi.testclient import TestClient
 from PIL import Image, ImageDraw, ImageFont
 from reportlab.pdfgen import canvas
 from io import BytesIO
+from types import SimpleNamespace
 from docx import Document
+from docling.datamodel.base_models import ConversionStatus, DocumentStream, InputFormat
+from app.core.cache import ResultCache
+from app.core.converter import DocumentConverter
+from app.core.workers import ConversionPool
 from app.main import app
 
 # Set up logging
@@ -18,6 +23,103 @@ def test_client():
     """Create a test client for the FastAPI app."""
     return TestClient(app)
 
+class FakeDoclingConverter:
+    """Stands in for docling's DocumentConverter without loading any models.
+    
+    Every converted document becomes "# Converted <file name>", followed by
+    " pages <first>-<last>" when a page range is given. Files containing
+    the bytes "BROKEN" fail to convert. Sources are paths or DocumentStreams.
+    The pipelines of the formats in `failing` fail to initialize. Calls and
+    initialized pipelines are recorded for assertions.
+    """
+    def __init__(self, allowed_formats=(), failing=()):
+        self.allowed_formats = list(allowed_formats)
+        self.format_to_options = {}
+        self.calls = []
+        self.initialized = []
+        self._failing = failing
+
+    def initialize_pipeline(self, format):
+        if format in self._failing:
+            raise RuntimeError("models unavailable")
+        self.initialized.append(format)
+
+    def _result(self, source, page_range=None):
+        if isinstance(source, DocumentStream):
+            path, content = Path(source.name), source.stream.getvalue()
+        else:
+            path = Path(source)
+            content = path.read_bytes()
+        if b"BROKEN" in content:
+            error = SimpleNamespace(error_message="Broken document")
+            return SimpleNamespace(input=SimpleNamespace(file=path), status=ConversionStatus.FAILURE, errors=[error])
+        markdown = f"# Converted {path.name}"
+        if page_range is not None:
+            markdown += f" pages {page_range[0]}-{page_range[1]}"
+        document = SimpleNamespace(export_to_markdown=lambda: markdown)
+        return SimpleNamespace(input=SimpleNamespace(file=path), status=ConversionStatus.SUCCESS, errors=[], document=document)
+
+    def convert(self, source, page_range=None, **kwargs):
+        self.calls.append([source])
+        return self._result(source, page_range)
+
+    def convert_all(self, source, raises_on_error=True, **kwargs):
+        sources = list(source)
+        self.calls.append(sources)
+        for item in sources:
+            yield self._result(item)
+
+class FakeConverter:
+    """Stands in for DocumentConverter as the factory of a ConverterRegistry.
+
+    Its FakeDoclingConverter allows PDF and HTML. The profiles built are
+    recorded in `builds`.
+    """
+    builds = []
+
+    def __init__(self, profile, failing=()):
+        FakeConverter.builds.append(profile)
+        self.profile = profile
+        self.converter = FakeDoclingConverter([InputFormat.PDF, InputFormat.HTML], failing)
+
+    def initialize_pipeline(self, input_format):
+        self.converter.initialize_pipeline(input_format)
+
+@pytest.fixture
+def fake_docling_converter():
+    """A FakeDoclingConverter instance."""
+    return FakeDoclingConverter()
+
+@pytest.fixture
+def fake_converter():
+    """The FakeConverter class, with no builds recorded yet."""
+    FakeConverter.builds = []
+    return FakeConverter
+
+@pytest.fixture
+def converter(request, fake_docling_converter):
+    """A DocumentConverter running fake_docling_converter, with a result cache of its own.
+
+    Options are passed with the converter marker, on a test or a whole module
+    (pytestmark):
+    - cache: the result cache, None to convert without one
+    - pool_size: number of workers of a ConversionPool of its own, instead of
+      the process-wide pool
+
+    Example: @pytest.mark.converter(cache=None, pool_size=2)
+    """
+    marker = request.node.get_closest_marker("converter")
+    options = marker.kwargs if marker else {}
+    pool = None
+    if options.get("pool_size"):
+        pool = ConversionPool(size=options["pool_size"], max_queue=options["pool_size"], timeout=5)
+    converter = DocumentConverter(pool=pool)
+    converter.cache = options.get("cache", ResultCache(max_bytes=1024 * 1024))
+    converter.converter = fake_docling_converter
+    yield converter
+    if pool is not None:
+        pool.shutdown()
+
 @pytest.fixture
 def fixtures_dir():
     """Get the path to the test fixtures directory."""
@@ -43,6 +145,38 @@ def sample_pdf(fixtures_dir):
     
     return pdf_path
 
+@pytest.fixture
+def multipage_pdf(tmp_path):
+    """Create a PDF with three pages of text."""
+    pdf_path = tmp_path / "multipage.pdf"
+    c = canvas.Canvas(str(pdf_path))
+    for page in range(1, 4):
+        c.setFont("Helvetica", 12)
+        c.drawString(100, 750, f"Page {page} of the test document")
+        c.showPage()
+    c.save()
+    return pdf_path
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    """Create a PDF whose first page has a text layer and whose next two pages are scans."""
+    scan = Image.new('RGB', (600, 800), color='white')
+    ImageDraw.Draw(scan).text((50, 50), "Scanned page", fill='black')
+    scan_path = tmp_path / "scan.png"
+    scan.save(scan_path, format='PNG')
+
+    pdf_path = tmp_path / "mixed.pdf"
+    c = canvas.Canvas(str(pdf_path))
+    width, height = c._pagesize
+    c.setFont("Helvetica", 12)
+    c.drawString(100, 750, "This page was born digital and has a text layer of its own.")
+    c.showPage()
+    for _ in range(2):
+        c.drawImage(str(scan_path), 0, 0, width=width, height=height)
+        c.showPage()
+    c.save()
+    return pdf_path
+
 @pytest.fixture
 def sample_image(fixtures_dir):
     """Create a sample PNG image for testing."""
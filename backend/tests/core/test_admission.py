@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from app.core.admission import AdmissionController, estimate_cost
+from app.core.workers import ConversionPool
+
+@pytest.fixture
+def pool():
+    pool = ConversionPool(size=2, max_queue=4, timeout=5)
+    yield pool
+    pool.shutdown()
+
+def test_estimate_cost(monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "admission_page_cost", 0.5)
+    monkeypatch.setattr(settings, "admission_ocr_page_cost", 3.0)
+    monkeypatch.setattr(settings, "admission_mb_cost", 2.0)
+
+    assert estimate_cost("pdf", 10_000, page_count=300, ocr=True) == 900.0
+    assert estimate_cost("pdf", 10_000, page_count=300) == 150.0
+    assert estimate_cost("image", 10_000) == 3.0
+    assert estimate_cost("html", 1024 * 1024) == 2.5
+
+async def test_light_documents_skip_heavy_queue(pool):
+    """Heavy jobs leave a worker free, so a light job runs while heavy ones wait."""
+    admission = AdmissionController(pool, light_workers=1, heavy_cost=10)
+    release = threading.Event()
+
+    async def heavy_document():
+        async with admission.admit(100) as heavy:
+            assert heavy
+            return await admission.run(heavy, release.wait, 5)
+
+    heavy_jobs = [asyncio.create_task(heavy_document()) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    assert pool.pending == 1  # The second heavy job waits for the heavy worker
+
+    async with admission.admit(1) as heavy:
+        assert not heavy
+        assert await asyncio.wait_for(admission.run(heavy, threading.get_ident), 1)
+
+    release.set()
+    assert await asyncio.gather(*heavy_jobs) == [True, True]
+    assert admission.heavy_backlog == 0
+
+async def test_heavy_documents_shed_over_backlog(pool):
+    """Heavy documents beyond the backlog are rejected with 503 and Retry-After."""
+    admission = AdmissionController(pool, light_workers=1, heavy_cost=10, max_heavy_backlog=150, retry_after=5)
+
+    async with admission.admit(100):
+        with pytest.raises(HTTPException) as exc_info:
+            async with admission.admit(100):
+                pass
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "50"}
+
+        # Light documents are never shed
+        async with admission.admit(5) as heavy:
+            assert not heavy
+
+    # A single heavy document is admitted whatever its cost
+    async with admission.admit(1000) as heavy:
+        assert heavy
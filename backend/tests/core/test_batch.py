@@ -0,0 +1,155 @@
+import zipfile
+import pytest
+from io import BytesIO
+from fastapi import HTTPException, UploadFile
+from app.core.admission import AdmissionController
+
+# One worker, so that every batch is converted in a single docling call
+pytestmark = pytest.mark.converter(pool_size=1)
+
+def upload(filename, content):
+    return UploadFile(filename=filename, file=BytesIO(content))
+
+def make_zip(members):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+@pytest.mark.asyncio
+async def test_batch_converts_in_one_docling_call(converter, fake_docling_converter, sample_pdf, sample_html, tmp_path):
+    """All documents of a batch go through a single convert_all call."""
+    results = await converter.convert_batch(
+        [upload("a.pdf", sample_pdf.read_bytes()), upload("b.html", sample_html.read_bytes())],
+        tmp_path,
+    )
+
+    assert len(fake_docling_converter.calls) == 1
+    assert len(fake_docling_converter.calls[0]) == 2
+    assert [r["filename"] for r in results] == ["a.pdf", "b.html"]
+    assert [r["status_code"] for r in results] == [200, 200]
+    assert results[0]["metadata"]["mime_type"] == "application/pdf"
+    assert results[1]["metadata"]["mime_type"] == "text/html"
+    assert results[0]["content"].startswith("# Converted")
+
+@pytest.mark.asyncio
+@pytest.mark.converter(pool_size=2)
+async def test_batch_spread_over_workers(converter, fake_docling_converter, sample_html, tmp_path):
+    """A batch is split into one docling call per worker, and its results keep the upload order."""
+    content = sample_html.read_bytes()
+    results = await converter.convert_batch(
+        [upload(f"{name}.html", content + name.encode()) for name in "abc"], tmp_path
+    )
+
+    assert sorted(len(call) for call in fake_docling_converter.calls) == [1, 2]
+    assert [r["filename"] for r in results] == ["a.html", "b.html", "c.html"]
+    assert [r["status_code"] for r in results] == [200, 200, 200]
+
+@pytest.mark.asyncio
+async def test_batch_reports_errors_per_document(converter, sample_html, tmp_path):
+    """Unsupported documents are reported individually without failing the batch."""
+    results = await converter.convert_batch(
+        [upload("a.html", sample_html.read_bytes()), upload("b.xyz", b"invalid file content")],
+        tmp_path,
+    )
+
+    assert results[0]["status_code"] == 200
+    assert results[1]["status_code"] == 415
+    assert "Unsupported file type" in results[1]["error"]
+
+@pytest.mark.asyncio
+async def test_batch_expands_zip_archives(converter, fake_docling_converter, sample_pdf, sample_docx, tmp_path):
+    """Members of a ZIP archive are converted as separate documents."""
+    archive = make_zip({
+        "docs/report.pdf": sample_pdf.read_bytes(),
+        "docs/letter.docx": sample_docx.read_bytes(),
+        "docs/notes.txt": b"plain text",
+    })
+    results = await converter.convert_batch([upload("archive.zip", archive)], tmp_path)
+
+    assert [r["filename"] for r in results] == [
+        "archive.zip/docs/report.pdf",
+        "archive.zip/docs/letter.docx",
+        "archive.zip/docs/notes.txt",
+    ]
+    assert [r["status_code"] for r in results] == [200, 200, 415]
+    assert len(fake_docling_converter.calls[0]) == 2
+
+@pytest.mark.asyncio
+async def test_batch_conversion_failure(converter, sample_html, tmp_path):
+    """A document docling fails to convert is reported with a 500 status."""
+    archive = make_zip({"broken.html": sample_html.read_bytes() + b"BROKEN", "ok.html": sample_html.read_bytes()})
+    results = await converter.convert_batch([upload("archive.zip", archive)], tmp_path)
+
+    assert [r["status_code"] for r in results] == [500, 200]
+    assert "Broken document" in results[0]["error"]
+
+@pytest.mark.asyncio
+async def test_batch_uses_cache(converter, fake_docling_converter, sample_html, tmp_path):
+    """Documents converted before are served from the cache."""
+    content = sample_html.read_bytes()
+    await converter.convert_batch([upload("a.html", content)], tmp_path)
+    results = await converter.convert_batch([upload("b.html", content)], tmp_path)
+
+    assert len(fake_docling_converter.calls) == 1
+    assert results[0]["metadata"]["cache_hit"] is True
+
+@pytest.mark.asyncio
+async def test_batch_invalid_zip(converter, tmp_path):
+    """A corrupt archive is reported as an unsupported document."""
+    content = b"PK\x03\x04" + b"\x00" * 64
+    results = await converter.convert_batch([upload("archive.zip", content)], tmp_path)
+    assert results[0]["status_code"] == 415
+
+@pytest.mark.asyncio
+async def test_batch_too_many_files(converter, sample_html, tmp_path, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "batch_max_files", 1)
+    content = sample_html.read_bytes()
+    with pytest.raises(HTTPException) as exc_info:
+        await converter.convert_batch([upload("a.html", content), upload("b.html", content)], tmp_path)
+    assert exc_info.value.status_code == 413
+
+@pytest.mark.asyncio
+async def test_batch_archive_counted_before_extraction(converter, sample_html, tmp_path, monkeypatch):
+    """An archive with more members than the batch has room for is rejected without extracting any."""
+    from app.config import settings
+    monkeypatch.setattr(settings, "batch_max_files", 2)
+    archive = make_zip({f"doc-{index}.html": sample_html.read_bytes() for index in range(2)})
+    with pytest.raises(HTTPException) as exc_info:
+        await converter.convert_batch(
+            [upload("a.html", sample_html.read_bytes()), upload("archive.zip", archive)], tmp_path
+        )
+    assert exc_info.value.status_code == 413
+    assert not any(path.name.startswith("upload-1-") for path in tmp_path.iterdir())
+
+@pytest.mark.asyncio
+async def test_batch_images_normalized_before_conversion(
+    converter, fake_docling_converter, sample_image, sample_html, tmp_path, monkeypatch
+):
+    """Images reach docling as normalized in-memory PNGs and keep their result."""
+    from docling.datamodel.base_models import DocumentStream
+    from app.config import settings
+    monkeypatch.setattr(settings, "image_preprocess_enabled", True)
+    monkeypatch.setattr(settings, "image_grayscale", True)
+    results = await converter.convert_batch(
+        [upload("a.png", sample_image.read_bytes()), upload("b.html", sample_html.read_bytes())],
+        tmp_path,
+    )
+
+    image, html = fake_docling_converter.calls[0]
+    assert isinstance(image, DocumentStream)
+    assert image.stream.getvalue().startswith(b"\x89PNG")
+    assert isinstance(html, str)
+    assert [r["status_code"] for r in results] == [200, 200]
+
+@pytest.mark.asyncio
+async def test_batch_goes_through_admission(converter, fake_docling_converter, multipage_pdf, tmp_path):
+    """A heavy batch is shed with 503 while the heavy backlog is full."""
+    converter.admission = AdmissionController(converter.pool, heavy_cost=0.1, max_heavy_backlog=1)
+    async with converter.admission.admit(100):
+        with pytest.raises(HTTPException) as exc_info:
+            await converter.convert_batch([upload("a.pdf", multipage_pdf.read_bytes())], tmp_path)
+    assert exc_info.value.status_code == 503
+    assert fake_docling_converter.calls == []
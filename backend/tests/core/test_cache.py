@@ -0,0 +1,64 @@
+import pytest
+from io import BytesIO
+from fastapi import UploadFile
+from app.core.cache import ResultCache
+from app.core.converter import DocumentConverter
+
+def test_memory_lru_eviction():
+    """Least recently used entries are evicted once max_bytes is exceeded."""
+    cache = ResultCache(max_bytes=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    assert cache.get("a") == "aaaa"  # "a" is now most recently used
+    cache.put("c", "cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa"
+    assert cache.get("c") == "cccc"
+
+def test_oversized_entry_not_cached():
+    cache = ResultCache(max_bytes=3)
+    cache.put("a", "aaaa")
+    assert cache.get("a") is None
+
+def test_disk_store(tmp_path):
+    """Entries survive in the on-disk store after memory is cleared."""
+    cache = ResultCache(max_bytes=100, disk_dir=tmp_path, disk_max_bytes=100)
+    cache.put("abcdef", "# Markdown")
+    cache.clear()
+    assert cache.get("abcdef") == "# Markdown"
+    assert (tmp_path / "ab" / "abcdef.md").exists()
+
+def test_disk_eviction(tmp_path):
+    """The on-disk store is trimmed once disk_max_bytes is exceeded."""
+    cache = ResultCache(max_bytes=0, disk_dir=tmp_path, disk_max_bytes=10)
+    cache.put("k1", "x" * 6)
+    cache.put("k2", "y" * 6)
+    assert cache.get("k1") is None
+    assert cache.get("k2") == "y" * 6
+
+def test_make_key_depends_on_options():
+    assert ResultCache.make_key("digest", "fast") != ResultCache.make_key("digest", "full")
+    assert ResultCache.make_key("digest", "fast") == ResultCache.make_key("digest", "fast")
+
+@pytest.mark.asyncio
+async def test_convert_serves_repeated_documents_from_cache(converter, sample_html, tmp_path, fake_docling_converter):
+    """Converting the same bytes twice runs docling once and reports the cache hit."""
+    content = sample_html.read_bytes()
+
+    first = await converter.convert(UploadFile(filename="a.html", file=BytesIO(content)), tmp_path / "a")
+    second = await converter.convert(UploadFile(filename="b.html", file=BytesIO(content)), tmp_path / "b")
+
+    assert len(fake_docling_converter.calls) == 1
+    assert first["metadata"]["cache_hit"] is False
+    assert second["metadata"]["cache_hit"] is True
+    assert second["content"] == first["content"]
+    assert second["metadata"]["original_file"] == "b.html"
+
+def test_options_fingerprint_follows_converter(fake_docling_converter):
+    """Replacing the docling converter changes the options fingerprint."""
+    converter = DocumentConverter()
+    fingerprint = converter.options_fingerprint
+    assert converter.options_fingerprint == fingerprint
+
+    converter.converter = fake_docling_converter
+    assert converter.options_fingerprint != fingerprint
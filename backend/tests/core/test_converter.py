@@ -1,5 +1,6 @@
 import pytest
 import logging
+from io import BytesIO
 from pathlib import Path
 from fastapi import HTTPException, UploadFile
 from app.core.converter import DocumentConverter
@@ -104,14 +105,14 @@ async def test_convert_pdf(converter, sample_pdf, tmp_path):
     
     # Create a mock UploadFile
     class MockUploadFile(UploadFile):
-        async def read(self):
-            content = open(sample_pdf, "rb").read()
+        async def read(self, size=-1):
+            content = self.file.read(size)
             logger.info(f"Read {len(content)} bytes from sample PDF")
             return content
 
     upload_file = MockUploadFile(
         filename="test.pdf",
-        file=None,
+        file=BytesIO(sample_pdf.read_bytes()),
     )
 
     # Test conversion
@@ -140,14 +141,14 @@ async def test_convert_image(converter, sample_image, tmp_path):
     
     # Create a mock UploadFile
     class MockUploadFile(UploadFile):
-        async def read(self):
-            content = open(sample_image, "rb").read()
+        async def read(self, size=-1):
+            content = self.file.read(size)
             logger.info(f"Read {len(content)} bytes from sample image")
             return content
 
     upload_file = MockUploadFile(
         filename="test.png",
-        file=None,
+        file=BytesIO(sample_image.read_bytes()),
     )
 
     # Test conversion
@@ -176,14 +177,14 @@ async def test_convert_docx(converter, sample_docx, tmp_path):
     
     # Create a mock UploadFile
     class MockUploadFile(UploadFile):
-        async def read(self):
-            content = open(sample_docx, "rb").read()
+        async def read(self, size=-1):
+            content = self.file.read(size)
             logger.info(f"Read {len(content)} bytes from sample DOCX")
             return content
 
     upload_file = MockUploadFile(
         filename="test.docx",
-        file=None,
+        file=BytesIO(sample_docx.read_bytes()),
     )
 
     # Test conversion
@@ -213,14 +214,14 @@ async def test_convert_pptx(converter, sample_pptx, tmp_path):
     
     # Create a mock UploadFile
     class MockUploadFile(UploadFile):
-        async def read(self):
-            content = open(sample_pptx, "rb").read()
+        async def read(self, size=-1):
+            content = self.file.read(size)
             logger.info(f"Read {len(content)} bytes from sample PPTX")
             return content
 
     upload_file = MockUploadFile(
         filename="test.pptx",
-        file=None,
+        file=BytesIO(sample_pptx.read_bytes()),
     )
 
     # Test conversion
@@ -250,14 +251,14 @@ async def test_convert_html(converter, sample_html, tmp_path):
     
     # Create a mock UploadFile
     class MockUploadFile(UploadFile):
-        async def read(self):
-            content = open(sample_html, "rb").read()
+        async def read(self, size=-1):
+            content = self.file.read(size)
             logger.info(f"Read {len(content)} bytes from sample HTML")
             return content
 
     upload_file = MockUploadFile(
         filename="test.html",
-        file=None,
+        file=BytesIO(sample_html.read_bytes()),
     )
 
     # Test conversion
@@ -283,15 +284,75 @@ async def test_convert_invalid_file(converter, tmp_path):
     """Test conversion with invalid file."""
     # Create a mock UploadFile with invalid content
     class MockUploadFile(UploadFile):
-        async def read(self):
-            return b"invalid file content"
+        async def read(self, size=-1):
+            return self.file.read(size)
 
     upload_file = MockUploadFile(
         filename="test.xyz",
-        file=None,
+        file=BytesIO(b"invalid file content"),
     )
 
     # Test conversion failure
     with pytest.raises(HTTPException) as exc_info:
         await converter.convert(upload_file, tmp_path / "test.xyz")
     assert exc_info.value.status_code == 415
+
+@pytest.mark.asyncio
+async def test_save_upload_streams_in_chunks(converter, sample_pdf, tmp_path, monkeypatch):
+    """Uploads are written in chunks and hashed without reading the whole body at once."""
+    import hashlib
+    from app.config import settings
+    monkeypatch.setattr(settings, "upload_chunk_size", 256)
+
+    reads = []
+    class MockUploadFile(UploadFile):
+        async def read(self, size=-1):
+            reads.append(size)
+            return self.file.read(size)
+
+    content = sample_pdf.read_bytes()
+    upload_file = MockUploadFile(filename="test.pdf", file=BytesIO(content))
+    save_path = tmp_path / "test.pdf"
+    file_size, mime_type, digest = await converter.save_upload(upload_file, save_path)
+
+    assert file_size == len(content)
+    assert mime_type == "application/pdf"
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert save_path.read_bytes() == content
+    assert set(reads) == {256}
+
+@pytest.mark.asyncio
+async def test_save_upload_rejects_oversized_stream_early(converter, tmp_path, monkeypatch):
+    """The size limit is enforced as soon as it is crossed, not after the full read."""
+    monkeypatch.setattr(converter, "MAX_FILE_SIZE", 1024)
+    from app.config import settings
+    monkeypatch.setattr(settings, "upload_chunk_size", 512)
+
+    body = BytesIO(b"%PDF-1.4\n" + b"0" * 10 * 1024)
+    upload_file = UploadFile(filename="large.pdf", file=body)
+    with pytest.raises(HTTPException) as exc_info:
+        await converter.save_upload(upload_file, tmp_path / "large.pdf")
+    assert exc_info.value.status_code == 413
+    assert body.tell() < 2048
+
+@pytest.mark.asyncio
+async def test_save_upload_rejects_type_before_writing(converter, tmp_path):
+    """Unsupported uploads are rejected from the sniffed prefix without touching disk."""
+    save_path = tmp_path / "test.xyz"
+    upload_file = UploadFile(filename="test.xyz", file=BytesIO(b"invalid file content"))
+    with pytest.raises(HTTPException) as exc_info:
+        await converter.save_upload(upload_file, save_path)
+    assert exc_info.value.status_code == 415
+    assert not save_path.exists()
+
+@pytest.mark.asyncio
+async def test_save_upload_per_format_limit(converter, sample_pdf, sample_html, tmp_path, monkeypatch):
+    """Formats can have their own size limit, applied once the type is sniffed."""
+    from app.config import settings
+    monkeypatch.setattr(settings, "max_file_size_by_format", {"text/html": 64})
+
+    with pytest.raises(HTTPException) as exc_info:
+        await converter.save_upload(UploadFile(filename="test.html", file=BytesIO(sample_html.read_bytes())), tmp_path / "test.html")
+    assert exc_info.value.status_code == 413
+
+    await converter.save_upload(UploadFile(filename="test.pdf", file=BytesIO(sample_pdf.read_bytes())), tmp_path / "test.pdf")
@@ -1,4 +1,5 @@
 import pytest
+from io import BytesIO
 from pathlib import Path
 from app.core.converter import DocumentConverter
 
@@ -42,10 +43,10 @@ async def test_html_conversion(sample_html_file):
     class MockUploadFile:
         def __init__(self, path):
             self.filename = path.name
-            self._path = path
+            self._stream = BytesIO(path.read_bytes())
         
-        async def read(self):
-            return self._path.read_bytes()
+        async def read(self, size=-1):
+            return self._stream.read(size)
     
     mock_file = MockUploadFile(sample_html_file)
     save_path = Path(sample_html_file).parent / "temp.html"
@@ -0,0 +1,54 @@
+from io import BytesIO
+from PIL import Image
+from app.core.images import normalize_image
+
+def encode(img, format, **params):
+    buffer = BytesIO()
+    img.save(buffer, format=format, **params)
+    buffer.seek(0)
+    return buffer
+
+def test_small_greyscale_image_left_alone():
+    assert normalize_image(encode(Image.new("L", (100, 50)), "PNG"), 2500, 300, grayscale=True) is None
+
+def test_large_photo_downscaled_to_greyscale():
+    """The longest side is capped, the mode becomes L and the EXIF data are dropped."""
+    exif = Image.Exif()
+    exif[0x010F] = "Phone maker"
+    photo = encode(Image.new("RGB", (4000, 3000), "white"), "JPEG", exif=exif.tobytes())
+
+    with Image.open(normalize_image(photo, max_dimension=1000, grayscale=True)) as img:
+        assert img.format == "PNG"
+        assert img.size == (1000, 750)
+        assert img.mode == "L"
+        assert not img.getexif()
+
+def test_rotated_by_exif_orientation():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Rotated 90 degrees clockwise
+    photo = encode(Image.new("RGB", (400, 200)), "JPEG", exif=exif.tobytes())
+
+    with Image.open(normalize_image(photo)) as img:
+        assert img.size == (200, 400)
+
+def test_high_dpi_scan_downscaled_to_max_dpi():
+    scan = encode(Image.new("L", (1200, 600)), "PNG", dpi=(600, 600))
+
+    with Image.open(normalize_image(scan, max_dpi=300)) as img:
+        assert img.size == (600, 300)
+        assert round(img.info["dpi"][0]) == 300
+
+def test_animated_image_reduced_to_selected_frame():
+    frames = [Image.new("L", (50, 50), color) for color in (0, 128, 255)]
+    animation = BytesIO()
+    frames[0].save(animation, format="GIF", save_all=True, append_images=frames[1:])
+    animation.seek(0)
+
+    with Image.open(normalize_image(animation, grayscale=True, frame=1)) as img:
+        assert getattr(img, "n_frames", 1) == 1
+        assert img.getpixel((0, 0)) == 128
+
+def test_transparent_areas_become_white():
+    img = Image.new("RGBA", (10, 10), (0, 0, 0, 0))
+    with Image.open(normalize_image(encode(img, "PNG"), grayscale=True)) as result:
+        assert result.getpixel((0, 0)) == 255
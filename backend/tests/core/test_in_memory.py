@@ -0,0 +1,47 @@
+import pytest
+from io import BytesIO
+from fastapi import UploadFile
+from docling.datamodel.base_models import DocumentStream
+
+pytestmark = pytest.mark.converter(cache=None)
+
+def upload(path, size=True):
+    content = path.read_bytes()
+    return UploadFile(filename=path.name, file=BytesIO(content), size=len(content) if size else None)
+
+async def test_small_upload_converted_from_memory(converter, fake_docling_converter, sample_html, tmp_path, monkeypatch):
+    """Small documents go to docling as in-memory streams without touching disk."""
+    save_path = tmp_path / "upload"
+    writes = []
+    monkeypatch.setattr(type(save_path), "open", lambda *args, **kwargs: writes.append(args))
+
+    result = await converter.convert(upload(sample_html), save_path)
+
+    assert result["content"] == "# Converted document.html"
+    assert result["metadata"]["file_size"] == sample_html.stat().st_size
+    assert isinstance(fake_docling_converter.calls[0][0], DocumentStream)
+    assert writes == []
+
+async def test_small_pdf_written_to_disk(converter, fake_docling_converter, multipage_pdf, tmp_path):
+    """PDFs are inspected by page and keep going through a file."""
+    save_path = tmp_path / "upload"
+    result = await converter.convert(upload(multipage_pdf), save_path, page_range=(2, 2))
+
+    assert result["content"] == "# Converted upload pages 2-2"
+    assert fake_docling_converter.calls == [[str(save_path)]]
+    assert not save_path.exists()
+
+async def test_unknown_size_streamed_to_disk(converter, fake_docling_converter, sample_html, tmp_path):
+    save_path = tmp_path / "upload"
+    result = await converter.convert(upload(sample_html, size=False), save_path)
+    assert result["content"] == "# Converted upload"
+    assert not save_path.exists()
+
+async def test_performance_only_on_request(converter, sample_html, tmp_path):
+    result = await converter.convert(upload(sample_html), tmp_path / "upload")
+    assert "performance" not in result["metadata"]
+
+    result = await converter.convert(upload(sample_html), tmp_path / "upload", performance=True)
+    timings = result["metadata"]["performance"]["timings"]
+    assert {"upload", "detect", "convert", "export", "total"} <= set(timings)
+    assert timings["detect"] <= timings["upload"] <= timings["total"]
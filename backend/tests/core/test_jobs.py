@@ -0,0 +1,222 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import pytest
+from io import BytesIO
+from fastapi import HTTPException, UploadFile
+from app.core.jobs import JobManager, MemoryJobStore, SQLiteJobStore
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryJobStore()
+    else:
+        store = SQLiteJobStore(tmp_path / "jobs.db")
+        yield store
+        store.close()
+
+def make_job(job_id, status="queued", expires_at=None):
+    now = time.time()
+    return {
+        "id": job_id, "status": status, "filename": "test.pdf", "mime_type": "application/pdf",
+        "file_size": 10, "digest": "abc", "input_path": "/nonexistent", "created_at": now,
+        "updated_at": now, "expires_at": expires_at, "status_code": None, "error": None, "result": None,
+        "profile": "full",
+    }
+
+async def wait_for_status(manager, job_id, statuses=("succeeded", "failed")):
+    for _ in range(200):
+        job = manager.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+def test_store_roundtrip(store):
+    """Jobs and their results are stored and updated."""
+    store.add(make_job("a"))
+    store.update("a", status="succeeded", result={"content": "# Title", "metadata": {"file_size": 10}})
+    job = store.get("a")
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"content": "# Title", "metadata": {"file_size": 10}}
+    assert store.get("missing") is None
+
+def test_store_unfinished_and_expiry(store):
+    now = time.time()
+    store.add(make_job("queued"))
+    store.add(make_job("done", status="succeeded", expires_at=now - 1))
+    store.add(make_job("kept", status="failed", expires_at=now + 60))
+
+    assert [job["id"] for job in store.list_unfinished()] == ["queued"]
+    assert store.delete_expired(now) == 1
+    assert store.get("done") is None
+    assert store.get("kept") is not None
+
+def test_sqlite_store_persists(tmp_path):
+    """Jobs in the SQLite store survive reopening the database."""
+    store = SQLiteJobStore(tmp_path / "jobs.db")
+    store.add(make_job("a"))
+    store.close()
+    assert SQLiteJobStore(tmp_path / "jobs.db").get("a")["status"] == "queued"
+
+@pytest.mark.asyncio
+async def test_job_lifecycle(store, converter, sample_html, tmp_path):
+    """A submitted job is converted in the background and keeps its result."""
+    manager = JobManager(store, tmp_path / "jobs", workers=1, queue_size=10, ttl=60)
+    await manager.start()
+    try:
+        job = await manager.submit(UploadFile(filename="test.html", file=BytesIO(sample_html.read_bytes())), converter)
+        assert job["status"] == "queued"
+
+        job = await wait_for_status(manager, job["id"])
+        assert job["status"] == "succeeded"
+        assert job["status_code"] == 200
+        assert job["result"]["metadata"]["original_file"] == "test.html"
+        assert job["result"]["content"].startswith("# Converted")
+        assert job["expires_at"] > time.time()
+        assert not list((tmp_path / "jobs").iterdir())
+    finally:
+        await manager.stop()
+
+@pytest.mark.asyncio
+async def test_job_failure(converter, sample_html, tmp_path):
+    """A failing conversion marks the job as failed with the error."""
+    manager = JobManager(MemoryJobStore(), tmp_path / "jobs", workers=1, queue_size=10, ttl=60)
+    await manager.start()
+    try:
+        content = sample_html.read_bytes() + b"BROKEN"
+        job = await manager.submit(UploadFile(filename="test.html", file=BytesIO(content)), converter)
+        job = await wait_for_status(manager, job["id"])
+        assert job["status"] == "failed"
+        assert job["status_code"] == 500
+        assert "Error during document conversion" in job["error"]
+    finally:
+        await manager.stop()
+
+@pytest.mark.asyncio
+async def test_submit_validates_upload(converter, tmp_path):
+    """Unsupported uploads are rejected at submission time."""
+    manager = JobManager(MemoryJobStore(), tmp_path / "jobs", workers=1, queue_size=10, ttl=60)
+    await manager.start()
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            await manager.submit(UploadFile(filename="test.xyz", file=BytesIO(b"invalid file content")), converter)
+        assert exc_info.value.status_code == 415
+        assert not list((tmp_path / "jobs").iterdir())
+    finally:
+        await manager.stop()
+
+@pytest.mark.asyncio
+async def test_submit_full_queue(converter, sample_html, tmp_path):
+    """Submissions beyond the queue size are rejected with 503 and Retry-After."""
+    manager = JobManager(MemoryJobStore(), tmp_path / "jobs", workers=0, queue_size=1, ttl=60, retry_after=3)
+    await manager.start()
+    try:
+        await manager.submit(UploadFile(filename="a.html", file=BytesIO(sample_html.read_bytes())), converter)
+        with pytest.raises(HTTPException) as exc_info:
+            await manager.submit(UploadFile(filename="b.html", file=BytesIO(sample_html.read_bytes())), converter)
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "3"}
+    finally:
+        await manager.stop()
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_reserve_queue_slots(converter, sample_html, tmp_path):
+    """Submissions saving their upload at the same time cannot overfill the queue."""
+    manager = JobManager(MemoryJobStore(), tmp_path / "jobs", workers=0, queue_size=1, ttl=60)
+    await manager.start()
+    try:
+        results = await asyncio.gather(*(
+            manager.submit(UploadFile(filename=f"{name}.html", file=BytesIO(sample_html.read_bytes())), converter)
+            for name in ("a", "b")
+        ), return_exceptions=True)
+        assert results[0]["status"] == "queued"
+        assert isinstance(results[1], HTTPException) and results[1].status_code == 503
+        assert len(list((tmp_path / "jobs").iterdir())) == 1
+    finally:
+        await manager.stop()
+
+@pytest.mark.asyncio
+async def test_expired_jobs_are_hidden(tmp_path):
+    store = MemoryJobStore()
+    store.add(make_job("old", status="succeeded", expires_at=time.time() - 1))
+    manager = JobManager(store, tmp_path / "jobs", workers=1, queue_size=10, ttl=60)
+    assert manager.get("old") is None
+
+@pytest.mark.asyncio
+async def test_interrupted_jobs_requeued(converter, sample_html, tmp_path, monkeypatch):
+    """Unfinished jobs left by a restart are queued again if their input still exists."""
+    from app.core.registry import converter_registry
+    monkeypatch.setattr(converter_registry, "get", lambda profile=None: converter)
+
+    jobs_dir = tmp_path / "jobs"
+    jobs_dir.mkdir()
+    store = MemoryJobStore()
+    resumable = make_job("resumable", status="running")
+    resumable.update(input_path=str(jobs_dir / "resumable"), mime_type="text/html")
+    (jobs_dir / "resumable").write_bytes(sample_html.read_bytes())
+    store.add(resumable)
+    store.add(make_job("lost"))
+
+    manager = JobManager(store, jobs_dir, workers=1, queue_size=10, ttl=60)
+    await manager.start()
+    try:
+        assert (await wait_for_status(manager, "resumable"))["status"] == "succeeded"
+        lost = manager.get("lost")
+        assert lost["status"] == "failed"
+        assert "interrupted" in lost["error"]
+    finally:
+        await manager.stop()
+
+def test_store_claim_and_take_over(store):
+    """Only the owner claims a queued job, and only one process takes over a job."""
+    job = make_job("a")
+    job["owner"] = 1
+    store.add(job)
+
+    assert not store.claim("a", owner=2, now=time.time())
+    assert store.claim("a", owner=1, now=time.time())
+    assert not store.claim("a", owner=1, now=time.time())
+    assert store.get("a")["status"] == "running"
+
+    assert store.take_over("a", owner=1, new_owner=3, now=time.time())
+    assert not store.take_over("a", owner=1, new_owner=4, now=time.time())
+    job = store.get("a")
+    assert (job["status"], job["owner"]) == ("queued", 3)
+
+    store.heartbeat(3, now=123.0)
+    assert store.get("a")["heartbeat_at"] == 123.0
+
+@pytest.mark.asyncio
+async def test_only_jobs_of_exited_processes_recovered(converter, sample_html, tmp_path, monkeypatch):
+    """Jobs of a live process are left alone; those of an exited or silent process are taken over."""
+    from app.core.registry import converter_registry
+    monkeypatch.setattr(converter_registry, "get", lambda profile=None: converter)
+    exited = subprocess.Popen([sys.executable, "-c", ""])
+    exited.wait()
+
+    jobs_dir = tmp_path / "jobs"
+    jobs_dir.mkdir()
+    store = MemoryJobStore()
+    now = time.time()
+    for job_id, owner, heartbeat_at in (
+        ("alive", os.getppid(), now),
+        ("silent", os.getppid(), now - 3600),
+        ("exited", exited.pid, now),
+    ):
+        job = make_job(job_id, status="running")
+        job.update(input_path=str(jobs_dir / job_id), mime_type="text/html", owner=owner, heartbeat_at=heartbeat_at)
+        (jobs_dir / job_id).write_bytes(sample_html.read_bytes())
+        store.add(job)
+
+    manager = JobManager(store, jobs_dir, workers=1, queue_size=10, ttl=60)
+    await manager.start()
+    try:
+        assert (await wait_for_status(manager, "silent"))["status"] == "succeeded"
+        assert (await wait_for_status(manager, "exited"))["status"] == "succeeded"
+        job = manager.get("alive")
+        assert (job["status"], job["owner"]) == ("running", os.getppid())
+    finally:
+        await manager.stop()
@@ -0,0 +1,36 @@
+import zipfile
+import pytest
+from io import BytesIO
+from app.core.mime import MimeDetector
+
+@pytest.fixture
+def detector():
+    return MimeDetector()
+
+def test_signatures_skip_libmagic(detector, sample_pdf, sample_image):
+    """Known signatures are recognized without opening a libmagic handle."""
+    assert detector.from_file(sample_pdf) == "application/pdf"
+    assert detector.from_file(sample_image) == "image/png"
+    assert detector.from_buffer(b"GIF89a...") == "image/gif"
+    assert detector.from_buffer(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "image/webp"
+    assert detector._magic is None
+
+def test_office_documents(detector, sample_docx, sample_pptx):
+    assert detector.from_file(sample_docx) == (
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    )
+    assert detector.from_file(sample_pptx) == (
+        "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+    )
+
+def test_plain_zip_is_not_an_office_document(detector):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/report.txt", "not a word document")
+    assert detector.from_buffer(buffer.getvalue()) == "application/zip"
+
+def test_libmagic_handle_is_shared(detector, sample_html):
+    assert detector.from_file(sample_html) == "text/html"
+    handle = detector._magic
+    assert detector.from_buffer(b"<!DOCTYPE html><html><body>Hi</body></html>") == "text/html"
+    assert detector._magic is handle
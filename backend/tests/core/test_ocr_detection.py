@@ -0,0 +1,52 @@
+import pytest
+from types import SimpleNamespace
+from docling.datamodel.base_models import InputFormat
+from app.core.pdf import page_runs, scanned_pages
+
+@pytest.fixture
+def converter(converter, fake_docling_converter):
+    """The shared converter, with fake OCR and OCR-free pipelines."""
+    fake_docling_converter.format_to_options = {
+        InputFormat.PDF: SimpleNamespace(pipeline_options=SimpleNamespace(do_ocr=True)),
+    }
+    converter._text_converter = (fake_docling_converter, type(fake_docling_converter)())
+    return converter
+
+def test_scanned_pages(mixed_pdf, multipage_pdf):
+    assert scanned_pages(mixed_pdf, min_text_chars=32, min_image_coverage=0.3) == [False, True, True]
+    assert scanned_pages(multipage_pdf, min_text_chars=1, min_image_coverage=0.3) == [False, False, False]
+
+def test_page_runs():
+    assert page_runs([False, True, True, False]) == [((1, 1), False), ((2, 3), True), ((4, 4), False)]
+    assert page_runs([True, True], first_page=5) == [((5, 6), True)]
+    assert page_runs([]) == []
+
+def test_only_scanned_pages_are_ocred(converter, fake_docling_converter, mixed_pdf):
+    """The digital page skips OCR and the scanned pages are converted together with OCR."""
+    markdown = converter.convert_file(mixed_pdf, InputFormat.PDF)
+
+    assert markdown == "# Converted mixed.pdf pages 1-1\n\n# Converted mixed.pdf pages 2-3"
+    assert len(converter.text_converter.calls) == 1
+    assert len(fake_docling_converter.calls) == 1
+
+def test_digital_pdf_skips_ocr(converter, fake_docling_converter, multipage_pdf):
+    assert converter.convert_file(multipage_pdf, InputFormat.PDF) == "# Converted multipage.pdf"
+    assert fake_docling_converter.calls == []
+
+def test_auto_detect_disabled(converter, fake_docling_converter, mixed_pdf, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "ocr_auto_detect", False)
+    assert converter.text_converter is None
+    assert converter.convert_file(mixed_pdf, InputFormat.PDF) == "# Converted mixed.pdf"
+    assert len(fake_docling_converter.calls) == 1
+
+def test_batch_routes_pdfs_by_text_layer(converter, fake_docling_converter, mixed_pdf, multipage_pdf):
+    """Digital PDFs are batched through the OCR-free pipeline, mixed PDFs are split."""
+    outputs = converter.convert_files([(multipage_pdf, InputFormat.PDF), (mixed_pdf, InputFormat.PDF)])
+
+    assert outputs == [
+        ("# Converted multipage.pdf", None),
+        ("# Converted mixed.pdf pages 1-1\n\n# Converted mixed.pdf pages 2-3", None),
+    ]
+    assert converter.text_converter.calls == [[str(mixed_pdf)], [str(multipage_pdf)]]
+    assert fake_docling_converter.calls == [[str(mixed_pdf)]]
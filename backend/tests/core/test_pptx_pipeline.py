@@ -1,4 +1,5 @@
 import pytest
+from io import BytesIO
 from pathlib import Path
 from pptx import Presentation
 from app.core.converter import DocumentConverter
@@ -38,17 +39,21 @@ def sample_pptx_file(tmp_path):
     prs.save(file_path)
     return file_path
 
-async def test_pptx_conversion(sample_pptx_file):
+@pytest.mark.parametrize("include_notes", [True, False])
+async def test_pptx_conversion(sample_pptx_file, include_notes, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "pptx_include_notes", include_notes)
     converter = DocumentConverter()
+    converter.cache = None
     
     # Create a mock UploadFile
     class MockUploadFile:
         def __init__(self, path):
             self.filename = path.name
-            self._path = path
+            self._stream = BytesIO(path.read_bytes())
         
-        async def read(self):
-            return self._path.read_bytes()
+        async def read(self, size=-1):
+            return self._stream.read(size)
     
     mock_file = MockUploadFile(sample_pptx_file)
     save_path = Path(sample_pptx_file).parent / "temp.pptx"
@@ -62,6 +67,7 @@ async def test_pptx_conversion(sample_pptx_file):
         assert "Test Slide" in result["content"]
         assert "First Level" in result["content"]
         assert "Second Level" in result["content"]
+        assert ("These are speaker notes for testing" in result["content"]) == include_notes
         
         # Verify metadata
         assert result["metadata"]["mime_type"] == "application/vnd.openxmlformats-officedocument.presentationml.presentation"
@@ -71,4 +77,30 @@ async def test_pptx_conversion(sample_pptx_file):
     finally:
         # Clean up
         if save_path.exists():
-            save_path.unlink()
\ No newline at end of file
+            save_path.unlink()
+
+
+def test_presentation_markdown_export():
+    """Slides become headings, lists bullets, and speaker notes quotes, in deck order."""
+    from docling_core.types.doc import ContentLayer, DoclingDocument
+    from docling_core.types.doc.labels import DocItemLabel, GroupLabel
+    from app.core.presentation import export_presentation_markdown
+
+    document = DoclingDocument(name="deck")
+    slide = document.add_group(label=GroupLabel.CHAPTER, name="slide-0")
+    document.add_text(label=DocItemLabel.TITLE, text="Agenda", parent=slide)
+    items = document.add_group(label=GroupLabel.LIST, name="list", parent=slide)
+    document.add_list_item(text="First", parent=items)
+    document.add_list_item(text="Second", parent=items)
+    document.add_text(
+        label=DocItemLabel.TEXT, text="Say hello", parent=slide, content_layer=ContentLayer.FURNITURE
+    )
+    slide = document.add_group(label=GroupLabel.CHAPTER, name="slide-1")
+    document.add_text(label=DocItemLabel.TEXT, text="No title here", parent=slide)
+
+    assert export_presentation_markdown(document) == (
+        "## Agenda\n\n- First\n- Second\n\n> Notes: Say hello\n\n## Slide 2\n\nNo title here"
+    )
+    assert export_presentation_markdown(document, include_notes=False) == (
+        "## Agenda\n\n- First\n- Second\n\n## Slide 2\n\nNo title here"
+    )
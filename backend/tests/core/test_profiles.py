@@ -0,0 +1,39 @@
+import pytest
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import TableFormerMode
+from app.core.converter import DocumentConverter
+from app.core.profiles import pdf_pipeline_options
+
+def test_fast_profile_skips_ocr_and_tables():
+    options = pdf_pipeline_options("fast")
+    assert options.do_ocr is False
+    assert options.do_table_structure is False
+
+def test_balanced_profile_uses_fast_tables():
+    options = pdf_pipeline_options("balanced")
+    assert options.do_ocr is False
+    assert options.do_table_structure is True
+    assert options.table_structure_options.mode == TableFormerMode.FAST
+
+def test_full_profile_runs_ocr_and_tables():
+    options = pdf_pipeline_options("full")
+    assert options.do_ocr is True
+    assert options.do_table_structure is True
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        pdf_pipeline_options("turbo")
+
+def test_converter_profiles_have_distinct_fingerprints():
+    """Results of different profiles never share cache entries."""
+    fast = DocumentConverter(profile="fast")
+    full = DocumentConverter(profile="full")
+    assert fast.converter.format_to_options[InputFormat.PDF].pipeline_options.do_ocr is False
+    assert fast.options_fingerprint != full.options_fingerprint
+
+def test_unknown_warm_profile_rejected():
+    """A misspelt profile in WARM_PROFILES fails when the settings are loaded."""
+    from pydantic import ValidationError
+    from app.config import Settings
+    with pytest.raises(ValidationError):
+        Settings(api_key="key", warm_profiles=["fsat"])
@@ -0,0 +1,66 @@
+import pytest
+from app.core.ratelimit import MemoryRateLimitBackend, RateLimiter, RedisRateLimitBackend
+
+class FakeRedis:
+    """The subset of the asyncio Redis client used by RedisRateLimitBackend."""
+    def __init__(self):
+        self.values = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        value = self.values.get(key)
+        return str(value).encode() if value is not None else None
+
+    async def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    async def decr(self, key):
+        self.values[key] = self.values.get(key, 0) - 1
+        return self.values[key]
+
+    async def expire(self, key, seconds):
+        self.expiry[key] = seconds
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return MemoryRateLimitBackend()
+    return RedisRateLimitBackend(FakeRedis())
+
+async def test_limit_within_window(backend):
+    limiter = RateLimiter(backend, limit=3, window=60)
+    results = [await limiter.hit("client", now=600 + i) for i in range(4)]
+    assert [allowed for allowed, _ in results] == [True, True, True, False]
+    assert results[-1][1] == 57
+
+async def test_clients_counted_separately(backend):
+    limiter = RateLimiter(backend, limit=1, window=60)
+    assert (await limiter.hit("a", now=600))[0]
+    assert (await limiter.hit("b", now=600))[0]
+    assert not (await limiter.hit("a", now=601))[0]
+
+async def test_sliding_window(backend):
+    """The previous window still counts in proportion to its overlap."""
+    limiter = RateLimiter(backend, limit=4, window=60)
+    for _ in range(4):
+        assert (await limiter.hit("client", now=650))[0]
+    # 30s into the next window, half of the previous 4 requests still count
+    assert (await limiter.hit("client", now=690))[0]
+    assert (await limiter.hit("client", now=690))[0]
+    assert not (await limiter.hit("client", now=690))[0]
+    # Two windows later the old requests no longer count
+    assert (await limiter.hit("client", now=780))[0]
+
+async def test_memory_backend_evicts_idle_keys():
+    backend = MemoryRateLimitBackend(max_keys=2)
+    limiter = RateLimiter(backend, limit=10, window=60)
+    for key in ("a", "b"):
+        await limiter.hit(key, now=600)
+    assert len(backend) == 2
+
+    await limiter.hit("c", now=610)
+    assert len(backend) == 2
+
+    await limiter.hit("d", now=800)
+    assert len(backend) == 1
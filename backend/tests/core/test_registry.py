@@ -0,0 +1,72 @@
+import pytest
+from docling.datamodel.base_models import InputFormat
+from app.core.registry import ConverterRegistry
+
+def test_get_builds_once_per_profile(fake_converter):
+    """The registry hands out the same converter instance per profile."""
+    registry = ConverterRegistry(factory=fake_converter)
+    fast = registry.get("fast")
+    assert registry.get("fast") is fast
+    assert registry.get("full") is not fast
+    assert fake_converter.builds == ["fast", "full"]
+
+def test_get_default_profile(fake_converter, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "default_profile", "balanced")
+    registry = ConverterRegistry(factory=fake_converter)
+    assert registry.get().profile == "balanced"
+
+def test_status_before_and_after_warm_up(fake_converter):
+    """Pipelines are reported cold until warm_up() initializes them."""
+    registry = ConverterRegistry(factory=fake_converter)
+    assert registry.status() == {"state": "cold", "profiles": {}}
+
+    registry.get("fast")
+    assert registry.status()["profiles"]["fast"]["formats"] == {"pdf": "cold", "html": "cold"}
+
+    registry.warm_up(["fast"])
+    assert registry.status() == {
+        "state": "warm",
+        "profiles": {"fast": {"state": "warm", "formats": {"pdf": "warm", "html": "warm"}}},
+    }
+
+    # Warming again does not re-initialize pipelines
+    registry.warm_up(["fast"])
+    assert registry.get("fast").converter.initialized == [InputFormat.PDF, InputFormat.HTML]
+
+def test_warm_up_configured_profiles(fake_converter, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "warm_profiles", ["fast", "full"])
+    registry = ConverterRegistry(factory=fake_converter)
+    registry.warm_up()
+    assert fake_converter.builds == ["fast", "full"]
+    assert registry.status()["state"] == "warm"
+
+def test_warm_up_failure_is_reported(fake_converter):
+    """A pipeline that fails to initialize keeps the registry cold but usable."""
+    registry = ConverterRegistry(factory=lambda profile: fake_converter(profile, failing=(InputFormat.PDF,)))
+    registry.warm_up(["full"])
+    status = registry.status()
+    assert status["state"] == "cold"
+    assert status["profiles"]["full"]["formats"] == {"pdf": "failed", "html": "warm"}
+
+def test_reset_rebuilds_converter(fake_converter):
+    """reset() drops the shared converters and their warm state."""
+    registry = ConverterRegistry(factory=fake_converter)
+    first = registry.get("full")
+    registry.warm_up(["full"])
+    registry.reset()
+    assert registry.status()["state"] == "cold"
+    assert registry.get("full") is not first
+
+def test_is_warm_once_profiles_are_warmed(fake_converter):
+    registry = ConverterRegistry(factory=lambda profile: fake_converter(profile, failing=(InputFormat.PDF,)))
+    assert not registry.is_warm(["fast"])
+
+    registry.warm_up(["fast"])
+    assert not registry.is_warm(["fast"])  # The PDF pipeline failed
+
+    registry = ConverterRegistry(factory=fake_converter)
+    registry.warm_up(["fast"])
+    assert registry.is_warm(["fast"])
+    assert not registry.is_warm(["fast", "full"])
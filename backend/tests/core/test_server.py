@@ -0,0 +1,19 @@
+import gc
+from types import SimpleNamespace
+from app import gunicorn_conf
+from app.core import registry
+
+def test_models_preloaded_before_fork(monkeypatch):
+    """The gunicorn master warms the converters and freezes them out of the collector."""
+    warmed, frozen = [], []
+    monkeypatch.setattr(registry.converter_registry, "warm_up", lambda: warmed.append(True))
+    monkeypatch.setattr(gc, "freeze", lambda: frozen.append(True))
+    monkeypatch.setattr(gunicorn_conf, "preload_app", True)
+    server = SimpleNamespace(log=SimpleNamespace(info=lambda message: None))
+
+    gunicorn_conf.on_starting(server)
+    assert warmed == [True] and frozen == [True]
+
+    monkeypatch.setattr(gunicorn_conf, "preload_app", False)
+    gunicorn_conf.on_starting(server)
+    assert warmed == [True]
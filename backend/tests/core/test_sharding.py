@@ -0,0 +1,82 @@
+import pytest
+from fastapi import HTTPException
+from app.core.pdf import page_chunks, page_shards, parse_page_range
+
+pytestmark = pytest.mark.converter(cache=None, pool_size=2)
+
+def test_page_shards():
+    assert page_shards((1, 10), min_pages=3, max_shards=4) == [(1, 4), (5, 7), (8, 10)]
+    assert page_shards((1, 100), min_pages=10, max_shards=2) == [(1, 50), (51, 100)]
+    assert page_shards((5, 9), min_pages=10, max_shards=4) == [(5, 9)]
+
+def test_page_chunks_from_first_page():
+    assert page_chunks(7, 2, first_page=3) == [(3, 4), (5, 6), (7, 7)]
+
+def test_parse_page_range():
+    assert parse_page_range("5") == (5, 5)
+    assert parse_page_range(" 3-10 ") == (3, 10)
+    for pages in ("", "a-b", "0", "7-3", "1-2-3"):
+        with pytest.raises(ValueError):
+            parse_page_range(pages)
+
+async def test_long_pdf_converted_in_parallel_shards(converter, fake_docling_converter, multipage_pdf, monkeypatch):
+    """Shards are converted separately and joined in page order."""
+    from app.config import settings
+    monkeypatch.setattr(settings, "shard_min_pages", 1)
+    result = await converter.convert_saved(multipage_pdf, "multipage.pdf", 100, "application/pdf", "digest")
+
+    assert result["content"] == "# Converted multipage.pdf pages 1-2\n\n# Converted multipage.pdf pages 3-3"
+    assert len(fake_docling_converter.calls) == 2
+
+async def test_short_pdf_converted_whole(converter, fake_docling_converter, multipage_pdf):
+    result = await converter.convert_saved(multipage_pdf, "multipage.pdf", 100, "application/pdf", "digest")
+    assert result["content"] == "# Converted multipage.pdf"
+
+async def test_page_range(converter, multipage_pdf):
+    result = await converter.convert_saved(
+        multipage_pdf, "multipage.pdf", 100, "application/pdf", "digest", page_range=(2, 3)
+    )
+    assert result["content"] == "# Converted multipage.pdf pages 2-3"
+
+    chunks = [chunk async for chunk in converter.stream_saved(multipage_pdf, "application/pdf", "digest", (2, 3))]
+    assert chunks == ["# Converted multipage.pdf pages 2-2", "# Converted multipage.pdf pages 3-3"]
+
+async def test_invalid_page_range(converter, multipage_pdf, sample_html):
+    with pytest.raises(HTTPException) as exc_info:
+        await converter.convert_saved(multipage_pdf, "multipage.pdf", 100, "application/pdf", "digest", (2, 4))
+    assert exc_info.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc_info:
+        await converter.convert_saved(sample_html, "sample.html", 100, "text/html", "digest", (1, 1))
+    assert exc_info.value.status_code == 400
+
+async def test_performance_summed_over_shards(converter, multipage_pdf, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "shard_min_pages", 1)
+    result = await converter.convert_saved(
+        multipage_pdf, "multipage.pdf", 100, "application/pdf", "digest", timings={"upload": 0.5}
+    )
+
+    performance = result["metadata"]["performance"]
+    assert set(performance["timings"]) == {"upload", "convert", "export", "total"}
+    assert performance["timings"]["total"] >= 0.5 + performance["timings"]["convert"]
+    assert 1 <= len(performance["workers"]) <= 2
+    assert performance["ocr_pages"] == 0
+
+async def test_per_format_timeout(converter, fake_docling_converter, multipage_pdf, monkeypatch):
+    """Conversions are stopped after the timeout configured for their MIME type."""
+    import time
+    from app.config import settings
+    monkeypatch.setattr(settings, "conversion_timeout_by_format", {"application/pdf": 0.05})
+    assert converter.conversion_timeout("application/pdf") == 0.05
+    assert converter.conversion_timeout("text/html") == converter.pool.timeout
+
+    convert = fake_docling_converter.convert
+    def slow_convert(source, **kwargs):
+        time.sleep(0.3)
+        return convert(source, **kwargs)
+    monkeypatch.setattr(fake_docling_converter, "convert", slow_convert)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await converter.convert_saved(multipage_pdf, "multipage.pdf", 100, "application/pdf", "digest")
+    assert exc_info.value.status_code == 504
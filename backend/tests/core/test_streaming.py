@@ -0,0 +1,47 @@
+import pytest
+from fastapi import HTTPException
+from app.core.admission import AdmissionController
+from app.core.pdf import count_pages, page_chunks
+
+def test_count_pages(multipage_pdf):
+    assert count_pages(multipage_pdf) == 3
+
+def test_page_chunks():
+    assert page_chunks(5, 2) == [(1, 2), (3, 4), (5, 5)]
+    assert page_chunks(3, 1) == [(1, 1), (2, 2), (3, 3)]
+    assert page_chunks(0, 1) == []
+
+@pytest.mark.asyncio
+async def test_stream_pdf_page_by_page(converter, fake_docling_converter, multipage_pdf):
+    """PDFs are converted and yielded one page range at a time."""
+    chunks = [chunk async for chunk in converter.stream_saved(multipage_pdf, "application/pdf", "digest")]
+
+    assert chunks == [f"# Converted multipage.pdf pages {page}-{page}" for page in (1, 2, 3)]
+    assert len(fake_docling_converter.calls) == 3
+
+@pytest.mark.asyncio
+async def test_stream_pages_per_chunk(converter, multipage_pdf, monkeypatch):
+    from app.config import settings
+    monkeypatch.setattr(settings, "stream_pages_per_chunk", 2)
+    chunks = [chunk async for chunk in converter.stream_saved(multipage_pdf, "application/pdf", "digest")]
+    assert chunks == ["# Converted multipage.pdf pages 1-2", "# Converted multipage.pdf pages 3-3"]
+
+@pytest.mark.asyncio
+async def test_stream_other_formats_in_one_piece(converter, fake_docling_converter, sample_html):
+    """Non-PDF documents are converted whole, cached, and served from the cache afterwards."""
+    chunks = [chunk async for chunk in converter.stream_saved(sample_html, "text/html", "digest")]
+    assert chunks == ["# Converted sample.html"]
+
+    chunks = [chunk async for chunk in converter.stream_saved(sample_html, "text/html", "digest")]
+    assert chunks == ["# Converted sample.html"]
+    assert len(fake_docling_converter.calls) == 1
+
+@pytest.mark.asyncio
+async def test_stream_goes_through_admission(converter, fake_docling_converter, multipage_pdf):
+    """A heavy document is shed with 503 while the heavy backlog is full."""
+    converter.admission = AdmissionController(converter.pool, heavy_cost=0.1, max_heavy_backlog=1)
+    async with converter.admission.admit(100):
+        with pytest.raises(HTTPException) as exc_info:
+            [chunk async for chunk in converter.stream_saved(multipage_pdf, "application/pdf", "digest")]
+    assert exc_info.value.status_code == 503
+    assert fake_docling_converter.calls == []
@@ -0,0 +1,91 @@
+import json
+import sys
+from types import ModuleType, SimpleNamespace
+import pytest
+from app import warmup
+
+class StandardPdfPipeline:
+    pass
+
+class SimplePipeline:
+    pass
+
+def docling_converter(**pipelines):
+    return SimpleNamespace(format_to_options={
+        name: SimpleNamespace(pipeline_cls=pipeline_cls, pipeline_options=options)
+        for name, (pipeline_cls, options) in pipelines.items()
+    })
+
+def test_required_models_follow_pipeline_options():
+    """Only the models enabled by the pipeline options of model-based pipelines are needed."""
+    fast = docling_converter(
+        pdf=(StandardPdfPipeline, SimpleNamespace(do_ocr=False, do_table_structure=False)),
+        docx=(SimplePipeline, SimpleNamespace(do_ocr=True)),
+    )
+    assert warmup.required_models([fast]) == {"with_layout": True}
+
+    full = docling_converter(
+        pdf=(StandardPdfPipeline, SimpleNamespace(
+            do_ocr=True, ocr_options=SimpleNamespace(kind="easyocr"), do_table_structure=True,
+        )),
+    )
+    assert warmup.required_models([fast, full]) == {
+        "with_easyocr": True, "with_layout": True, "with_tableformer": True,
+    }
+
+def test_manifest_detects_missing_and_changed_files(tmp_path):
+    (tmp_path / "layout").mkdir()
+    (tmp_path / "layout" / "model.safetensors").write_bytes(b"weights")
+    (tmp_path / "config.json").write_text("{}")
+
+    manifest = warmup.write_manifest(tmp_path, {"with_layout": True})
+    assert manifest["models"] == ["layout"]
+    assert set(manifest["files"]) == {"layout/model.safetensors", "config.json"}
+    assert json.loads((tmp_path / warmup.MANIFEST_NAME).read_text()) == manifest
+    assert warmup.verify_manifest(tmp_path) == manifest
+
+    (tmp_path / "layout" / "model.safetensors").write_bytes(b"corrupt")
+    (tmp_path / "config.json").unlink()
+    with pytest.raises(RuntimeError, match="config.json is missing; layout/model.safetensors differs"):
+        warmup.verify_manifest(tmp_path)
+
+def test_only_downloaded_models_count_as_prefetched(tmp_path, monkeypatch):
+    """Groups unknown to docling's downloader are not recorded, and are missing unless they need no download."""
+    calls = []
+    def download_models(output_dir, progress=True, with_layout=False, with_easyocr=False):
+        calls.append({"with_layout": with_layout, "with_easyocr": with_easyocr})
+    model_downloader = ModuleType("docling.utils.model_downloader")
+    model_downloader.download_models = download_models
+    monkeypatch.setitem(sys.modules, "docling.utils.model_downloader", model_downloader)
+
+    models = {"with_layout": True, "with_rapidocr": True, "with_tesseract": True}
+    downloaded = warmup.download(tmp_path, models)
+    assert downloaded == {"with_layout": True}
+    assert calls == [{"with_layout": True, "with_easyocr": False}]
+
+    manifest = warmup.write_manifest(tmp_path, downloaded)
+    assert manifest["models"] == ["layout"]
+    assert warmup.missing_models(models, manifest) == ["rapidocr"]
+
+def test_verify_without_manifest(tmp_path):
+    with pytest.raises(RuntimeError, match="No manifest.json"):
+        warmup.verify_manifest(tmp_path)
+
+def test_smoke_test_converts_every_sample(tmp_path):
+    """Every sample is converted with every converter, and must keep its text."""
+    samples = warmup.write_samples(tmp_path)
+    assert set(samples) == {"pdf", "scanned", "image", "docx", "pptx", "html"}
+    assert samples["pdf"].read_bytes().startswith(b"%PDF-1.4")
+    assert samples["scanned"].read_bytes().startswith(b"%PDF")
+
+    calls = []
+    def convert_file(path, input_format):
+        calls.append((path.name, input_format.value))
+        return "" if path == samples["scanned"] else f"# {warmup.SAMPLE_TEXT}"
+    warmup.smoke_test({"fast": SimpleNamespace(convert_file=convert_file)}, samples)
+    assert ("warmup-scanned.pdf", "pdf") in calls
+    assert len(calls) == len(samples)
+
+    lossy = SimpleNamespace(convert_file=lambda path, input_format: "")
+    with pytest.raises(RuntimeError, match="lost its text"):
+        warmup.smoke_test({"fast": lossy}, samples)
@@ -0,0 +1,160 @@
+import asyncio
+import os
+import threading
+import time
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+from app.core.workers import ConversionPool
+
+def cancelled(reason, outcome):
+    labels = {"reason": reason, "outcome": outcome}
+    return REGISTRY.get_sample_value("doc_to_markdown_conversions_cancelled_total", labels) or 0
+
+@pytest.fixture
+def pool():
+    pool = ConversionPool(size=1, max_queue=1, timeout=5, retry_after=7)
+    yield pool
+    pool.shutdown()
+
+async def test_run_returns_result_off_event_loop(pool):
+    """Jobs run on a worker thread, not on the event loop thread."""
+    loop_thread = threading.get_ident()
+    worker_thread = await pool.run(threading.get_ident)
+    assert worker_thread != loop_thread
+    assert pool.pending == 0
+
+async def test_event_loop_stays_responsive(pool):
+    """A blocking job does not stop other coroutines from running."""
+    job = asyncio.create_task(pool.run(time.sleep, 0.5))
+    started = time.monotonic()
+    await asyncio.sleep(0.01)
+    assert time.monotonic() - started < 0.4
+    await job
+
+async def test_full_queue_rejected_with_retry_after(pool):
+    """Jobs beyond size + max_queue are rejected with 503 and Retry-After."""
+    running = asyncio.create_task(pool.run(time.sleep, 0.3))
+    queued = asyncio.create_task(pool.run(time.sleep, 0.1))
+    await asyncio.sleep(0)
+    assert pool.pending == 2
+
+    with pytest.raises(HTTPException) as exc_info:
+        await pool.run(time.sleep, 0)
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "7"}
+
+    await asyncio.gather(running, queued)
+    assert pool.pending == 0
+
+async def test_job_timeout():
+    """Jobs exceeding the timeout fail with 504."""
+    pool = ConversionPool(size=1, max_queue=0, timeout=0.05)
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            await pool.run(time.sleep, 0.5)
+        assert exc_info.value.status_code == 504
+    finally:
+        pool.shutdown()
+
+async def test_timed_out_job_abandoned_in_thread_mode():
+    """A running thread cannot be stopped; the job keeps its worker until it is done."""
+    pool = ConversionPool(size=1, max_queue=0, timeout=0.05)
+    before = cancelled("timeout", "abandoned")
+    try:
+        with pytest.raises(HTTPException):
+            await pool.run(time.sleep, 0.3)
+        assert cancelled("timeout", "abandoned") == before + 1
+
+        # The abandoned job still occupies the only worker
+        assert pool.pending == 1
+        with pytest.raises(HTTPException) as exc_info:
+            await pool.run(time.sleep, 0)
+        assert exc_info.value.status_code == 503
+
+        await asyncio.sleep(0.4)
+        assert pool.pending == 0
+        await pool.run(time.sleep, 0)
+    finally:
+        pool.shutdown()
+
+async def test_timeout_excludes_time_waiting_for_a_worker():
+    """The timeout of a job starts when a worker picks it up."""
+    pool = ConversionPool(size=1, max_queue=1, timeout=0.5)
+    try:
+        first = asyncio.create_task(pool.run(time.sleep, 0.3))
+        second = asyncio.create_task(pool.run(time.sleep, 0.3))
+        await asyncio.gather(first, second)  # The second job finishes 0.6s after it was submitted
+        assert pool.pending == 0
+    finally:
+        pool.shutdown()
+
+async def test_queued_job_withdrawn_when_cancelled(pool):
+    """A job waiting for a worker is withdrawn when its caller is cancelled."""
+    ran = []
+    before = cancelled("cancelled", "withdrawn")
+    running = asyncio.create_task(pool.run(time.sleep, 0.3))
+    queued = asyncio.create_task(pool.run(ran.append, 1))
+    await asyncio.sleep(0.05)
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    await running
+
+    assert ran == []
+    assert pool.pending == 0
+    assert cancelled("cancelled", "withdrawn") == before + 1
+
+async def test_per_call_timeout(pool):
+    """A timeout passed to run() overrides the pool timeout."""
+    with pytest.raises(HTTPException) as exc_info:
+        await pool.run(time.sleep, 0.5, timeout=0.05)
+    assert exc_info.value.status_code == 504
+    assert "0.05 seconds" in exc_info.value.detail
+
+async def test_timed_out_job_killed_in_process_mode():
+    """In process mode a running job is stopped by killing its worker process."""
+    pool = ConversionPool(size=1, max_queue=1, timeout=120, mode="process")
+    before = cancelled("timeout", "killed")
+    try:
+        worker = await pool.run(os.getpid)
+        with pytest.raises(HTTPException) as exc_info:
+            await pool.run(time.sleep, 60, timeout=0.5)
+        assert exc_info.value.status_code == 504
+        assert cancelled("timeout", "killed") == before + 1
+        # The pool starts a new worker process for the next job
+        assert await pool.run(os.getpid) not in (worker, os.getpid())
+    finally:
+        pool.shutdown()
+
+async def test_killing_a_job_spares_other_workers():
+    """Only the worker process of the timed-out job is killed; other jobs finish normally."""
+    pool = ConversionPool(size=2, max_queue=0, timeout=120, mode="process")
+    try:
+        pool.start()
+        while not pool.ready:
+            await asyncio.sleep(0.05)
+        other = asyncio.create_task(pool.run(time.sleep, 1))
+        await asyncio.sleep(0.1)
+        with pytest.raises(HTTPException):
+            await pool.run(time.sleep, 60, timeout=0.5)
+        assert not pool.ready  # The killed worker is being replaced
+
+        await other
+        while not pool.ready:
+            await asyncio.sleep(0.05)
+        assert pool.pending == 0
+    finally:
+        pool.shutdown()
+
+async def test_process_mode():
+    """In process mode jobs run in a separate worker process."""
+    pool = ConversionPool(size=1, max_queue=0, timeout=120, mode="process")
+    try:
+        assert await pool.run(os.getpid) != os.getpid()
+    finally:
+        pool.shutdown()
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ConversionPool(size=1, max_queue=0, timeout=1, mode="fibers")
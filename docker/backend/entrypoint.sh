@@ -3,5 +3,16 @@
 # Exit on error
 set -e
 
+if [ "${SERVER_WORKERS:-1}" -gt 1 ] || [ "${CONVERSION_WORKER_MODE:-thread}" = "process" ]; then
+    # Aggregate the Prometheus metrics of every server and conversion worker process
+    export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/doc-to-markdown-metrics}"
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+if [ "${SERVER_WORKERS:-1}" -gt 1 ]; then
+    # Start FastAPI server in several worker processes sharing preloaded models
+    exec gunicorn -c python:app.gunicorn_conf app.main:app
+fi
+
 # Start FastAPI server
-uvicorn app.main:app --host 0.0.0.0 --port 8001
\ No newline at end of file
+exec uvicorn app.main:app --host 0.0.0.0 --port 8001